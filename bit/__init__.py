@@ -1,7 +1,11 @@
 from bit.format import verify_sig
-from bit.network.fees import set_fee_cache_time
-from bit.network.rates import SUPPORTED_CURRENCIES, set_rate_cache_time
-from bit.network.services import set_service_timeout
+from bit.network.cache import set_cache_store
+from bit.network.fees import set_fee_background_refresh, set_fee_cache_time, set_fee_estimator
+from bit.network.policy import set_fee_policy
+from bit.network.ratelimit import set_rate_limits
+from bit.network.rates import SUPPORTED_CURRENCIES, set_rate_background_refresh, set_rate_cache_time
+from bit.network.services import set_hedge_delay, set_service_timeout, set_tip_cache_time, set_transaction_cache
+from bit.network.session import set_session_options
 from bit.wallet import Key, PrivateKey, PrivateKeyTestnet, wif_to_key, MultiSig, MultiSigTestnet
 
 __version__ = '0.8.0'
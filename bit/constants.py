@@ -6,6 +6,13 @@ FLAG = b'\x01'
 SEQUENCE = 0xFFFFFFFF .to_bytes(4, byteorder='little')
 LOCK_TIME = 0x00 .to_bytes(4, byteorder='little')
 HASH_TYPE = 0x01 .to_bytes(4, byteorder='little')
+# Transactions above this weight (100 kvB) are not relayed by nodes:
+MAX_STANDARD_TX_WEIGHT = 400000
+# Replacements opt in with a sequence at most this (BIP 125):
+MAX_BIP125_RBF_SEQUENCE = 0xFFFFFFFD
+# Satoshi per byte nodes require for relaying, and for replacing transactions:
+MIN_RELAY_FEE = 1
+INCREMENTAL_RELAY_FEE = 1
 
 # Scripts:
 OP_0 = b'\x00'
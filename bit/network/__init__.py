@@ -1,3 +1,7 @@
-from .fees import get_fee, get_fee_cached
+from .fees import get_fee, get_fee_cached, get_fee_for_target, get_fees, get_fees_cached
+from .estimator import BlockFeeEstimator
+from .policy import FeePolicy
 from .rates import currency_to_satoshi, currency_to_satoshi_cached, satoshi_to_currency, satoshi_to_currency_cached
+from .health import HealthTracker
 from .services import NetworkAPI
+from .stream import FeeSubscriber
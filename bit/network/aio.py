@@ -0,0 +1,739 @@
+import asyncio
+import json
+
+import aiohttp
+
+from bit.exceptions import ExcessiveAddress
+from bit.network import currency_to_satoshi, services
+from bit.network.meta import Unspent
+from bit.network.services import BitcoreAPI, BlockchainAPI, BlockchairAPI, BlockstreamAPI, SmartbitAPI
+
+# Maximum number of connections open at once, across all hosts:
+DEFAULT_CONNECTIONS = 100
+
+
+async def fetch(session, url, method='GET', **kwargs):
+    """Requests a URL with the timeout of
+    :func:`~bit.network.services.set_service_timeout`.
+
+    :returns: The status code and body of the response.
+    :rtype: ``tuple``
+    """
+    timeout = aiohttp.ClientTimeout(total=services.DEFAULT_TIMEOUT)
+    async with session.request(method, url, timeout=timeout, **kwargs) as r:
+        return r.status, await r.text()
+
+
+class AsyncBlockchairAPI(BlockchairAPI):
+    PAGE_SIZE = 1000
+
+    @classmethod
+    async def _get_balance(cls, session, endpoint, address):
+        status, text = await fetch(session, endpoint.format(address))
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)['data'][address]['address']['balance']
+
+    @classmethod
+    async def _get_pages(cls, session, endpoint, address, count_key):
+        # The first page tells how many more to fetch, all at once:
+        params = {'offset': '0', 'limit': str(cls.PAGE_SIZE)}
+        status, text = await fetch(session, endpoint.format(address), params=params)
+        if status == 404:  # pragma: no cover
+            return None, []
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        response = json.loads(text)
+        first = response['data'][address]
+
+        offsets = range(cls.PAGE_SIZE, first['address'][count_key], cls.PAGE_SIZE)
+        results = await asyncio.gather(
+            *(
+                fetch(session, endpoint.format(address), params={'offset': str(offset), 'limit': str(cls.PAGE_SIZE)})
+                for offset in offsets
+            )
+        )
+        pages = [first]
+        for status, text in results:
+            if status != 200:  # pragma: no cover
+                raise ConnectionError
+            pages.append(json.loads(text)['data'][address])
+
+        return response['context']['state'], pages
+
+    @classmethod
+    async def _get_transactions(cls, session, endpoint, address):
+        _, pages = await cls._get_pages(session, endpoint, address, 'transaction_count')
+        return [tx for page in pages for tx in page['transactions']]
+
+    @classmethod
+    async def _get_transaction_by_id(cls, session, endpoint, txid):
+        status, text = await fetch(session, endpoint.format(txid))
+        if status == 404:  # pragma: no cover
+            return None
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+
+        response = json.loads(text)['data']
+        if not response:  # pragma: no cover
+            return None
+        return response[txid]['raw_transaction']
+
+    @classmethod
+    async def _get_unspent(cls, session, endpoint, address):
+        block_height, pages = await cls._get_pages(session, endpoint, address, 'unspent_output_count')
+        if not pages:  # pragma: no cover
+            return []
+        script_pubkey = pages[0]['address']['script_hex']
+
+        return [
+            Unspent(
+                utxo['value'],
+                block_height - utxo['block_id'] + 1 if utxo['block_id'] != -1 else 0,
+                script_pubkey,
+                utxo['transaction_hash'],
+                utxo['index'],
+            )
+            for page in pages
+            for utxo in page['utxo']
+        ]
+
+    @classmethod
+    async def _broadcast_tx(cls, session, endpoint, tx_hex):
+        status, _ = await fetch(session, endpoint, method='POST', data={cls.TX_PUSH_PARAM: tx_hex})
+        return status == 200
+
+    @classmethod
+    async def get_balance(cls, session, address):
+        return await cls._get_balance(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_balance_testnet(cls, session, address):
+        return await cls._get_balance(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions(cls, session, address):
+        return await cls._get_transactions(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions_testnet(cls, session, address):
+        return await cls._get_transactions(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transaction_by_id(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.MAIN_TX_API, txid)
+
+    @classmethod
+    async def get_transaction_by_id_testnet(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.TEST_TX_API, txid)
+
+    @classmethod
+    async def get_unspent(cls, session, address):
+        return await cls._get_unspent(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_unspent_testnet(cls, session, address):
+        return await cls._get_unspent(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def broadcast_tx(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.MAIN_TX_PUSH_API, tx_hex)
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.TEST_TX_PUSH_API, tx_hex)
+
+
+class AsyncBlockstreamAPI(BlockstreamAPI):
+    @classmethod
+    async def _get_balance(cls, session, endpoint, address):
+        status, text = await fetch(session, endpoint.format(address))
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        response = json.loads(text)
+        funded = response['chain_stats']['funded_txo_sum'] + response['mempool_stats']['funded_txo_sum']
+        spent = response['chain_stats']['spent_txo_sum'] + response['mempool_stats']['spent_txo_sum']
+        return funded - spent
+
+    @classmethod
+    async def _get_transactions(cls, session, endpoint, address):
+        #! Blockstream returns at most 50 mempool (unconfirmed) transactions and ignores the rest
+        status, text = await fetch(session, (endpoint + '/txs/mempool').format(address))
+        if status == 400:  # pragma: no cover
+            return []
+        elif status != 200:  # pragma: no cover
+            raise ConnectionError
+        unconfirmed = [tx['txid'] for tx in json.loads(text)]
+
+        # It is safer to raise exception if API returns exactly 50 unconfirmed
+        # transactions, as there could be more that the API is unaware of.
+        if len(unconfirmed) == 50:  # pragma: no cover
+            raise ExcessiveAddress
+
+        # Confirmed transactions are paged by the last one of the previous
+        # page, so pages are fetched one after another:
+        transactions = []
+        last = ''
+        while True:
+            status, text = await fetch(session, (endpoint + '/txs/chain/{}').format(address, last))
+            if status == 400:  # pragma: no cover
+                return []
+            elif status != 200:  # pragma: no cover
+                raise ConnectionError
+            response = json.loads(text)
+            if not response:
+                break
+            transactions.extend(tx['txid'] for tx in response)
+            last = transactions[-1]
+
+        transactions.extend(unconfirmed)
+
+        return transactions
+
+    @classmethod
+    async def _get_transaction_by_id(cls, session, endpoint, txid):
+        status, text = await fetch(session, endpoint.format(txid))
+        if status == 404:  # pragma: no cover
+            return None
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return text
+
+    @classmethod
+    async def _get_tip_height(cls, session, endpoint, testnet):
+        tip = services.TIP_HEIGHTS[testnet]
+        if not tip.expired(services.TIP_CACHE_TIME):
+            return tip.value
+
+        status, text = await fetch(session, endpoint + 'blocks/tip/height')
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        services.set_tip_height(int(text), testnet)
+        return int(text)
+
+    @classmethod
+    async def _get_unspent(cls, session, endpoint, address, testnet):
+        block_height, (status, text) = await asyncio.gather(
+            cls._get_tip_height(session, endpoint, testnet),
+            fetch(session, (endpoint + 'address/{}/utxo').format(address)),
+        )
+
+        #! BlockstreamAPI blocks addresses with "too many" UTXOs.
+        if status == 400 and text == "Too many history entries":
+            raise ExcessiveAddress
+        elif status != 200:  # pragma: no cover
+            raise ConnectionError
+
+        return sorted(cls._to_unspents(json.loads(text), block_height, address, testnet), key=lambda u: u.confirmations)
+
+    @classmethod
+    async def _broadcast_tx(cls, session, endpoint, tx_hex):
+        status, _ = await fetch(session, endpoint, method='POST', data={cls.TX_PUSH_PARAM: tx_hex})
+        return status == 200
+
+    @classmethod
+    async def get_balance(cls, session, address):
+        return await cls._get_balance(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_balance_testnet(cls, session, address):
+        return await cls._get_balance(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions(cls, session, address):
+        return await cls._get_transactions(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions_testnet(cls, session, address):
+        return await cls._get_transactions(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transaction_by_id(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.MAIN_TX_API, txid)
+
+    @classmethod
+    async def get_transaction_by_id_testnet(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.TEST_TX_API, txid)
+
+    @classmethod
+    async def get_unspent(cls, session, address):
+        return await cls._get_unspent(session, cls.MAIN_ENDPOINT, address, False)
+
+    @classmethod
+    async def get_unspent_testnet(cls, session, address):
+        return await cls._get_unspent(session, cls.TEST_ENDPOINT, address, True)
+
+    @classmethod
+    async def broadcast_tx(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.MAIN_TX_PUSH_API, tx_hex)
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.TEST_TX_PUSH_API, tx_hex)
+
+
+class AsyncBitcoreAPI(BitcoreAPI):
+    @classmethod
+    async def _get_balance(cls, session, endpoint, address):
+        status, text = await fetch(session, endpoint.format(address))
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)['balance']
+
+    @classmethod
+    async def _get_unspent(cls, session, endpoint, address):
+        endpoint = (endpoint + '&limit=100').format(address)
+        unspents = []
+
+        status, text = await fetch(session, endpoint)
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        response = json.loads(text)
+
+        # Each page tells where the next one starts:
+        while len(response) > 0:
+            unspents.extend(
+                Unspent(
+                    currency_to_satoshi(tx['value'], 'satoshi'),
+                    tx['confirmations'],
+                    tx['script'],
+                    tx['mintTxid'],
+                    tx['mintIndex'],
+                )
+                for tx in response
+            )
+            status, text = await fetch(session, endpoint + '&since={}'.format(response[-1]['_id']))
+            if status != 200:  # pragma: no cover
+                raise ConnectionError
+            response = json.loads(text)
+
+        return unspents
+
+    @classmethod
+    async def get_balance(cls, session, address):
+        return await cls._get_balance(session, cls.MAIN_BALANCE_API, address)
+
+    @classmethod
+    async def get_balance_testnet(cls, session, address):
+        return await cls._get_balance(session, cls.TEST_BALANCE_API, address)
+
+    @classmethod
+    async def get_unspent(cls, session, address):
+        return await cls._get_unspent(session, cls.MAIN_UNSPENT_API, address)
+
+    @classmethod
+    async def get_unspent_testnet(cls, session, address):
+        return await cls._get_unspent(session, cls.TEST_UNSPENT_API, address)
+
+    @classmethod
+    async def broadcast_tx(cls, session, tx_hex):  # pragma: no cover
+        status, _ = await fetch(session, cls.MAIN_TX_PUSH_API, method='POST', data={cls.TX_PUSH_PARAM: tx_hex})
+        return status == 200
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, session, tx_hex):  # pragma: no cover
+        payload = {cls.TX_PUSH_PARAM: tx_hex, 'network': 'testnet', 'coin': 'BCH'}
+        status, _ = await fetch(session, cls.TEST_TX_PUSH_API, method='POST', json=payload)
+        return status == 200
+
+
+class AsyncSmartbitAPI(SmartbitAPI):
+    PAGE_SIZE = 1000
+
+    @classmethod
+    async def _get_balance(cls, session, endpoint, address):
+        status, text = await fetch(session, endpoint.format(address), params={'limit': '1'})
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)['address']['total']['balance_int']
+
+    @classmethod
+    async def _get_linked_pages(cls, session, url, key, paging_key):
+        # Each page links to the next one:
+        params = {'limit': str(cls.PAGE_SIZE)}
+        items = []
+
+        while url:
+            status, text = await fetch(session, url, params=params)
+            if status != 200:  # pragma: no cover
+                raise ConnectionError
+            response = json.loads(text)
+            if key == 'transactions':
+                response = response['address']
+            if key not in response:
+                break
+            items.extend(response[key])
+            url = response[paging_key]['next_link']
+
+        return items
+
+    @classmethod
+    async def _get_transactions(cls, session, endpoint, address):
+        txs = await cls._get_linked_pages(session, endpoint.format(address), 'transactions', 'transaction_paging')
+        return [tx['txid'] for tx in txs]
+
+    @classmethod
+    async def _get_transaction_by_id(cls, session, endpoint, txid):
+        status, text = await fetch(session, endpoint.format(txid) + '?limit=1000')
+        if status == 400:  # pragma: no cover
+            return None
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)['hex'][0]['hex']
+
+    @classmethod
+    async def _get_unspent(cls, session, endpoint, address):
+        utxos = await cls._get_linked_pages(session, endpoint.format(address), 'unspent', 'paging')
+        return [
+            Unspent(
+                currency_to_satoshi(tx['value'], 'btc'),
+                tx['confirmations'],
+                tx['script_pub_key']['hex'],
+                tx['txid'],
+                tx['n'],
+            )
+            for tx in utxos
+        ]
+
+    @classmethod
+    async def _broadcast_tx(cls, session, endpoint, tx_hex):
+        status, _ = await fetch(session, endpoint, method='POST', json={cls.TX_PUSH_PARAM: tx_hex})
+        return status == 200
+
+    @classmethod
+    async def get_balance(cls, session, address):
+        return await cls._get_balance(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_balance_testnet(cls, session, address):
+        return await cls._get_balance(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions(cls, session, address):
+        return await cls._get_transactions(session, cls.MAIN_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transactions_testnet(cls, session, address):
+        return await cls._get_transactions(session, cls.TEST_ADDRESS_API, address)
+
+    @classmethod
+    async def get_transaction_by_id(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.MAIN_TX_API, txid)
+
+    @classmethod
+    async def get_transaction_by_id_testnet(cls, session, txid):
+        return await cls._get_transaction_by_id(session, cls.TEST_TX_API, txid)
+
+    @classmethod
+    async def get_unspent(cls, session, address):
+        return await cls._get_unspent(session, cls.MAIN_UNSPENT_API, address)
+
+    @classmethod
+    async def get_unspent_testnet(cls, session, address):
+        return await cls._get_unspent(session, cls.TEST_UNSPENT_API, address)
+
+    @classmethod
+    async def broadcast_tx(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.MAIN_TX_PUSH_API, tx_hex)
+
+    @classmethod
+    async def broadcast_tx_testnet(cls, session, tx_hex):  # pragma: no cover
+        return await cls._broadcast_tx(session, cls.TEST_TX_PUSH_API, tx_hex)
+
+
+class AsyncBlockchainAPI(BlockchainAPI):
+    TX_PAGE_SIZE = 50
+    UNSPENT_PAGE_SIZE = 1000
+
+    @classmethod
+    async def _get_page(cls, session, address, offset):
+        status, text = await fetch(session, cls.ADDRESS_API.format(address), params={'offset': str(offset)})
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)
+
+    @classmethod
+    async def get_balance(cls, session, address):
+        status, text = await fetch(session, cls.ADDRESS_API.format(address) + '&limit=0')
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return json.loads(text)['final_balance']
+
+    @classmethod
+    async def get_transactions(cls, session, address):
+        # The first page tells how many more to fetch, all at once:
+        first = await cls._get_page(session, address, 0)
+        pages = await asyncio.gather(
+            *(
+                cls._get_page(session, address, offset)
+                for offset in range(cls.TX_PAGE_SIZE, first['n_tx'], cls.TX_PAGE_SIZE)
+            )
+        )
+        return [tx['hash'] for page in [first, *pages] for tx in page['txs']]
+
+    @classmethod
+    async def get_transaction_by_id(cls, session, txid):
+        status, text = await fetch(session, cls.TX_API + txid + '?limit=0&format=hex')
+        if status == 500 and text == 'Transaction not found':  # pragma: no cover
+            return None
+        if status != 200:  # pragma: no cover
+            raise ConnectionError
+        return text
+
+    @classmethod
+    async def get_unspent(cls, session, address):
+        params = {'active': address, 'offset': '0', 'limit': str(cls.UNSPENT_PAGE_SIZE)}
+        status, text = await fetch(session, cls.UNSPENT_API, params=params)
+        if status == 500:  # pragma: no cover
+            return []
+        elif status != 200:  # pragma: no cover
+            raise ConnectionError
+
+        unspents = [
+            Unspent(tx['value'], tx['confirmations'], tx['script'], tx['tx_hash_big_endian'], tx['tx_output_n'])
+            for tx in json.loads(text)['unspent_outputs']
+        ]
+
+        #! BlockchainAPI only supports up to 1000 UTXOs.
+        if len(unspents) == cls.UNSPENT_PAGE_SIZE:
+            raise ExcessiveAddress
+
+        return unspents[::-1]
+
+    @classmethod
+    async def broadcast_tx(cls, session, tx_hex):  # pragma: no cover
+        status, _ = await fetch(session, cls.TX_PUSH_API, method='POST', data={cls.TX_PUSH_PARAM: tx_hex})
+        return status == 200
+
+
+class AsyncNetworkAPI:
+    """The asyncio counterpart of :class:`~bit.network.NetworkAPI`, falling
+    back on the next API service in the same way when one fails. Lookups
+    share the connections of one ``aiohttp`` session, so many of them can be
+    awaited concurrently:
+
+    .. code-block:: python
+
+        async with AsyncNetworkAPI() as api:
+            balances = await asyncio.gather(*(api.get_balance(a) for a in addresses))
+
+    Requires the ``async`` extra: ``pip install bit[async]``.
+
+    :param connections: The maximum number of connections open at once.
+    :type connections: ``int``
+    """
+
+    IGNORED_ERRORS = (ConnectionError, aiohttp.ClientError, asyncio.TimeoutError, ExcessiveAddress)
+
+    # The same API services in the same order as NetworkAPI:
+    GET_BALANCE_MAIN = [
+        AsyncBlockchairAPI.get_balance,
+        AsyncBlockstreamAPI.get_balance,
+        AsyncBitcoreAPI.get_balance,
+        AsyncSmartbitAPI.get_balance,
+        AsyncBlockchainAPI.get_balance,
+    ]
+    GET_TRANSACTIONS_MAIN = [
+        AsyncBlockchairAPI.get_transactions,
+        AsyncBlockstreamAPI.get_transactions,
+        AsyncSmartbitAPI.get_transactions,
+        AsyncBlockchainAPI.get_transactions,
+    ]
+    GET_TRANSACTION_BY_ID_MAIN = [
+        AsyncBlockchairAPI.get_transaction_by_id,
+        AsyncBlockstreamAPI.get_transaction_by_id,
+        AsyncSmartbitAPI.get_transaction_by_id,
+        AsyncBlockchainAPI.get_transaction_by_id,
+    ]
+    GET_UNSPENT_MAIN = [
+        AsyncBlockstreamAPI.get_unspent,
+        AsyncBlockchairAPI.get_unspent,
+        AsyncSmartbitAPI.get_unspent,
+        AsyncBlockchainAPI.get_unspent,
+        AsyncBitcoreAPI.get_unspent,
+    ]
+    BROADCAST_TX_MAIN = [
+        AsyncBlockchairAPI.broadcast_tx,
+        AsyncBlockstreamAPI.broadcast_tx,
+        AsyncBitcoreAPI.broadcast_tx,
+        AsyncSmartbitAPI.broadcast_tx,
+        AsyncBlockchainAPI.broadcast_tx,
+    ]
+
+    GET_BALANCE_TEST = [
+        AsyncBlockchairAPI.get_balance_testnet,
+        AsyncBlockstreamAPI.get_balance_testnet,
+        AsyncBitcoreAPI.get_balance_testnet,
+        AsyncSmartbitAPI.get_balance_testnet,
+    ]
+    GET_TRANSACTIONS_TEST = [
+        AsyncBlockchairAPI.get_transactions_testnet,
+        AsyncBlockstreamAPI.get_transactions_testnet,
+        AsyncSmartbitAPI.get_transactions_testnet,
+    ]
+    GET_TRANSACTION_BY_ID_TEST = [
+        AsyncBlockchairAPI.get_transaction_by_id_testnet,
+        AsyncBlockstreamAPI.get_transaction_by_id_testnet,
+        AsyncSmartbitAPI.get_transaction_by_id_testnet,
+    ]
+    GET_UNSPENT_TEST = [
+        AsyncBlockstreamAPI.get_unspent_testnet,
+        AsyncBlockchairAPI.get_unspent_testnet,
+        AsyncSmartbitAPI.get_unspent_testnet,
+        AsyncBitcoreAPI.get_unspent_testnet,
+    ]
+    BROADCAST_TX_TEST = [
+        AsyncBlockchairAPI.broadcast_tx_testnet,
+        AsyncBlockstreamAPI.broadcast_tx_testnet,
+        AsyncBitcoreAPI.broadcast_tx_testnet,
+        AsyncSmartbitAPI.broadcast_tx_testnet,
+    ]
+
+    def __init__(self, connections=DEFAULT_CONNECTIONS):
+        self.connections = connections
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.connections))
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Closes the connections of the session."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _call(self, api_calls, argument):
+        if self.session is None:
+            raise RuntimeError('Use AsyncNetworkAPI as an async context manager.')
+
+        for api_call in api_calls:
+            try:
+                return await api_call(self.session, argument)
+            except self.IGNORED_ERRORS:
+                pass
+
+        raise ConnectionError('All APIs are unreachable.')
+
+    async def _broadcast(self, api_calls, tx_hex):
+        if self.session is None:
+            raise RuntimeError('Use AsyncNetworkAPI as an async context manager.')
+
+        success = None
+
+        for api_call in api_calls:
+            try:
+                success = await api_call(self.session, tx_hex)
+                if not success:
+                    continue
+                return
+            except self.IGNORED_ERRORS:
+                pass
+
+        if success is False:
+            raise ConnectionError('Transaction broadcast failed, or Unspents were already used.')
+
+        raise ConnectionError('All APIs are unreachable.')
+
+    async def get_balance(self, address):
+        """Gets the balance of an address in satoshi.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return await self._call(self.GET_BALANCE_MAIN, address)
+
+    async def get_balance_testnet(self, address):
+        """Gets the balance of an address on the test network in satoshi.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return await self._call(self.GET_BALANCE_TEST, address)
+
+    async def get_transactions(self, address):
+        """Gets the ID of all transactions related to an address.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of ``str``
+        """
+        return await self._call(self.GET_TRANSACTIONS_MAIN, address)
+
+    async def get_transactions_testnet(self, address):
+        """Gets the ID of all transactions related to an address on the test
+        network.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of ``str``
+        """
+        return await self._call(self.GET_TRANSACTIONS_TEST, address)
+
+    async def get_transaction_by_id(self, txid):
+        """Gets a raw transaction hex by its transaction id (txid).
+
+        :param txid: The id of the transaction
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``string``
+        """
+        return await self._call(self.GET_TRANSACTION_BY_ID_MAIN, txid)
+
+    async def get_transaction_by_id_testnet(self, txid):
+        """Gets a raw transaction hex by its transaction id (txid) on the test.
+
+        :param txid: The id of the transaction
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``string``
+        """
+        return await self._call(self.GET_TRANSACTION_BY_ID_TEST, txid)
+
+    async def get_unspent(self, address):
+        """Gets all unspent transaction outputs belonging to an address.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return await self._call(self.GET_UNSPENT_MAIN, address)
+
+    async def get_unspent_testnet(self, address):
+        """Gets all unspent transaction outputs belonging to an address on the
+        test network.
+
+        :param address: The address in question.
+        :type address: ``str``
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return await self._call(self.GET_UNSPENT_TEST, address)
+
+    async def broadcast_tx(self, tx_hex):  # pragma: no cover
+        """Broadcasts a transaction to the blockchain.
+
+        :param tx_hex: A signed transaction in hex form.
+        :type tx_hex: ``str``
+        :raises ConnectionError: If all API services fail.
+        """
+        await self._broadcast(self.BROADCAST_TX_MAIN, tx_hex)
+
+    async def broadcast_tx_testnet(self, tx_hex):  # pragma: no cover
+        """Broadcasts a transaction to the test network's blockchain.
+
+        :param tx_hex: A signed transaction in hex form.
+        :type tx_hex: ``str``
+        :raises ConnectionError: If all API services fail.
+        """
+        await self._broadcast(self.BROADCAST_TX_TEST, tx_hex)
@@ -0,0 +1,428 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from threading import Lock, Thread, local
+from time import time
+
+# Fraction of the cache time after which a background refresh is started.
+REFRESH_AHEAD = 0.8
+
+# Seconds, at most the cache time, during which a failed refresh is not retried.
+RETRY_TIME = 10
+
+# Persistent store shared by processes, see set_cache_store.
+STORE = None
+
+# Number of raw transactions kept in memory by a TransactionCache.
+TRANSACTION_CACHE_SIZE = 1000
+
+
+def set_cache_store(store):
+    global STORE
+    STORE = store
+
+
+class FileStore:
+    """Stores cached values as JSON files in a directory, so that processes
+    using the same directory share them. Files are replaced atomically.
+
+    :param path: The directory to store the values in. It is created if it
+                 does not exist.
+    :type path: ``str``
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get(self, key):
+        """Gets a stored value and the time it was fetched at, or ``None``."""
+        try:
+            with open(os.path.join(self.path, key + '.json'), 'r') as f:
+                entry = json.load(f)
+            return entry['value'], entry['last_update']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key, value, last_update):
+        """Stores a value and the time it was fetched at."""
+        fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'value': value, 'last_update': last_update}, f)
+            os.replace(temp_path, os.path.join(self.path, key + '.json'))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+class LMDBStore:
+    """Stores cached values in an LMDB database, which processes using the
+    same path share. Requires the ``cache`` extra: ``pip install bit[cache]``.
+
+    :param path: The directory of the database.
+    :type path: ``str``
+    :param map_size: The maximum size of the database in bytes.
+    :type map_size: ``int``
+    """
+
+    def __init__(self, path, map_size=2 ** 20):
+        import lmdb
+
+        self.env = lmdb.open(path, map_size=map_size)
+
+    def get(self, key):
+        """Gets a stored value and the time it was fetched at, or ``None``."""
+        with self.env.begin() as txn:
+            data = txn.get(key.encode())
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data.decode())
+            return entry['value'], entry['last_update']
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def set(self, key, value, last_update):
+        """Stores a value and the time it was fetched at."""
+        with self.env.begin(write=True) as txn:
+            txn.put(key.encode(), json.dumps({'value': value, 'last_update': last_update}).encode())
+
+
+class SQLiteStore:
+    """Stores cached values in an SQLite database, which processes using the
+    same file share.
+
+    :param path: The file of the database. It is created if it does not
+                 exist.
+    :type path: ``str``
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Connections can only be used by the thread that opened them:
+        self._local = local()
+        with self.connect() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_update REAL NOT NULL)'
+            )
+
+    def connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10)
+        return db
+
+    def get(self, key):
+        """Gets a stored value and the time it was fetched at, or ``None``."""
+        row = self.connect().execute('SELECT value, last_update FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError:
+            return None
+
+    def set(self, key, value, last_update):
+        """Stores a value and the time it was fetched at."""
+        with self.connect() as db:
+            db.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', (key, json.dumps(value), last_update))
+
+
+def calc_wtxid(tx_hex):
+    """Gets the hash of the full serialization of a raw transaction including
+    its witness data, which its transaction id does not commit to, or
+    ``None`` if the serialization is not canonical."""
+    # Imported here, as the transaction module depends on the network:
+    from bit.crypto import double_sha256
+    from bit.transaction import deserialize
+    from bit.utils import bytes_to_hex, hex_to_bytes
+
+    try:
+        raw = hex_to_bytes(tx_hex)
+        # Extra or malformed bytes would not survive serializing again:
+        if bytes(deserialize(raw)) != raw:
+            return None
+        return bytes_to_hex(double_sha256(raw)[::-1])
+    except Exception:
+        return None
+
+
+def verify_txid(tx_hex, txid):
+    """Checks that a raw transaction hashes to a transaction id."""
+    from bit.transaction import calc_txid
+
+    try:
+        return calc_txid(tx_hex) == txid.lower()
+    except Exception:
+        return False
+
+
+class TransactionCache:
+    """Caches raw transactions by their transaction id. As the contents of a
+    confirmed transaction never change, entries do not expire: the least
+    recently used ones are evicted once there are more than ``size`` in
+    memory. Unconfirmed transactions must not be cached, as they may be
+    replaced or dropped.
+
+    Entries of the optional ``store``, e.g. :class:`~bit.network.cache.SQLiteStore`
+    or :class:`~bit.network.cache.LMDBStore`, are kept across processes. Only
+    transactions hashing to their id are cached. They are stored with the
+    hash of their full serialization (wtxid), and both are checked again
+    before serving one from the store, so that corrupted witness data is
+    detected too.
+
+    :param size: The number of transactions kept in memory.
+    :type size: ``int``
+    :param store: A persistent store with the interface of
+                  :class:`~bit.network.cache.FileStore`.
+    """
+
+    def __init__(self, size=TRANSACTION_CACHE_SIZE, store=None):
+        self.size = size
+        self.store = store
+        self.transactions = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def get(self, txid):
+        """Gets a cached raw transaction, or ``None``.
+
+        :param txid: The id of the transaction.
+        :type txid: ``str``
+        :rtype: ``str``
+        """
+        txid = txid.lower()
+        with self.lock:
+            tx_hex = self.transactions.get(txid)
+            if tx_hex is not None:
+                self.transactions.move_to_end(txid)
+                return tx_hex
+
+        if self.store is None:
+            return None
+
+        try:
+            entry = self.store.get('tx-' + txid)
+        except Exception as e:
+            logging.warning('Loading cached transaction {} failed: {}'.format(txid, e))
+            return None
+
+        value = entry[0] if entry is not None else None
+        if (
+            not isinstance(value, dict)
+            or not isinstance(value.get('hex'), str)
+            or not verify_txid(value['hex'], txid)
+            or calc_wtxid(value['hex']) != value.get('wtxid')
+        ):
+            return None
+
+        self.remember(txid, value['hex'])
+        return value['hex']
+
+    def set(self, txid, tx_hex):
+        """Caches a confirmed raw transaction, unless it does not hash to
+        ``txid`` or does not serialize canonically.
+
+        :param txid: The id of the transaction.
+        :type txid: ``str``
+        :param tx_hex: The raw transaction.
+        :type tx_hex: ``str``
+        :returns: Whether the transaction was cached.
+        :rtype: ``bool``
+        """
+        txid = txid.lower()
+        wtxid = calc_wtxid(tx_hex)
+        if wtxid is None or not verify_txid(tx_hex, txid):
+            logging.warning('Transaction {} does not match its id, not caching it.'.format(txid))
+            return False
+
+        self.remember(txid, tx_hex)
+
+        if self.store is not None:
+            try:
+                self.store.set('tx-' + txid, {'hex': tx_hex, 'wtxid': wtxid}, time())
+            except Exception as e:
+                logging.warning('Storing cached transaction {} failed: {}'.format(txid, e))
+
+        return True
+
+    def remember(self, txid, tx_hex):
+        with self.lock:
+            self.transactions[txid] = tx_hex
+            self.transactions.move_to_end(txid)
+            while len(self.transactions) > self.size:
+                self.transactions.popitem(last=False)
+
+
+class CachedValue:
+    """A value fetched from the network that is cached for a period of time.
+
+    Concurrent refreshes are coalesced: callers that waited on a refresh by
+    another thread use its result instead of fetching again, or get its
+    exception if it failed with one of the errors raised to the caller.
+
+    :param fetch: A function returning the current value.
+    :type fetch: ``callable``
+    :param errors: The exceptions of ``fetch`` on which the last good value is
+                   kept. Other exceptions are raised to the caller.
+    :type errors: ``tuple``
+    :param name: The name of the value used for logging.
+    :type name: ``str``
+    :param key: If given, the value is shared with other processes through
+                the store set by :func:`~bit.network.cache.set_cache_store`
+                under this key. The value must be serializable as JSON.
+    :type key: ``str``
+    """
+
+    __slots__ = (
+        'value',
+        'last_update',
+        'last_failure',
+        'lock',
+        'refreshes',
+        'error',
+        'fetch',
+        'errors',
+        'name',
+        'key',
+    )
+
+    def __init__(self, fetch, errors=(), name='value', key=None):
+        self.value = None
+        self.last_update = 0
+        self.last_failure = 0
+        self.lock = Lock()
+        self.refreshes = 0
+        self.error = None
+        self.fetch = fetch
+        self.errors = errors
+        self.name = name
+        self.key = key
+
+    def age(self):
+        return time() - self.last_update
+
+    def expired(self, cache_time):
+        return self.value is None or self.age() > cache_time
+
+    def failed_recently(self, cache_time):
+        return time() - self.last_failure < min(RETRY_TIME, cache_time)
+
+    def get(self, cache_time, background=False):
+        """Gets the cached value, refreshing it if it expired.
+
+        :param cache_time: The number of seconds the value is valid.
+        :type cache_time: ``int``
+        :param background: If ``True`` and a value was fetched before, it is
+                           returned right away, even if it expired, and it is
+                           refreshed ahead of expiry by a background thread.
+        :type background: ``bool``
+        :returns: The cached value or ``None`` if it never could be fetched.
+                  After a failed refresh, the cached value is returned without
+                  retrying for ``RETRY_TIME`` seconds.
+        """
+        if background and self.value is not None:
+            now = time()
+            # Refresh once the value is close to expiry, but retry failed
+            # refreshes only once per the remaining fraction of cache time:
+            if (
+                now - self.last_update > cache_time * REFRESH_AHEAD
+                and now - self.last_failure > cache_time * (1 - REFRESH_AHEAD)
+            ):
+                self.refresh_in_background()
+            return self.value
+
+        if self.expired(cache_time) and not self.failed_recently(cache_time):
+            refreshes = self.refreshes
+
+            with self.lock:
+                if self.refreshes != refreshes:
+                    # The refresh waited on failed without a value to keep:
+                    if self.value is None and self.error is not None:
+                        raise self.error
+                # Another process may have stored a fresh value:
+                elif self.expired(cache_time) and not self.load(cache_time):
+                    self.refresh()
+
+        return self.value
+
+    def load(self, cache_time):
+        # Must be called while holding the lock.
+        if STORE is None or self.key is None:
+            return False
+
+        try:
+            entry = STORE.get(self.key)
+        except Exception as e:
+            logging.warning('Loading cached {} failed: {}'.format(self.name, e))
+            return False
+
+        if entry is None or entry[0] is None or time() - entry[1] > cache_time:
+            return False
+
+        self.value, self.last_update = entry
+        return True
+
+    def store(self):
+        if STORE is None or self.key is None:
+            return
+
+        try:
+            STORE.set(self.key, self.value, self.last_update)
+        except Exception as e:
+            logging.warning('Storing cached {} failed: {}'.format(self.name, e))
+
+    def set(self, value):
+        """Replaces the cached value, e.g. with a value pushed by a stream."""
+        with self.lock:
+            self.value = value
+            self.last_update = time()
+            self.error = None
+            self.store()
+            self.refreshes += 1
+
+    def refresh(self):
+        # Must be called while holding the lock.
+        self.error = None
+        try:
+            self.value = self.fetch()
+            self.last_update = time()
+            self.store()
+        except self.errors:
+            self.last_failure = time()
+            if self.value is None:
+                logging.warning('Connection to {} API failed, returning default.'.format(self.name))
+            else:
+                logging.warning('Connection to {} API failed, returning cached {}.'.format(self.name, self.name))
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self.refreshes += 1
+
+    def refresh_in_background(self):
+        """Starts a refresh in a background thread unless one is running."""
+        if not self.lock.acquire(blocking=False):
+            return
+
+        def refresh():
+            try:
+                self.refresh()
+            except Exception as e:  # pragma: no cover
+                self.last_failure = time()
+                logging.warning('Background refresh of {} failed: {}'.format(self.name, e))
+            finally:
+                self.lock.release()
+
+        try:
+            Thread(target=refresh, daemon=True).start()
+        except Exception:  # pragma: no cover
+            self.lock.release()
+            raise
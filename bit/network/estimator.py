@@ -0,0 +1,333 @@
+import math
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock, Thread
+
+from bit.network.fees import DEFAULT_TIMEOUT, FEE_TIERS, FETCH_ERRORS, NODE_TARGETS, TIER_TARGETS
+from bit.network.session import get_session
+
+# Lower bounds in satoshi per byte of the fee rate buckets, each 5% above the
+# previous one, from 1 to 10000:
+BUCKET_SPACING = 1.05
+FEE_BUCKETS = array('d', (BUCKET_SPACING ** i for i in range(math.ceil(math.log(10000, BUCKET_SPACING)) + 1)))
+
+# Number of recent blocks to estimate fees from.
+DEFAULT_MAX_BLOCKS = 144
+
+# Number of most recent blocks fetched before the first estimate, the older
+# blocks of the window are fetched in the background:
+DEFAULT_SEED_BLOCKS = 6
+
+# Maximum number of blocks fetched from the node at once:
+FETCH_WORKERS = 8
+
+# Share of the virtual size of a full block paying less than the fee rate a
+# transaction needed to be included. Lower fee rates in a block are often
+# parents of high paying children or prioritized transactions:
+FLOOR_PERCENTILE = 0.05
+
+# Blocks below this weight had room for any transaction paying the minimum
+# relay fee:
+FULL_BLOCK_WEIGHT = 3600000
+
+# Share of the windows of recent blocks in which a transaction paying the
+# estimated fee would have confirmed:
+SUCCESS_THRESHOLD = 0.85
+
+
+class BlockFeeEstimator:
+    """Estimates fees from recent blocks of a node instead of a fee API.
+
+    For each block the fee rates of its transactions are computed from their
+    prevouts and weighted by their virtual size in a histogram, from which the
+    lowest fee rate the block included is taken. For a delay of ``n`` blocks,
+    a histogram counts the lowest fee rate that got into any of ``n``
+    consecutive blocks over all windows of the recent blocks, and the fee
+    estimated for a target of ``n`` blocks is the fee rate that would have
+    confirmed in ``SUCCESS_THRESHOLD`` of them. The histograms are updated
+    with the windows of blocks as they are added or dropped, so queries are
+    lookups.
+
+    Without any blocks, only the ``seed_blocks`` most recent blocks are
+    fetched before the first estimate, while the older blocks of the window
+    are fetched in a background thread. Blocks are fetched concurrently.
+
+    :param node: The node to fetch blocks from, either as returned by
+                 :func:`~bit.network.services.NetworkAPI.connect_to_node` or
+                 the URL of its REST interface, e.g. ``http://127.0.0.1:8332``.
+    :type node: ``RPCHost`` or ``str``
+    :param max_blocks: The number of recent blocks to estimate fees from.
+    :type max_blocks: ``int``
+    :param seed_blocks: The number of recent blocks fetched before the first
+                        estimate.
+    :type seed_blocks: ``int``
+    """
+
+    def __init__(self, node=None, max_blocks=DEFAULT_MAX_BLOCKS, seed_blocks=DEFAULT_SEED_BLOCKS):
+        self.node = node
+        self.max_blocks = max_blocks
+        self.seed_blocks = seed_blocks
+        # Per block its hash, height, histogram of virtual sizes by fee rate
+        # and weight:
+        self.blocks = deque()
+        # Per confirmation delay the histogram of window fee rate floors:
+        self.histograms = []
+        self._estimates = array('d')
+        # The fee rate floor of each block and the hash of the block before
+        # the first one:
+        self._floors = deque()
+        self._previous = None
+        self._backfill = None
+        self._lock = RLock()
+
+    @property
+    def height(self):
+        """The height of the last block added, or ``-1``."""
+        return self.blocks[-1][1] if self.blocks else -1
+
+    def update(self):
+        """Fetches the blocks mined since the last update from the node.
+
+        :raises ConnectionError: If the node is unreachable.
+        """
+        with self._lock:
+            tip = self._get_block_count()
+            start = max(tip - self.max_blocks + 1, 0)
+
+            if self.blocks and self.height >= start - 1:
+                blocks = self._fetch_blocks(range(self.height + 1, tip + 1))
+                if not blocks or blocks[0].get('previousblockhash') == self.blocks[-1][0] and self._linked(blocks):
+                    self.add_blocks(blocks)
+                    self._start_backfill()
+                    return
+
+            # Without blocks, after a reorganization or once all blocks left
+            # the window, start over from the most recent blocks:
+            self._clear()
+            blocks = self._fetch_blocks(range(max(tip - self.seed_blocks + 1, start), tip + 1))
+            if not self._linked(blocks):
+                # The chain was reorganized while fetching:
+                return self.update()
+            self.add_blocks(blocks)
+            self._start_backfill()
+
+    def backfill(self):
+        """Fetches the older blocks missing from the window, which
+        :func:`~bit.network.BlockFeeEstimator.update` does in the background
+        after fetching the most recent blocks.
+
+        :raises ConnectionError: If the node is unreachable.
+        """
+        with self._lock:
+            if not self.blocks:
+                return
+            first, previous = self.blocks[0][1], self._previous
+            heights = range(max(first - self.max_blocks + len(self.blocks), 0), first)
+
+        blocks = self._fetch_blocks(heights)
+
+        with self._lock:
+            # Blocks of a chain reorganized meanwhile, or once the window
+            # moved on, are not added:
+            if not blocks or blocks[-1]['hash'] != previous or self._previous != previous or not self._linked(blocks):
+                return
+            room = self.max_blocks - len(self.blocks)
+            if room > 0:
+                self._prepend(blocks[-room:])
+                self._update_estimates()
+
+    def wait(self, timeout=None):
+        """Waits until the background fetching of older blocks finished.
+
+        :param timeout: The maximum number of seconds to wait.
+        :type timeout: ``float``
+        """
+        backfill = self._backfill
+        if backfill is not None:
+            backfill.join(timeout)
+
+    def add_blocks(self, blocks):
+        """Adds blocks, ordered by height, and updates the estimates.
+
+        :param blocks: Blocks as returned by the ``getblock`` RPC with a
+                       verbosity of 3, or 2 for nodes reporting the fees of
+                       transactions.
+        :type blocks: ``list`` of ``dict``
+        """
+        with self._lock:
+            for block in blocks:
+                if not self.blocks:
+                    self._previous = block.get('previousblockhash')
+                elif len(self.blocks) >= self.max_blocks:
+                    # Drops the windows starting at the oldest block:
+                    self._count_windows(self._floors, -1)
+                    self._previous = self.blocks.popleft()[0]
+                    self._floors.popleft()
+
+                histogram = self.block_histogram(block)
+                self.blocks.append((block['hash'], block['height'], histogram, block['weight']))
+                self._floors.append(self.block_floor(histogram, block['weight']))
+                # Adds the windows ending at the new block:
+                self._count_windows(reversed(self._floors), 1)
+            self._update_estimates()
+
+    def _prepend(self, blocks):
+        for block in reversed(blocks):
+            histogram = self.block_histogram(block)
+            self.blocks.appendleft((block['hash'], block['height'], histogram, block['weight']))
+            self._floors.appendleft(self.block_floor(histogram, block['weight']))
+            self._previous = block.get('previousblockhash')
+            # Adds the windows starting at the new block:
+            self._count_windows(self._floors, 1)
+
+    def _clear(self):
+        self.blocks.clear()
+        self._floors.clear()
+        self._previous = None
+        self.histograms = []
+        self._estimates = array('d')
+
+    def _start_backfill(self):
+        if len(self.blocks) >= self.max_blocks or self.blocks[0][1] == 0:
+            return
+        if self._backfill is not None and self._backfill.is_alive():
+            return
+
+        def backfill():
+            try:
+                self.backfill()
+            except FETCH_ERRORS:
+                # Retried on the next update:
+                pass
+
+        self._backfill = Thread(target=backfill, daemon=True)
+        self._backfill.start()
+
+    @staticmethod
+    def _linked(blocks):
+        return all(block.get('previousblockhash') == parent['hash'] for parent, block in zip(blocks, blocks[1:]))
+
+    @staticmethod
+    def block_histogram(block):
+        """Gets the virtual sizes of the transactions of a block by fee rate
+        bucket of ``FEE_BUCKETS``.
+
+        :rtype: ``array``
+        """
+        histogram = array('d', bytes(8 * len(FEE_BUCKETS)))
+
+        # The coinbase transaction pays no fee:
+        for tx in block['tx'][1:]:
+            if 'fee' in tx:
+                fee = tx['fee']
+            elif all('prevout' in txin for txin in tx['vin']):
+                fee = sum(txin['prevout']['value'] for txin in tx['vin']) - sum(out['value'] for out in tx['vout'])
+            else:
+                continue
+
+            vsize = tx['vsize']
+            # Amounts are given in BTC:
+            rate = float(fee) * 10 ** 8 / vsize
+            histogram[max(bisect_right(FEE_BUCKETS, rate) - 1, 0)] += vsize
+
+        return histogram
+
+    @staticmethod
+    def block_floor(histogram, weight):
+        # The bucket of the lowest fee rate the block included:
+        if weight < FULL_BLOCK_WEIGHT:
+            return 0
+
+        required = sum(histogram) * FLOOR_PERCENTILE
+        total = 0
+        for bucket, vsize in enumerate(histogram):
+            total += vsize
+            if total > required:
+                return bucket
+        return 0
+
+    def _count_windows(self, floors, count):
+        # Counts the windows of each delay that start with the first of the
+        # floors, whose lowest floor is the running minimum:
+        floor = None
+        for delay, block_floor in enumerate(floors, 1):
+            floor = block_floor if floor is None else min(floor, block_floor)
+            if delay > len(self.histograms):
+                self.histograms.append(array('L', bytes(array('L').itemsize * len(FEE_BUCKETS))))
+            self.histograms[delay - 1][floor] += count
+
+    def _update_estimates(self):
+        estimates = array('d')
+
+        for delay, histogram in enumerate(self.histograms[: len(self.blocks)], 1):
+            required = SUCCESS_THRESHOLD * (len(self.blocks) - delay + 1)
+            total = 0
+            for bucket, count in enumerate(histogram):
+                total += count
+                if total >= required:
+                    break
+
+            # Pay the upper bound of the bucket, or the minimum relay fee of
+            # the first bucket if blocks had room:
+            estimates.append(FEE_BUCKETS[bucket] * BUCKET_SPACING if bucket else FEE_BUCKETS[0])
+
+        self._estimates = estimates
+
+    def estimate(self, blocks):
+        """Gets the lowest satoshi per byte fee that would have confirmed
+        within ``blocks`` blocks, or ``None`` without any blocks.
+
+        :param blocks: The confirmation target in blocks.
+        :type blocks: ``int``
+        :rtype: ``int``
+        """
+        estimates = self._estimates
+        if not estimates:
+            return None
+        return math.ceil(estimates[min(max(blocks, 1), len(estimates)) - 1])
+
+    def get_fee_estimates(self):
+        """Gets satoshi per byte fees by confirmation target, see
+        :func:`~bit.network.fees.get_fee_estimates`.
+
+        :rtype: ``dict``
+        """
+        if not self._estimates:
+            raise ConnectionError('No blocks to estimate fees from.')
+        return {target: self.estimate(target) for target in NODE_TARGETS}
+
+    def get_fees(self):
+        """Gets the satoshi per byte fees of all tiers, see
+        :func:`~bit.network.fees.get_fees`.
+
+        :rtype: ``dict``
+        """
+        if not self._estimates:
+            raise ConnectionError('No blocks to estimate fees from.')
+        return {tier: self.estimate(TIER_TARGETS[tier]) for tier in FEE_TIERS}
+
+    def _get_block_count(self):
+        if isinstance(self.node, str):
+            return self._rest('chaininfo.json')['blocks']
+        return self.node.getblockcount()
+
+    def _fetch_blocks(self, heights):
+        heights = list(heights)
+        if len(heights) < 2:
+            return [self._get_block(height) for height in heights]
+        with ThreadPoolExecutor(min(len(heights), FETCH_WORKERS)) as executor:
+            return list(executor.map(self._get_block, heights))
+
+    def _get_block(self, height):
+        if isinstance(self.node, str):
+            block_hash = self._rest('blockhashbyheight/{}.json'.format(height))['blockhash']
+            return self._rest('block/{}.json'.format(block_hash))
+        return self.node.getblock(self.node.getblockhash(height), 3)
+
+    def _rest(self, path):
+        r = get_session().get('{}/rest/{}'.format(self.node.rstrip('/'), path), timeout=DEFAULT_TIMEOUT)
+        # If we have a non 2XX status code, raise HTTPError.
+        r.raise_for_status()
+        return r.json()
@@ -1,15 +1,50 @@
 import logging
+import math
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import wraps
-from time import time
+from statistics import median_high
+from threading import Lock
+from weakref import WeakKeyDictionary, ref
 
 import requests
-from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+from bit.exceptions import BitcoinNodeException
+from bit.network.cache import CachedValue
+from bit.network.session import get_session
+from bit.utils import Decimal
 
 # Default fees last updated 2019-04-02
 DEFAULT_FEE_FAST = 72
+DEFAULT_FEE_HALF_HOUR = 67
 DEFAULT_FEE_HOUR = 62
+DEFAULT_FEE_ECONOMY = 30
+DEFAULT_FEE_MINIMUM = 1
 DEFAULT_CACHE_TIME = 60 * 10
+DEFAULT_TIMEOUT = 5
+BACKGROUND_REFRESH = False
+# Estimator used instead of the fee APIs, see set_fee_estimator:
+FEE_ESTIMATOR = None
 URL = 'https://mempool.space/api/v1/fees/recommended'
+MEMPOOL_BLOCKS_URL = 'https://mempool.space/api/v1/fees/mempool-blocks'
+
+# Fee tiers returned by the fee API, from the fastest to the slowest:
+FEE_TIERS = ('fastestFee', 'halfHourFee', 'hourFee', 'economyFee', 'minimumFee')
+
+# Errors on which cached fees, or the defaults, are used:
+FETCH_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.HTTPError,
+    requests.exceptions.Timeout,
+    ConnectionError,
+    BitcoinNodeException,
+)
+
+# Confirmation targets in blocks the fee tiers correspond to:
+TIER_TARGETS = {'fastestFee': 1, 'halfHourFee': 3, 'hourFee': 6, 'economyFee': 144, 'minimumFee': 1008}
+
+# Confirmation targets for which fees are estimated by a node:
+NODE_TARGETS = (1, 2, 3, 6, 12, 24, 48, 144, 504, 1008)
 
 
 def set_fee_cache_time(seconds):
@@ -17,6 +52,111 @@ def set_fee_cache_time(seconds):
     DEFAULT_CACHE_TIME = seconds
 
 
+def set_fee_background_refresh(enabled):
+    global BACKGROUND_REFRESH
+    BACKGROUND_REFRESH = enabled
+
+
+def set_fee_estimator(estimator):
+    global FEE_ESTIMATOR
+    FEE_ESTIMATOR = estimator
+
+
+def default_fees():
+    return {
+        'fastestFee': DEFAULT_FEE_FAST,
+        'halfHourFee': DEFAULT_FEE_HALF_HOUR,
+        'hourFee': DEFAULT_FEE_HOUR,
+        'economyFee': DEFAULT_FEE_ECONOMY,
+        'minimumFee': DEFAULT_FEE_MINIMUM,
+    }
+
+
+class MempoolFees:
+    MAIN_API = URL
+
+    @classmethod
+    def get_fees(cls):
+        r = get_session().get(cls.MAIN_API, timeout=DEFAULT_TIMEOUT)
+        # If we have a non 2XX status code, raise HTTPError.
+        r.raise_for_status()
+        fees = r.json()
+        return {tier: fees[tier] for tier in FEE_TIERS}
+
+
+class BlockstreamFees:
+    MAIN_API = 'https://blockstream.info/api/fee-estimates'
+
+    @classmethod
+    def get_fees(cls):
+        r = get_session().get(cls.MAIN_API, timeout=DEFAULT_TIMEOUT)
+        r.raise_for_status()
+        # Fees are given by confirmation target:
+        estimates = r.json()
+        return {tier: math.ceil(estimates[str(target)]) for tier, target in TIER_TARGETS.items()}
+
+
+class FeesAPI:
+    """Queries all fee providers of ``GET_FEES`` in parallel. With at least
+    ``QUORUM`` answers, by default a majority of the providers, the median of
+    each tier is returned, otherwise the answer of the provider listed first.
+    """
+
+    # Malformed responses raise KeyError or ValueError:
+    IGNORED_ERRORS = FETCH_ERRORS + (KeyError, ValueError)
+
+    GET_FEES = [MempoolFees.get_fees, BlockstreamFees.get_fees]
+
+    # The number of answers needed for the median, or None for a majority:
+    QUORUM = None
+
+    @classmethod
+    def get_fees(cls):
+        api_calls = list(cls.GET_FEES)
+
+        executor = ThreadPoolExecutor(len(api_calls))
+        futures = [executor.submit(api_call) for api_call in api_calls]
+        # Do not wait for providers that exceed the timeout:
+        wait(futures, timeout=DEFAULT_TIMEOUT)
+        executor.shutdown(wait=False)
+
+        results = []
+        for future in futures:
+            if not future.done():
+                continue
+            try:
+                results.append(future.result())
+            except cls.IGNORED_ERRORS as e:
+                logging.debug('Fee provider failed: {!r}'.format(e))
+
+        if not results:
+            raise ConnectionError('All APIs are unreachable.')
+
+        quorum = cls.QUORUM or len(api_calls) // 2 + 1
+        if len(results) < quorum:
+            return results[0]
+
+        return {tier: median_high(fees[tier] for fees in results) for tier in FEE_TIERS}
+
+
+def get_fees():
+    """Gets the recommended satoshi per byte fees of all tiers. All fee
+    providers are queried in parallel, see :class:`~bit.network.fees.FeesAPI`.
+
+    If an estimator was set by :func:`~bit.network.fees.set_fee_estimator`,
+    it estimates the fees instead.
+
+    :raises ConnectionError: If all fee providers are unreachable.
+    :returns: A dictionary mapping each tier of ``FEE_TIERS`` to its fee.
+    :rtype: ``dict``
+    """
+    if FEE_ESTIMATOR is not None:
+        FEE_ESTIMATOR.update()
+        return FEE_ESTIMATOR.get_fees()
+
+    return FeesAPI.get_fees()
+
+
 def get_fee(fast=True):
     """Gets the recommended satoshi per byte fee.
 
@@ -29,67 +169,113 @@ def get_fee(fast=True):
     :type fast: ``bool``
     :rtype: ``int``
     """
-    return requests.get(URL).json()['fastestFee' if fast else 'hourFee']
+    return get_fees()['fastestFee' if fast else 'hourFee']
+
+
+def get_fee_estimates():
+    """Gets satoshi per byte fees by confirmation target. The fee for the next
+    blocks is the median fee of the blocks projected from the mempool by
+    `<https://mempool.space/api/v1/fees/mempool-blocks>`_, the recommended fee
+    tiers provide fees for longer targets.
+
+    If an estimator was set by :func:`~bit.network.fees.set_fee_estimator`,
+    it estimates the fees instead.
+
+    :raises ConnectionError: If the fee API is unreachable.
+    :returns: A dictionary mapping confirmation targets in blocks to fees.
+    :rtype: ``dict``
+    """
+    if FEE_ESTIMATOR is not None:
+        FEE_ESTIMATOR.update()
+        return FEE_ESTIMATOR.get_fee_estimates()
+
+    request = get_session().get(MEMPOOL_BLOCKS_URL, timeout=DEFAULT_TIMEOUT)
+    # If we have a non 2XX status code, raise HTTPError.
+    request.raise_for_status()
+
+    return mempool_blocks_to_estimates(request.json(), get_fees_cached())
+
+
+def mempool_blocks_to_estimates(blocks, fees):
+    """Gets satoshi per byte fees by confirmation target from the blocks
+    projected from the mempool by mempool.space and the fee tiers.
+
+    :param blocks: The projected blocks, each with its ``medianFee``.
+    :type blocks: ``list`` of ``dict``
+    :param fees: A dictionary mapping each tier of ``FEE_TIERS`` to its fee.
+    :type fees: ``dict``
+    :returns: A dictionary mapping confirmation targets in blocks to fees.
+    :rtype: ``dict``
+    """
+    estimates = {target: math.ceil(block['medianFee']) for target, block in enumerate(blocks, 1)}
+
+    for tier, fee in fees.items():
+        estimates.setdefault(TIER_TARGETS[tier], fee)
+
+    return estimates
+
+
+def get_node_fee_estimates(node):
+    """Gets satoshi per byte fees by confirmation target from the
+    ``estimatesmartfee`` RPC of a node.
+
+    :param node: The node to query, see :func:`~bit.network.services.NetworkAPI.connect_to_node`.
+    :type node: ``RPCHost``
+    :raises ConnectionError: If the node is unreachable.
+    :returns: A dictionary mapping confirmation targets in blocks to fees.
+    :rtype: ``dict``
+    """
+    estimates = {}
+
+    for target in NODE_TARGETS:
+        result = node.estimatesmartfee(target)
+        # Nodes lacking data for a target return errors instead of a fee:
+        if 'feerate' in result:
+            # Fee rates are given in BTC per kilobyte:
+            estimates[target] = math.ceil(Decimal(result['feerate']) * 10 ** 5)
+
+    if not estimates:
+        raise BitcoinNodeException('The node has not collected enough data to estimate fees.')
+
+    return estimates
+
+
+def interpolate_fee(estimates, blocks):
+    """Gets the fee for a confirmation target from fees by confirmation target.
+    Fees between targets are interpolated linearly, and a fee is never higher
+    than the fee of a shorter target.
+
+    :param estimates: A dictionary mapping confirmation targets to fees.
+    :type estimates: ``dict``
+    :param blocks: The confirmation target in blocks.
+    :type blocks: ``int``
+    :rtype: ``int``
+    """
+    targets = sorted(estimates)
+    fees = []
+    for target in targets:
+        fees.append(min([estimates[target]] + fees[-1:]))
+
+    i = bisect_left(targets, blocks)
+    if i == len(targets):
+        return fees[-1]
+    if i == 0 or targets[i] == blocks:
+        return fees[i]
+
+    low, high = targets[i - 1], targets[i]
+    return math.ceil(fees[i - 1] + (fees[i] - fees[i - 1]) * (blocks - low) / (high - low))
 
 
 def get_fee_local_cache(f):
 
-    cached_fee_fast = None
-    cached_fee_hour = None
-    fast_last_update = time()
-    hour_last_update = time()
+    cached_fees = CachedValue(lambda: get_fees(), FETCH_ERRORS, 'fee', 'fees')
 
     @wraps(f)
-    def wrapper(fast=True):
-        now = time()
-
-        if fast:
-            nonlocal cached_fee_fast
-            nonlocal fast_last_update
-
-            if not cached_fee_fast or now - fast_last_update > DEFAULT_CACHE_TIME:
-                try:
-                    request = requests.get(URL)
-                    # If we have a non 2XX status code, raise HTTPError.
-                    request.raise_for_status()
-                    # Otherwise, try to parse json as normal.
-                    cached_fee_fast = request.json()['fastestFee']
-                    fast_last_update = now
-                except (ConnectionError, HTTPError, Timeout):  # pragma: no cover
-                    if cached_fee_fast is None:
-                        logging.warning(
-                            'Connection to fee API failed, returning default fee (fast) of {}'.format(DEFAULT_FEE_FAST)
-                        )
-                        return DEFAULT_FEE_FAST
-                    else:
-                        logging.warning('Connection to fee API failed, returning cached fee (fast).')
-                        return cached_fee_fast
-
-            return cached_fee_fast
-
-        else:
-            nonlocal cached_fee_hour
-            nonlocal hour_last_update
-
-            if not cached_fee_hour or now - hour_last_update > DEFAULT_CACHE_TIME:
-                try:
-                    request = requests.get(URL)
-                    # If we have a non 2XX status code, raise HTTPError.
-                    request.raise_for_status()
-                    # Otherwise, try to parse json as normal.
-                    cached_fee_hour = request.json()['hourFee']
-                    hour_last_update = now
-                except (ConnectionError, HTTPError, Timeout):  # pragma: no cover
-                    if cached_fee_hour is None:
-                        logging.warning(
-                            'Connection to fee API failed, returning default fee (hour) of {}'.format(DEFAULT_FEE_HOUR)
-                        )
-                        return DEFAULT_FEE_HOUR
-                    else:
-                        logging.warning('Connection to fee API failed, returning cached fee (hour).')
-                        return cached_fee_hour
-
-            return cached_fee_hour
+    def wrapper():
+        return cached_fees.get(DEFAULT_CACHE_TIME, BACKGROUND_REFRESH) or default_fees()
+
+    # Allows pushing fees into the cache, see bit.network.stream:
+    wrapper.cache = cached_fees
 
     return wrapper
 
@@ -101,7 +287,8 @@ def get_fee_local_cached():
 
 def get_fee_cached(fast=True):
     """Gets the recommended satoshi per byte fee. Results are cached using a
-    decorator for 10 minutes by default. See :ref:`cache times`.
+    decorator for 10 minutes by default. See :ref:`cache times` and
+    :ref:`background refresh`.
 
     :param fast: If ``True``, the fee returned will be "The highest fee (in
                  satoshis per byte) that will currently result in the fastest
@@ -112,4 +299,73 @@ def get_fee_cached(fast=True):
     :type fast: ``bool``
     :rtype: ``int``
     """
-    return get_fee_local_cached(fast)
+    return get_fee_local_cached()['fastestFee' if fast else 'hourFee']
+
+
+def get_fees_cached():
+    """Gets the recommended satoshi per byte fees of all tiers. Results are
+    cached using a decorator for 10 minutes by default, and a single request
+    fills every tier. See :ref:`cache times` and :ref:`background refresh`.
+
+    :returns: A dictionary mapping each tier of ``FEE_TIERS`` to its fee.
+    :rtype: ``dict``
+    """
+    return dict(get_fee_local_cached())
+
+
+def get_fee_for_target_local_cache(f):
+
+    cached_estimates = CachedValue(lambda: get_fee_estimates(), FETCH_ERRORS, 'fee')
+    cached_node_estimates = WeakKeyDictionary()
+    lock = Lock()
+
+    def get_node_cache(node):
+        with lock:
+            if node not in cached_node_estimates:
+                # The cache must not keep the node alive:
+                node_ref = ref(node)
+                cached_node_estimates[node] = CachedValue(
+                    lambda: get_node_fee_estimates(node_ref()), FETCH_ERRORS, 'node fee'
+                )
+            return cached_node_estimates[node]
+
+    @wraps(f)
+    def wrapper(blocks, node=None):
+        estimates = None
+        if node is not None:
+            estimates = get_node_cache(node).get(DEFAULT_CACHE_TIME, BACKGROUND_REFRESH)
+        if estimates is None:
+            estimates = cached_estimates.get(DEFAULT_CACHE_TIME, BACKGROUND_REFRESH)
+        if estimates is None:
+            estimates = {TIER_TARGETS[tier]: fee for tier, fee in default_fees().items()}
+
+        return interpolate_fee(estimates, blocks)
+
+    wrapper.cache = cached_estimates
+
+    return wrapper
+
+
+@get_fee_for_target_local_cache
+def get_fee_for_target_local_cached():
+    pass  # pragma: no cover
+
+
+def get_fee_for_target(blocks, node=None):
+    """Gets the lowest satoshi per byte fee expected to confirm a transaction
+    within a number of blocks. Fees are estimated for a set of targets, which
+    are cached using a decorator for 10 minutes by default, and interpolated
+    for targets in between. See :ref:`cache times`.
+
+    :param blocks: The confirmation target in blocks.
+    :type blocks: ``int``
+    :param node: If given, fees are estimated by this node using
+                 ``estimatesmartfee``, falling back to mempool.space if it
+                 fails. See :func:`~bit.network.services.NetworkAPI.connect_to_node`.
+    :type node: ``RPCHost``
+    :rtype: ``int``
+    """
+    if blocks < 1:
+        raise ValueError('The confirmation target must be at least 1 block.')
+
+    return get_fee_for_target_local_cached(blocks, node)
@@ -0,0 +1,156 @@
+from threading import Lock
+from time import monotonic
+
+# Weight of the latest call in the moving averages of success and latency:
+EWMA_WEIGHT = 0.2
+
+# The circuit of a provider opens when its success rate drops below this
+# after at least MIN_CALLS calls:
+FAILURE_THRESHOLD = 0.5
+MIN_CALLS = 5
+
+# Seconds an open circuit skips its provider before letting a call through
+# to probe whether it recovered:
+OPEN_TIME = 30
+
+# Seconds of latency a failure is deemed to cost when ranking providers:
+FAILURE_COST = 10
+
+
+class ProviderHealth:
+    __slots__ = ('success', 'latency', 'calls', 'opened', 'probing')
+
+    def __init__(self):
+        self.success = 1.0
+        self.latency = None
+        self.calls = 0
+        # The times the circuit opened and its probe started, if any:
+        self.opened = None
+        self.probing = None
+
+    @property
+    def score(self):
+        # The expected seconds a call costs, lower is better:
+        return (self.latency or 0) + (1 - self.success) * FAILURE_COST
+
+
+class HealthTracker:
+    """Tracks the success rate and latency of the API services used by
+    :class:`~bit.network.NetworkAPI` as exponentially weighted moving
+    averages, and orders them so the healthiest is asked first.
+
+    Each provider has a circuit breaker. When its success rate drops below
+    ``threshold``, the circuit opens and the provider is skipped. After
+    ``open_time`` seconds a single call is let through as a probe: if it
+    succeeds the circuit closes, otherwise it stays open for another
+    ``open_time`` seconds. If every provider is skipped, all are asked
+    anyway.
+
+    :param weight: The weight of the latest call in the averages.
+    :type weight: ``float``
+    :param threshold: The success rate below which the circuit opens.
+    :type threshold: ``float``
+    :param open_time: The number of seconds a provider is skipped.
+    :type open_time: ``float``
+    :param clock: Returns the current time in seconds.
+    :type clock: ``callable``
+    """
+
+    def __init__(self, weight=EWMA_WEIGHT, threshold=FAILURE_THRESHOLD, open_time=OPEN_TIME, clock=monotonic):
+        self.weight = weight
+        self.threshold = threshold
+        self.open_time = open_time
+        self.clock = clock
+        self.providers = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def provider(api_call):
+        """Gets the provider of an API call, i.e. the class or node it is a
+        method of, which all its calls share the health of."""
+        return getattr(api_call, '__self__', api_call)
+
+    def health(self, api_call):
+        """Gets the health of the provider of an API call.
+
+        :rtype: :class:`~bit.network.health.ProviderHealth`
+        """
+        provider = self.provider(api_call)
+        with self._lock:
+            if provider not in self.providers:
+                self.providers[provider] = ProviderHealth()
+            return self.providers[provider]
+
+    def record(self, api_call, success, latency):
+        """Records the outcome of a call.
+
+        :param api_call: The API call.
+        :type api_call: ``callable``
+        :param success: Whether the call succeeded.
+        :type success: ``bool``
+        :param latency: The number of seconds the call took.
+        :type latency: ``float``
+        """
+        health = self.health(api_call)
+        with self._lock:
+            if health.probing is not None:
+                health.probing = None
+                if success:
+                    # The provider recovered, so it starts over:
+                    health.success, health.calls, health.opened = 1.0, 0, None
+                else:
+                    health.opened = self.clock()
+
+            health.calls += 1
+            health.success += self.weight * (success - health.success)
+            if success:
+                if health.latency is None:
+                    health.latency = latency
+                else:
+                    health.latency += self.weight * (latency - health.latency)
+
+            if health.opened is None and health.calls >= MIN_CALLS and health.success < self.threshold:
+                health.opened = self.clock()
+
+    def order(self, api_calls):
+        """Orders API calls by the health of their providers, leaving out
+        those whose circuit is open unless a probe is due.
+
+        :param api_calls: The API calls in their default order.
+        :type api_calls: ``list``
+        :rtype: ``list``
+        """
+        healths = [self.health(api_call) for api_call in api_calls]
+        now = self.clock()
+        available = []
+
+        with self._lock:
+            for api_call, health in zip(api_calls, healths):
+                if health.opened is None:
+                    available.append((health.score, api_call))
+                elif now - health.opened >= self.open_time and (
+                    health.probing is None or now - health.probing >= self.open_time
+                ):
+                    # Probe the provider first, as one call at a time:
+                    health.probing = now
+                    available.append((-1, api_call))
+
+        if not available:
+            return list(api_calls)
+
+        # Sorting is stable, so providers of equal health keep their order:
+        available.sort(key=lambda item: item[0])
+        return [api_call for _, api_call in available]
+
+    def call(self, api_call, *args, errors=(ConnectionError,)):
+        """Calls an API call, recording its outcome. Raising any of
+        ``errors`` counts as a failure, other errors are not recorded.
+        """
+        start = self.clock()
+        try:
+            result = api_call(*args)
+        except errors:
+            self.record(api_call, False, self.clock() - start)
+            raise
+        self.record(api_call, True, self.clock() - start)
+        return result
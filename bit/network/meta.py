@@ -1,24 +1,104 @@
+from bisect import bisect_left, insort
+from threading import RLock
+from time import time
+
 from bit.constants import SEQUENCE
+from bit.crypto import double_sha256
+from bit.utils import bytes_to_hex, int_to_varint, script_push
 
 TX_TRUST_LOW = 1
 TX_TRUST_MEDIUM = 6
 TX_TRUST_HIGH = 30
 
+# Seconds after which unspents reserved for a transaction become selectable again.
+DEFAULT_RESERVATION_TIME = 60 * 10
+
+# Seconds after which keys fetch the unspents of a synced pool again, as funds
+# received or spent by transactions not sent by the key only show up then.
+DEFAULT_MAX_AGE = 60
+
+# Number of fee rates for which a pool caches its unspents sorted by effective value.
+VIEW_CACHE_SIZE = 16
+
+# Number of unspents spent by applied transactions that a pool remembers.
+SPENT_RECORD_SIZE = 1000
+
+# DER-encoded low-S signatures with the sighash byte take 72 bytes if the top
+# bit of r is set, which happens with probability 1/2, and at most 71 bytes
+# otherwise. Estimates use 72 bytes so that fees never fall below their rate.
+SIGNATURE_SIZE = 72
+
+
+def estimate_input_vsize(type, m=2, n=3, redeemscript_size=None):
+    """Estimates the virtual size of spending an unspent, which is its weight
+    divided by 4 and can be fractional for Segwit inputs.
+
+    :param type: One of the known unspent types of ``UNSPENT_TYPES``.
+    :type type: ``str``
+    :param m: The number of signatures of a multisig input (``p2sh``,
+              ``np2wsh`` or ``p2wsh``).
+    :type m: ``int``
+    :param n: The number of public keys of a multisig input.
+    :type n: ``int``
+    :param redeemscript_size: The size of the redeemScript of a multisig
+                              input. By default it is computed from ``n``
+                              compressed public keys.
+    :type redeemscript_size: ``int``
+    :returns: The virtual size or ``None`` for unknown types.
+    :rtype: ``int`` or ``float``
+    """
+    push_sig = 1 + SIGNATURE_SIZE
+    if redeemscript_size is None:
+        # OP_m <pubkey>... OP_n OP_CHECKMULTISIG with compressed public keys:
+        redeemscript_size = 3 + 34 * n
+
+    if type == 'p2pkh':
+        script_sig_size, witness_size = push_sig + 34, 0
+    elif type == 'p2pkh-uncompressed':
+        script_sig_size, witness_size = push_sig + 66, 0
+    elif type in ('np2wkh', 'p2wkh'):
+        # The scriptSig of a nested input pushes the 22 byte witness program:
+        script_sig_size = 23 if type == 'np2wkh' else 0
+        witness_size = 1 + push_sig + 34
+    elif type == 'p2sh':
+        # OP_0 <sig>... <redeemScript>:
+        script_sig_size = 1 + m * push_sig + len(script_push(redeemscript_size)) + redeemscript_size
+        witness_size = 0
+    elif type in ('np2wsh', 'p2wsh'):
+        # The scriptSig of a nested input pushes the 34 byte witness program:
+        script_sig_size = 35 if type == 'np2wsh' else 0
+        # Item count, empty item, signatures and redeemScript:
+        witness_size = (
+            len(int_to_varint(m + 2)) + 1 + m * push_sig + len(int_to_varint(redeemscript_size)) + redeemscript_size
+        )
+    else:
+        return None
+
+    # Outpoint, scriptSig and sequence count 4 times the witness:
+    weight = 4 * (36 + len(int_to_varint(script_sig_size)) + script_sig_size + 4) + witness_size
+    return weight // 4 if weight % 4 == 0 else weight / 4
+
+
 UNSPENT_TYPES = {
     # Dictionary containing as keys known unspent types and as value a
     # dictionary containing information if spending uses a witness
-    # program (Segwit) and its estimated scriptSig size.
-    'unknown': {'segwit': None, 'vsize': 180},  # Unknown type
-    'p2pkh-uncompressed': {'segwit': False, 'vsize': 180},  # Legacy P2PKH using  # uncompressed keys
-    'p2pkh': {'segwit': False, 'vsize': 148},  # Legacy P2PKH
-    'p2sh': {'segwit': False, 'vsize': 298},  # Legacy P2SH (vsize corresponds to a 2-of-3 multisig input)
-    'np2wkh': {'segwit': True, 'vsize': 91},  # (Nested) P2SH-P2WKH
-    'np2wsh': {'segwit': True, 'vsize': 140},  # (Nested) P2SH-P2WSH (vsize corresponds to a 2-of-3 multisig input)
-    'p2wkh': {'segwit': True, 'vsize': 68},  # Bech32 P2WKH -- Not yet supported to sign
-    'p2wsh': {
-        'segwit': True,
-        'vsize': 105,
-    },  # Bech32 P2WSH -- Not yet supported to sign (vsize corresponds to a 2-of-3 multisig input)
+    # program (Segwit) and its estimated virtual size.
+    # Unknown type:
+    'unknown': {'segwit': None, 'vsize': 180},
+    # Legacy P2PKH using uncompressed keys:
+    'p2pkh-uncompressed': {'segwit': False, 'vsize': estimate_input_vsize('p2pkh-uncompressed')},
+    # Legacy P2PKH:
+    'p2pkh': {'segwit': False, 'vsize': estimate_input_vsize('p2pkh')},
+    # Legacy P2SH (vsize corresponds to a 2-of-3 multisig input):
+    'p2sh': {'segwit': False, 'vsize': estimate_input_vsize('p2sh')},
+    # (Nested) P2SH-P2WKH:
+    'np2wkh': {'segwit': True, 'vsize': estimate_input_vsize('np2wkh')},
+    # (Nested) P2SH-P2WSH (vsize corresponds to a 2-of-3 multisig input):
+    'np2wsh': {'segwit': True, 'vsize': estimate_input_vsize('np2wsh')},
+    # Bech32 P2WKH -- Not yet supported to sign:
+    'p2wkh': {'segwit': True, 'vsize': estimate_input_vsize('p2wkh')},
+    # Bech32 P2WSH -- Not yet supported to sign (vsize corresponds to a 2-of-3 multisig input):
+    'p2wsh': {'segwit': True, 'vsize': estimate_input_vsize('p2wsh')},
 }
 
 
@@ -73,6 +153,343 @@ class Unspent:
         self.segwit = UNSPENT_TYPES[self.type]['segwit']
         return self
 
+    def effective_value(self, fee):
+        """The amount left after paying ``fee`` satoshi per byte for spending
+        this unspent as an input."""
+        return self.amount - self.vsize * fee
+
     def opt_in_for_RBF(self):
         if self.sequence > 4294967293:
             self.sequence = 4294967293
+
+
+class UTXOPool:
+    """An indexed pool of unspent transaction outputs.
+
+    Unspents are keyed by their outpoint ``(txid, txindex)`` and are also kept
+    in an index sorted by amount, so that transactions can be applied to the
+    pool incrementally instead of refetching and re-sorting all unspents.
+
+    For each fee rate the unspents sorted by their effective value are cached
+    until the pool changes, see :func:`~bit.network.meta.UTXOPool.economical`.
+
+    Unspents selected for a transaction can be reserved, which excludes them
+    from selection in concurrent transactions until the reservation is
+    released or expires.
+
+    :param unspents: The initial unspents of the pool.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param reservation_time: The number of seconds after which a reservation
+                             expires if it was not released.
+    :type reservation_time: ``int``
+    :param max_age: The number of seconds after a refresh during which the
+                    pool is :attr:`~bit.network.meta.UTXOPool.fresh`.
+    :type max_age: ``int``
+    """
+
+    def __init__(self, unspents=None, reservation_time=DEFAULT_RESERVATION_TIME, max_age=DEFAULT_MAX_AGE):
+        self._lock = RLock()
+        self._unspents = {}
+        self._index = []
+        self._reserved = {}
+        self._views = {}
+        self._spent = {}
+        self.reservation_time = reservation_time
+        self.max_age = max_age
+        self.last_refresh = 0
+        # Scripts seen so far, used to recognize outputs paying back to us:
+        self._types = {}
+        self.synced = False
+
+        if unspents is not None:
+            self.refresh(unspents)
+
+    def __len__(self):
+        return len(self._unspents)
+
+    def __iter__(self):
+        """Iterates over the unspents from the largest to the smallest amount."""
+        with self._lock:
+            return iter([self._unspents[key[1:]] for key in reversed(self._index)])
+
+    def __contains__(self, unspent):
+        return (unspent.txid, unspent.txindex) in self._unspents
+
+    @property
+    def lock(self):
+        """The reentrant lock guarding the pool. Hold it to update state kept
+        alongside the pool, e.g. a key's ``unspents``, atomically with it."""
+        return self._lock
+
+    @property
+    def fresh(self):
+        """Whether the pool was refreshed within the last ``max_age`` seconds,
+        so that transactions may be created from it without fetching the
+        unspents again."""
+        return self.synced and time() - self.last_refresh < self.max_age
+
+    @property
+    def balance(self):
+        """The total amount of all unspents in the pool."""
+        return sum(key[0] for key in self._index)
+
+    def refresh(self, unspents):
+        """Replaces the content of the pool, e.g. after fetching all unspents
+        from the network. Marks the pool as synced.
+
+        :param unspents: The unspents to store.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        with self._lock:
+            self._unspents.clear()
+            self._index.clear()
+            for unspent in unspents:
+                self.add(unspent)
+            self.synced = True
+            self.last_refresh = time()
+
+    def watch(self, script, type, vsize=0):
+        """Registers a script of the owner, so that outputs paying to it are
+        added by :func:`~bit.network.meta.UTXOPool.apply_transaction` even
+        before the pool held an unspent with this script.
+
+        :param script: The hex-encoded locking script.
+        :type script: ``str``
+        :param type: The type of unspents with this script.
+        :type type: ``str``
+        :param vsize: The virtual size of spending them. By default the size
+                      of ``type`` is used.
+        :type vsize: ``int``
+        """
+        with self._lock:
+            self._types[script] = (type, vsize)
+
+    def add(self, unspent):
+        """Adds an unspent to the pool, replacing any unspent with the same
+        outpoint.
+
+        :param unspent: The unspent to add.
+        :type unspent: :class:`~bit.network.meta.Unspent`
+        """
+        with self._lock:
+            self.discard(unspent.txid, unspent.txindex)
+            self._unspents[(unspent.txid, unspent.txindex)] = unspent
+            insort(self._index, (unspent.amount, unspent.txid, unspent.txindex))
+            self._views.clear()
+            self._types[unspent.script] = (unspent.type, unspent.vsize)
+
+    def discard(self, txid, txindex):
+        """Removes the unspent of an outpoint if it is in the pool.
+
+        :param txid: The transaction ID of the outpoint.
+        :type txid: ``str``
+        :param txindex: The output index of the outpoint.
+        :type txindex: ``int``
+        :returns: The removed unspent or ``None``.
+        :rtype: :class:`~bit.network.meta.Unspent`
+        """
+        with self._lock:
+            unspent = self._unspents.pop((txid, txindex), None)
+            if unspent is not None:
+                del self._index[bisect_left(self._index, (unspent.amount, txid, txindex))]
+                self._views.clear()
+            return unspent
+
+    def _view(self, fee):
+        with self._lock:
+            view = self._views.get(fee)
+            if view is None:
+                if len(self._views) >= VIEW_CACHE_SIZE:
+                    self._views.clear()
+                unspents = sorted(self._unspents.values(), key=lambda u: u.effective_value(fee), reverse=True)
+                split = next((i for i, u in enumerate(unspents) if u.effective_value(fee) <= 0), len(unspents))
+                view = self._views[fee] = (unspents[:split], unspents[split:])
+            return view
+
+    def economical(self, fee):
+        """The unspents worth more than the fee for spending them, from the
+        largest to the smallest effective value.
+
+        :param fee: The number of satoshi per byte to pay to miners.
+        :type fee: ``int``
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return list(self._view(fee)[0])
+
+    def uneconomical(self, fee):
+        """The unspents worth at most the fee for spending them, which coin
+        selection skips at this fee rate. These are best consolidated when
+        fees are low.
+
+        :param fee: The number of satoshi per byte to pay to miners.
+        :type fee: ``int``
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return list(self._view(fee)[1])
+
+    def is_reserved(self, unspent):
+        """Whether or not an unspent is reserved by a pending transaction.
+
+        :param unspent: The unspent in question.
+        :type unspent: :class:`~bit.network.meta.Unspent`
+        :rtype: ``bool``
+        """
+        expiry = self._reserved.get((unspent.txid, unspent.txindex))
+        return expiry is not None and expiry > time()
+
+    def reserve(self, unspents, ttl=None):
+        """Reserves unspents so that they are not selected by concurrent
+        transactions.
+
+        :param unspents: The unspents to reserve.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param ttl: The number of seconds until the reservation expires. By
+                    default ``reservation_time`` is used.
+        :type ttl: ``int``
+        """
+        expiry = time() + (self.reservation_time if ttl is None else ttl)
+        with self._lock:
+            for unspent in unspents:
+                self._reserved[(unspent.txid, unspent.txindex)] = expiry
+
+    def release(self, unspents):
+        """Releases the reservation of unspents.
+
+        :param unspents: The unspents to release.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        with self._lock:
+            for unspent in unspents:
+                self._reserved.pop((unspent.txid, unspent.txindex), None)
+
+    def select(self, select, unspents, reserve=False, ttl=None, fee=None):
+        """Atomically selects among the unspents that are not reserved and
+        optionally reserves the selection.
+
+        :param select: A function taking the list of selectable unspents and
+                       returning a tuple of the selected unspents and any
+                       further values, e.g. :func:`~bit.transaction.select_coins`.
+        :type select: ``callable``
+        :param unspents: The candidate unspents.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param reserve: Whether or not to reserve the selected unspents.
+        :type reserve: ``bool``
+        :param ttl: The number of seconds until the reservation expires.
+        :type ttl: ``int``
+        :param fee: If given, only the unspents of the pool worth more than
+                    the fee for spending them are handed to ``select``, in
+                    the order of the cached view for this fee rate.
+        :type fee: ``int``
+        :returns: The return value of ``select``.
+        """
+        with self._lock:
+            now = time()
+            for outpoint, expiry in list(self._reserved.items()):
+                if expiry <= now:
+                    del self._reserved[outpoint]
+
+            candidates = [u for u in unspents if (u.txid, u.txindex) not in self._reserved]
+
+            if fee is not None:
+                # Presorted candidates make sorting them again in select linear:
+                outpoints = {(u.txid, u.txindex) for u in candidates}
+                candidates = [u for u in self._view(fee)[0] if (u.txid, u.txindex) in outpoints] + [
+                    u for u in candidates if u not in self
+                ]
+
+            selection = select(candidates)
+
+            if reserve:
+                self.reserve(selection[0], ttl)
+
+            return selection
+
+    def cancel_transaction(self, tx):
+        """Releases the reservations of the unspents spent by a transaction
+        which was not broadcast, e.g. because the broadcast failed.
+
+        :param tx: The transaction object.
+        :type tx: :class:`~bit.transaction.TxObj`
+        """
+        with self._lock:
+            for txin in tx.TxIn:
+                txindex = int.from_bytes(txin.txindex, byteorder='little')
+                self._reserved.pop((bytes_to_hex(txin.txid[::-1]), txindex), None)
+
+    def spent_by(self, tx):
+        """The unspents of the pool spent by a transaction applied to it,
+        e.g. to bump its fee. Only the last ``SPENT_RECORD_SIZE`` spent
+        unspents are remembered.
+
+        :param tx: The transaction object.
+        :type tx: :class:`~bit.transaction.TxObj`
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        with self._lock:
+            outpoints = [
+                (bytes_to_hex(txin.txid[::-1]), int.from_bytes(txin.txindex, byteorder='little')) for txin in tx.TxIn
+            ]
+            return [self._spent[outpoint] for outpoint in outpoints if outpoint in self._spent]
+
+    def apply_transaction(self, tx):
+        """Applies a broadcasted transaction to a synced pool: The unspents it
+        spends are removed and its outputs paying to a script of the pool, or
+        one registered with :func:`~bit.network.meta.UTXOPool.watch`, are
+        added as unconfirmed unspents. Reservations of the spent unspents are
+        kept until they expire, so that APIs lagging behind cannot bring them
+        back through :func:`~bit.network.meta.UTXOPool.refresh`.
+
+        :param tx: The transaction object.
+        :type tx: :class:`~bit.transaction.TxObj`
+        :returns: The added unspents.
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        if not self.synced:
+            return []
+
+        txid = bytes_to_hex(double_sha256(tx.legacy_repr())[::-1])
+        added = []
+
+        with self._lock:
+            for txin in tx.TxIn:
+                outpoint = (bytes_to_hex(txin.txid[::-1]), int.from_bytes(txin.txindex, byteorder='little'))
+                unspent = self.discard(*outpoint)
+                if unspent is not None:
+                    # Remembered so that the transaction can be replaced:
+                    self._spent[outpoint] = unspent
+                    if len(self._spent) > SPENT_RECORD_SIZE:
+                        del self._spent[next(iter(self._spent))]
+
+            for txindex, txout in enumerate(tx.TxOut):
+                script = bytes_to_hex(txout.script_pubkey)
+                if script not in self._types:
+                    continue
+                unspent = Unspent(int.from_bytes(txout.amount, byteorder='little'), 0, script, txid, txindex)
+                unspent.set_type(*self._types[script])
+                self.add(unspent)
+                added.append(unspent)
+
+        return added
+
+    def replace_transaction(self, tx, replacement):
+        """Applies a broadcasted replacement of a transaction applied to the
+        pool, e.g. a fee bump: The outputs of the replaced transaction are
+        removed, as the replacement invalidates them, and the replacement is
+        applied with :func:`~bit.network.meta.UTXOPool.apply_transaction`.
+
+        :param tx: The replaced transaction object.
+        :type tx: :class:`~bit.transaction.TxObj`
+        :param replacement: The replacement transaction object.
+        :type replacement: :class:`~bit.transaction.TxObj`
+        :returns: The added unspents.
+        :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        if not self.synced:
+            return []
+
+        txid = bytes_to_hex(double_sha256(tx.legacy_repr())[::-1])
+
+        with self._lock:
+            for txindex in range(len(tx.TxOut)):
+                self.discard(txid, txindex)
+            return self.apply_transaction(replacement)
@@ -0,0 +1,282 @@
+import math
+from collections import deque, namedtuple
+from threading import Lock, Thread
+from time import time
+
+from bit.crypto import double_sha256
+from bit.network.fees import get_fee_cached
+from bit.utils import bytes_to_hex
+
+# Number of confirmed transactions the model is fitted to.
+DEFAULT_WINDOW = 500
+
+# Share of transactions that must confirm within the target delay.
+DEFAULT_SUCCESS = 0.9
+
+# Number of confirmed transactions needed before recommending lower fees.
+MIN_SAMPLES = 10
+
+# Recommended fees stay between these multiples of the market fee:
+MIN_RATIO = 0.1
+MAX_RATIO = 2
+
+# Seconds after which unconfirmed transactions are no longer tracked.
+MAX_PENDING_TIME = 60 * 60 * 24 * 14
+
+# Seconds between lookups of the confirmations of pending transactions in the
+# background when recommending fees.
+CHECK_INTERVAL = 60
+
+# Policy recording the transactions sent by keys, see set_fee_policy.
+FEE_POLICY = None
+
+Record = namedtuple('Record', ['fee_rate', 'vsize', 'market_fee', 'delay'])
+
+
+def set_fee_policy(policy):
+    global FEE_POLICY
+    FEE_POLICY = policy
+
+
+class FeePolicy:
+    """Learns how long our transactions take to confirm depending on the fee
+    they paid, and recommends the lowest fee expected to meet a deadline.
+
+    For each confirmed transaction the fee rate relative to the market fee at
+    broadcast is recorded with the time it took to confirm. Over the last
+    ``window`` transactions, the logarithm of the delay is fitted as a linear
+    function of the logarithm of the relative fee rate, and the recommended
+    fee keeps the delay within the target for ``success`` of the
+    transactions, judging by the spread of the fitted delays.
+
+    Keys record the transactions they send once a policy is set with
+    :func:`~bit.network.policy.set_fee_policy`. Pending transactions are
+    looked up by their id in a background thread at most every
+    ``CHECK_INTERVAL`` seconds when recommending fees, and confirm at the time
+    of their block.
+
+    :param window: The number of recent confirmed transactions to learn from.
+    :type window: ``int``
+    :param success: The share of transactions that must confirm in time.
+    :type success: ``float``
+    :param testnet: Whether the transactions are sent on the test network.
+    :type testnet: ``bool``
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, success=DEFAULT_SUCCESS, testnet=False):
+        self.success = success
+        self.testnet = testnet
+        self.records = deque(maxlen=window)
+        self.pending = {}
+        self._model = None
+        self._checked = 0
+        self._updating = None
+        self._lock = Lock()
+
+    def record_broadcast(self, txid, fee_rate, vsize, market_fee=None, broadcast_time=None):
+        """Records a broadcast transaction to learn from once it confirms.
+
+        :param txid: The transaction ID.
+        :type txid: ``str``
+        :param fee_rate: The satoshi per byte fee the transaction paid.
+        :type fee_rate: ``float``
+        :param vsize: The virtual size of the transaction.
+        :type vsize: ``int``
+        :param market_fee: The recommended fee at the time. By default
+                           :func:`~bit.network.get_fee_cached`.
+        :type market_fee: ``int``
+        :param broadcast_time: The UNIX time of the broadcast. Defaults to now.
+        :type broadcast_time: ``float``
+        """
+        market_fee = market_fee or get_fee_cached()
+        broadcast_time = time() if broadcast_time is None else broadcast_time
+
+        with self._lock:
+            # Transactions that never confirmed, e.g. replaced ones, expire:
+            for pending_txid, (*_, pending_time) in list(self.pending.items()):
+                if broadcast_time - pending_time > MAX_PENDING_TIME:
+                    del self.pending[pending_txid]
+            self.pending[txid] = (fee_rate, vsize, market_fee, broadcast_time)
+
+    def record_confirmation(self, txid, confirmation_time=None):
+        """Records the confirmation of a broadcast transaction.
+
+        :param txid: The transaction ID.
+        :type txid: ``str``
+        :param confirmation_time: The UNIX time the transaction confirmed,
+                                  i.e. the time of its block. Defaults to
+                                  now.
+        :type confirmation_time: ``float``
+        :returns: Whether the transaction was pending.
+        :rtype: ``bool``
+        """
+        confirmation_time = time() if confirmation_time is None else confirmation_time
+
+        with self._lock:
+            if txid not in self.pending:
+                return False
+            fee_rate, vsize, market_fee, broadcast_time = self.pending.pop(txid)
+            self.records.append(Record(fee_rate, vsize, market_fee, max(confirmation_time - broadcast_time, 1)))
+            self._model = None
+            return True
+
+    def discard(self, txid):
+        """Stops tracking a transaction that will never confirm, e.g. because
+        it was replaced.
+
+        :param txid: The transaction ID.
+        :type txid: ``str``
+        """
+        with self._lock:
+            self.pending.pop(txid, None)
+
+    def update(self):
+        """Looks up the pending transactions by their id and records the
+        confirmations of those confirmed since at the time of their block.
+
+        :raises ConnectionError: If all API services fail.
+        """
+        from bit.network.services import NetworkAPI
+
+        get_confirmation_time = (
+            NetworkAPI.get_confirmation_time_testnet if self.testnet else NetworkAPI.get_confirmation_time
+        )
+
+        with self._lock:
+            self._checked = time()
+            txids = list(self.pending)
+
+        for txid in txids:
+            block_time = get_confirmation_time(txid)
+            if block_time is not None:
+                self.record_confirmation(txid, confirmation_time=block_time)
+
+    def update_in_background(self):
+        """Starts :func:`~bit.network.FeePolicy.update` in a background
+        thread unless one is running."""
+        with self._lock:
+            if self._updating is not None and self._updating.is_alive():
+                return
+            # Failed lookups are retried after the interval as well:
+            self._checked = time()
+
+            def update():
+                try:
+                    self.update()
+                except ConnectionError:
+                    pass
+
+            self._updating = Thread(target=update, daemon=True)
+            self._updating.start()
+
+    def wait(self, timeout=None):
+        """Waits until the background lookup of pending transactions
+        finished.
+
+        :param timeout: The maximum number of seconds to wait.
+        :type timeout: ``float``
+        """
+        updating = self._updating
+        if updating is not None:
+            updating.join(timeout)
+
+    def model(self):
+        """Fits the model to the recorded transactions.
+
+        :returns: The intercept and slope of the logarithm of the delay as a
+                  function of the logarithm of the relative fee rate, and the
+                  residual that ``success`` of the transactions stay below,
+                  or ``None`` with too few or uninformative records.
+        :rtype: ``tuple``
+        """
+        with self._lock:
+            if self._model is None:
+                self._model = self._fit(list(self.records))
+            return self._model or None
+
+    def _fit(self, records):
+        if len(records) < MIN_SAMPLES:
+            return ()
+
+        xs = [math.log(r.fee_rate / r.market_fee) for r in records]
+        ys = [math.log(r.delay) for r in records]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        if variance == 0:
+            return ()
+
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+        # Paying more must not make confirmations slower:
+        if slope >= 0:
+            return ()
+        intercept = mean_y - slope * mean_x
+
+        residuals = sorted(y - intercept - slope * x for x, y in zip(xs, ys))
+        margin = residuals[min(math.ceil(self.success * len(residuals)), len(residuals)) - 1]
+
+        return intercept, slope, margin
+
+    def recommend(self, delay, market_fee=None):
+        """Gets the lowest satoshi per byte fee expected to confirm within
+        ``delay`` seconds. Without a model the market fee is returned.
+        Confirmations of pending transactions are looked up in the background
+        and only count towards later recommendations.
+
+        :param delay: The target delay in seconds.
+        :type delay: ``float``
+        :param market_fee: The current recommended fee. By default
+                           :func:`~bit.network.get_fee_cached`.
+        :type market_fee: ``int``
+        :rtype: ``int``
+        """
+        market_fee = market_fee or get_fee_cached()
+
+        if self.pending and time() - self._checked >= CHECK_INTERVAL:
+            self.update_in_background()
+
+        model = self.model()
+        if model is None:
+            return market_fee
+
+        intercept, slope, margin = model
+        ratio = math.exp((math.log(delay) - intercept - margin) / slope)
+        ratio = min(max(ratio, MIN_RATIO), MAX_RATIO)
+
+        # Rounding first keeps floating point errors from adding a satoshi:
+        return max(math.ceil(round(market_fee * ratio, 6)), 1)
+
+
+def record_transaction(tx, unspents, testnet=False, replaced=None):
+    """Records a broadcast transaction with the policy set by
+    :func:`~bit.network.policy.set_fee_policy`, if any.
+
+    :param tx: The transaction object.
+    :type tx: :class:`~bit.transaction.TxObj`
+    :param unspents: Unspents including those spent by the transaction.
+    :type unspents: ``iterable`` of :class:`~bit.network.meta.Unspent`
+    :param testnet: Whether the transaction was sent on the test network.
+    :type testnet: ``bool``
+    :param replaced: The transaction replaced by ``tx``, if any.
+    :type replaced: :class:`~bit.transaction.TxObj`
+    """
+    policy = FEE_POLICY
+    if policy is None or policy.testnet != testnet:
+        return
+
+    if replaced is not None:
+        policy.discard(bytes_to_hex(double_sha256(replaced.legacy_repr())[::-1]))
+
+    amounts = {(u.txid, u.txindex): u.amount for u in unspents}
+    outpoints = [(bytes_to_hex(txin.txid[::-1]), int.from_bytes(txin.txindex, byteorder='little')) for txin in tx.TxIn]
+    # The fee is unknown without the amounts of all inputs:
+    if not all(outpoint in amounts for outpoint in outpoints):
+        return
+
+    txid = bytes_to_hex(double_sha256(tx.legacy_repr())[::-1])
+    vsize = math.ceil((3 * len(tx.legacy_repr()) + len(bytes(tx))) / 4)
+    fee = sum(amounts[outpoint] for outpoint in outpoints) - sum(
+        int.from_bytes(out.amount, byteorder='little') for out in tx.TxOut
+    )
+
+    policy.record_broadcast(txid, fee / vsize, vsize)
@@ -0,0 +1,235 @@
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic, sleep, time
+from urllib.parse import urlsplit
+
+import requests
+
+# Requests allowed per period of seconds, by host or URL prefix without the
+# scheme, see set_rate_limits:
+RATE_LIMITS = {
+    'api.smartbit.com.au/v1/blockchain/pushtx': (5, 60),
+    'testnet-api.smartbit.com.au/v1/blockchain/pushtx': (5, 60),
+}
+
+# Seconds a request waits at most for its budget or for the Retry-After of
+# its host to pass. Requests that would wait longer are skipped:
+MAX_RATE_DELAY = 1
+
+# Seconds a host is skipped after a 429 response without Retry-After:
+RATE_LIMITED_TIME = 5
+
+_limiter = None
+_lock = Lock()
+
+
+class RateLimitError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request that would exceed a rate limit, so
+    that :class:`~bit.network.NetworkAPI` asks the next API service.
+
+    :param key: The host or URL prefix whose limit was reached.
+    :type key: ``str``
+    :param retry_after: The number of seconds until a request is allowed.
+    :type retry_after: ``float``
+    """
+
+    def __init__(self, key, retry_after):
+        super().__init__('Rate limit of {} reached, retry in {:.1f} seconds.'.format(key, retry_after))
+        self.key = key
+        self.retry_after = retry_after
+
+
+def set_rate_limits(limits=None, max_delay=None):
+    """Configures the rate limits of the HTTP session shared by all API
+    providers. Options that are not given keep their current value.
+
+    :param limits: The number of requests allowed per period of seconds, by
+                   host or URL prefix without the scheme, e.g.
+                   ``{'api.blockchair.com': (30, 60)}``.
+    :type limits: ``dict``
+    :param max_delay: The number of seconds a request waits at most for its
+                      budget before it is skipped.
+    :type max_delay: ``float``
+    """
+    global RATE_LIMITS, MAX_RATE_DELAY, _limiter
+
+    with _lock:
+        if limits is not None:
+            RATE_LIMITS = dict(limits)
+        if max_delay is not None:
+            MAX_RATE_DELAY = max_delay
+        _limiter = None
+
+
+def get_rate_limiter():
+    """Gets the rate limiter of the HTTP session shared by all API providers.
+    See :func:`~bit.network.ratelimit.set_rate_limits`.
+
+    :rtype: :class:`~bit.network.ratelimit.RateLimiter`
+    """
+    limiter = _limiter
+    if limiter is not None:
+        return limiter
+
+    with _lock:
+        if _limiter is None:
+            globals()['_limiter'] = RateLimiter(RATE_LIMITS, MAX_RATE_DELAY)
+        return _limiter
+
+
+def get_rate_budget(url):
+    """Gets the number of requests to a URL, host or URL prefix that can be
+    sent right away, or ``None`` if they are not limited.
+
+    :param url: The URL, host or URL prefix.
+    :type url: ``str``
+    :rtype: ``int``
+    """
+    return get_rate_limiter().remaining(url)
+
+
+def parse_retry_after(value, now=None):
+    """Parses a Retry-After header, which is either a number of seconds or an
+    HTTP date, into a number of seconds, or ``None`` if it is invalid.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return max(retry_at - (time() if now is None else now), 0)
+
+
+class TokenBucket:
+    """Allows ``requests`` requests per ``period`` seconds, replenishing one
+    every ``period / requests`` seconds, so at most ``requests`` at once.
+    """
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated')
+
+    def __init__(self, requests, period, now):
+        self.capacity = requests
+        self.rate = requests / period
+        self.tokens = float(requests)
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        self.refill(now)
+        return max(1 - self.tokens, 0) / self.rate
+
+
+class RateLimiter:
+    """Limits the requests to hosts or URL prefixes with token buckets, and
+    backs off from hosts that answered 429 Too Many Requests for as long as
+    their Retry-After header asks.
+
+    A request waits for the budget of every limit it falls under. If it had
+    to wait longer than ``max_delay`` seconds,
+    :class:`~bit.network.ratelimit.RateLimitError` is raised instead.
+
+    :param limits: The number of requests allowed per period of seconds, by
+                   host or URL prefix without the scheme.
+    :type limits: ``dict``
+    :param max_delay: The number of seconds a request waits at most.
+    :type max_delay: ``float``
+    :param clock: Returns the current time in seconds.
+    :type clock: ``callable``
+    :param sleep: Waits for a number of seconds.
+    :type sleep: ``callable``
+    """
+
+    def __init__(self, limits=None, max_delay=MAX_RATE_DELAY, clock=monotonic, sleep=sleep):
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+        now = clock()
+        self.buckets = {key: TokenBucket(requests, period, now) for key, (requests, period) in (limits or {}).items()}
+        # The times until which hosts asked to be left alone:
+        self.blocked = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def split(url):
+        # Gets the host and the URL without the scheme:
+        if '://' not in url:
+            url = '//' + url
+        parts = urlsplit(url)
+        return parts.netloc, parts.netloc + parts.path
+
+    def matching(self, location):
+        return [(key, bucket) for key, bucket in self.buckets.items() if location.startswith(key)]
+
+    def acquire(self, url):
+        """Waits until a request to a URL is allowed and takes its budget.
+
+        :param url: The URL of the request.
+        :type url: ``str``
+        :raises RateLimitError: If the request had to wait longer than
+                                ``max_delay`` seconds.
+        """
+        host, location = self.split(url)
+
+        with self._lock:
+            now = self.clock()
+            key, wait = host, max(self.blocked.get(host, now) - now, 0)
+            buckets = self.matching(location)
+            for bucket_key, bucket in buckets:
+                bucket_wait = bucket.wait_time(now)
+                if bucket_wait > wait:
+                    key, wait = bucket_key, bucket_wait
+
+            if wait > self.max_delay:
+                raise RateLimitError(key, wait)
+
+            # Budget taken in advance makes later requests wait their turn:
+            for _, bucket in buckets:
+                bucket.tokens -= 1
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def retry_after(self, url, seconds):
+        """Leaves the host of a URL alone for a number of seconds.
+
+        :param url: The URL of the rate limited request.
+        :type url: ``str``
+        :param seconds: The number of seconds to wait.
+        :type seconds: ``float``
+        """
+        host, _ = self.split(url)
+        with self._lock:
+            until = self.clock() + seconds
+            self.blocked[host] = max(self.blocked.get(host, until), until)
+
+    def remaining(self, url):
+        """Gets the number of requests to a URL, host or URL prefix that can
+        be sent right away, or ``None`` if they are not limited.
+
+        :param url: The URL, host or URL prefix.
+        :type url: ``str``
+        :rtype: ``int``
+        """
+        host, location = self.split(url)
+
+        with self._lock:
+            now = self.clock()
+            if self.blocked.get(host, now) > now:
+                return 0
+
+            budgets = []
+            for key, bucket in self.buckets.items():
+                # A host or prefix has the budget of the limits within it too:
+                if location.startswith(key) or key.startswith(location):
+                    bucket.refill(now)
+                    budgets.append(max(int(bucket.tokens), 0))
+
+        return min(budgets) if budgets else None
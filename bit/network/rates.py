@@ -1,14 +1,16 @@
 from collections import OrderedDict
 from decimal import ROUND_DOWN
 from functools import wraps
-from time import time
 
 import requests
 
 from bit.constants import SATOSHI, uBTC, mBTC, BTC
+from bit.network.cache import CachedValue
+from bit.network.session import get_session
 from bit.utils import Decimal
 
 DEFAULT_CACHE_TIME = 60
+BACKGROUND_REFRESH = False
 
 # Constant for use in deriving exchange
 # rates when given in terms of 1 BTC.
@@ -79,6 +81,11 @@ def set_rate_cache_time(seconds):
     DEFAULT_CACHE_TIME = seconds
 
 
+def set_rate_background_refresh(enabled):
+    global BACKGROUND_REFRESH
+    BACKGROUND_REFRESH = enabled
+
+
 def satoshi_to_satoshi():
     return SATOSHI
 
@@ -106,7 +113,7 @@ class BitpayRates:
     @classmethod
     def currency_to_satoshi(cls, currency):
         headers = {"x-accept-version": "2.0.0", "Accept": "application/json"}
-        r = requests.get(cls.SINGLE_RATE + currency, headers=headers)
+        r = get_session().get(cls.SINGLE_RATE + currency, headers=headers)
         r.raise_for_status()
         rate = r.json()['data']['rate']
         return int(ONE / Decimal(rate) * BTC)
@@ -201,7 +208,7 @@ class BlockchainRates:
 
     @classmethod
     def currency_to_satoshi(cls, currency):
-        r = requests.get(cls.SINGLE_RATE.format(currency))
+        r = get_session().get(cls.SINGLE_RATE.format(currency))
         r.raise_for_status()
         rate = r.text
         return int(Decimal(rate) * BTC)
@@ -595,30 +602,17 @@ def currency_to_satoshi(amount, currency):
     return int(satoshis * Decimal(amount))
 
 
-class CachedRate:
-    __slots__ = ('satoshis', 'last_update')
-
-    def __init__(self, satoshis, last_update):
-        self.satoshis = satoshis
-        self.last_update = last_update
-
-
 def currency_to_satoshi_local_cache(f):
-    start_time = time()
 
-    cached_rates = dict([(currency, CachedRate(None, start_time)) for currency in EXCHANGE_RATES.keys()])
+    cached_rates = {
+        currency: CachedValue(lambda currency=currency: EXCHANGE_RATES[currency](), name='rate', key='rate-' + currency)
+        for currency in EXCHANGE_RATES.keys()
+    }
 
     @wraps(f)
     def wrapper(amount, currency):
-        now = time()
-
-        cached_rate = cached_rates[currency]
-
-        if not cached_rate.satoshis or now - cached_rate.last_update > DEFAULT_CACHE_TIME:
-            cached_rate.satoshis = EXCHANGE_RATES[currency]()
-            cached_rate.last_update = now
-
-        return int(cached_rate.satoshis * Decimal(amount))
+        satoshis = cached_rates[currency].get(DEFAULT_CACHE_TIME, BACKGROUND_REFRESH)
+        return int(satoshis * Decimal(amount))
 
     return wrapper
 
@@ -632,7 +626,8 @@ def currency_to_satoshi_cached(amount, currency):
     """Converts a given amount of currency to the equivalent number of
     satoshi. The amount can be either an int, float, or string as long as
     it is a valid input to :py:class:`decimal.Decimal`. Results are cached
-    using a decorator for 60 seconds by default. See :ref:`cache times`.
+    using a decorator for 60 seconds by default. See :ref:`cache times` and
+    :ref:`background refresh`.
 
     :param amount: The quantity of currency.
     :param currency: One of the :ref:`supported currencies`.
@@ -662,7 +657,8 @@ def satoshi_to_currency(num, currency):
 def satoshi_to_currency_cached(num, currency):
     """Converts a given number of satoshi to another currency as a formatted
     string rounded down to the proper number of decimal places. Results are
-    cached using a decorator for 60 seconds by default. See :ref:`cache times`.
+    cached using a decorator for 60 seconds by default. See :ref:`cache times`
+    and :ref:`background refresh`.
 
     :param num: The number of satoshi.
     :type num: ``int``
@@ -1,24 +1,205 @@
 import requests
 import json
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from decimal import Decimal, getcontext
+from threading import Lock
+from time import monotonic
 
 from bit.constants import BTC
 from bit.network import currency_to_satoshi
+from bit.network.cache import CachedValue, TransactionCache
+from bit.network.fees import TIER_TARGETS, FeesAPI, get_node_fee_estimates, interpolate_fee
+from bit.network.health import HealthTracker
 from bit.network.meta import Unspent
+from bit.network.session import get_session
 from bit.exceptions import BitcoinNodeException, ExcessiveAddress
 from bit.transaction import address_to_scriptpubkey
 from bit.utils import bytes_to_hex
 
 DEFAULT_TIMEOUT = 10
 
+# Maximum number of single-address lookups of many addresses at once:
+MAX_CONCURRENT_LOOKUPS = 8
+
+# Seconds the height of the chain tip is cached, see set_tip_cache_time:
+TIP_CACHE_TIME = 30
+
+# Maximum number of pages of an address fetched at once:
+MAX_CONCURRENT_PAGES = 4
+
+# Seconds to wait for an API service before also asking the next one, see
+# set_hedge_delay:
+HEDGE_DELAY = 2
+# Maximum number of API calls in flight for hedged lookups:
+HEDGE_WORKERS = 32
+# Seconds after which hedged lookups give up on the services still asked:
+HEDGE_TIMEOUT = 60
+
+# Raw transactions by their id, see set_transaction_cache:
+TRANSACTION_CACHE = TransactionCache()
+
+_hedge_executor = None
+_hedge_lock = Lock()
+
 
 def set_service_timeout(seconds):
     global DEFAULT_TIMEOUT
     DEFAULT_TIMEOUT = seconds
 
 
+def set_tip_cache_time(seconds):
+    global TIP_CACHE_TIME
+    TIP_CACHE_TIME = seconds
+
+
+def set_transaction_cache(cache):
+    """Sets the cache of transactions looked up by
+    :meth:`~bit.network.NetworkAPI.get_transaction_by_id`.
+
+    :param cache: The cache, or ``None`` to always ask the API services.
+    :type cache: :class:`~bit.network.cache.TransactionCache`
+    """
+    global TRANSACTION_CACHE
+    TRANSACTION_CACHE = cache
+
+
+def set_hedge_delay(seconds):
+    """Sets how long lookups of :class:`~bit.network.NetworkAPI` wait for an
+    API service before also asking the next one. The first valid response is
+    used and the others are discarded.
+
+    :param seconds: The number of seconds, or ``None`` to only ask the next
+                    service once the previous one failed.
+    :type seconds: ``float``
+    """
+    global HEDGE_DELAY
+    HEDGE_DELAY = seconds
+
+
+# The heights of the chain tips, shared by API services computing the
+# confirmations of unspents. As those run on the hedge executor, the services
+# are asked in turn on the calling thread, since waiting on further hedged
+# lookups there could take up every worker:
+TIP_HEIGHTS = {
+    False: CachedValue(
+        lambda: NetworkAPI._call_in_turn(NetworkAPI.GET_TIP_HEIGHT_MAIN), (ConnectionError,), 'tip height'
+    ),
+    True: CachedValue(
+        lambda: NetworkAPI._call_in_turn(NetworkAPI.GET_TIP_HEIGHT_TEST), (ConnectionError,), 'testnet tip height'
+    ),
+}
+
+
+def get_tip_height_cached(testnet=False):
+    """Gets the height of the chain tip. Results are cached for 30 seconds
+    by default, see :func:`~bit.network.services.set_tip_cache_time`.
+
+    :param testnet: Whether to get the tip of the test network.
+    :type testnet: ``bool``
+    :raises ConnectionError: If all API services fail.
+    :rtype: ``int``
+    """
+    height = TIP_HEIGHTS[testnet].get(TIP_CACHE_TIME)
+    if height is None:
+        raise ConnectionError('All APIs are unreachable.')
+    return height
+
+
+def set_tip_height(height, testnet=False):
+    """Replaces the cached height of the chain tip, e.g. when notified of a
+    new block, so confirmations count it right away.
+
+    :param height: The height of the new tip.
+    :type height: ``int``
+    :param testnet: Whether the tip is of the test network.
+    :type testnet: ``bool``
+    """
+    TIP_HEIGHTS[testnet].set(height)
+
+
+def raise_tip_height(height, block_heights, testnet=False):
+    """Raises a cached tip height that fell behind blocks an API service
+    reported, so confirmations are never counted from a stale tip.
+
+    :param height: The cached height of the chain tip.
+    :type height: ``int``
+    :param block_heights: The heights of blocks reported by a service.
+    :type block_heights: ``iterable`` of ``int``
+    :param testnet: Whether the blocks are of the test network.
+    :type testnet: ``bool``
+    :returns: The height of the chain tip.
+    :rtype: ``int``
+    """
+    highest = max(block_heights, default=height)
+    if highest > height:
+        set_tip_height(highest, testnet)
+        return highest
+    return height
+
+
+def canonical_address(address):
+    # Bech32 addresses are case-insensitive, services return lower case:
+    return address.lower() if address[:4].lower() in ('bc1q', 'bc1p', 'tb1q', 'tb1p', 'bcrt') else address
+
+
+def match_addresses(addresses, echoed):
+    """Matches requested addresses to the addresses an API service echoed in
+    its response, which may be spelled differently.
+
+    :param addresses: The requested addresses.
+    :type addresses: ``list`` of ``str``
+    :param echoed: The addresses in the response.
+    :type echoed: ``iterable`` of ``str``
+    :raises ConnectionError: If a requested address is missing from the
+                             response.
+    :returns: The echoed spelling of each requested address.
+    :rtype: ``dict``
+    """
+    canonical = {canonical_address(address): address for address in echoed}
+    matched = {}
+    for address in addresses:
+        if canonical_address(address) not in canonical:
+            raise ConnectionError('The response is missing address {}.'.format(address))
+        matched[address] = canonical[canonical_address(address)]
+    return matched
+
+
+def fetch_pages(fetch, offsets):
+    """Fetches pages at the given offsets, ``MAX_CONCURRENT_PAGES`` at a time.
+
+    :param fetch: Gets the page at an offset.
+    :type fetch: ``callable``
+    :param offsets: The offsets of the pages.
+    :type offsets: ``iterable`` of ``int``
+    :returns: The pages in the order of their offsets.
+    :rtype: ``list``
+    """
+    offsets = list(offsets)
+    if len(offsets) < 2:
+        return [fetch(offset) for offset in offsets]
+
+    with ThreadPoolExecutor(min(len(offsets), MAX_CONCURRENT_PAGES)) as executor:
+        return list(executor.map(fetch, offsets))
+
+
+def get_hedge_executor():
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix='bit-hedge')
+        return _hedge_executor
+
+
 class RPCHost:
+    # The node accepts any number of addresses per call:
+    MAX_ADDRESSES = 10000
+    # Maximum number of calls sent in one JSON-RPC batch request:
+    MAX_BATCH_SIZE = 1000
+    # The error code of unknown transactions:
+    TX_NOT_FOUND = -5
+
     def __init__(self, user, password, host, port, use_https, path):
         self._session = requests.Session()
         self._url = "http{s}://{user}:{password}@{host}:{port}/{path}".format(
@@ -30,6 +211,21 @@ class RPCHost:
     def __getattr__(self, rpc_method):
         return RPCMethod(rpc_method, self)
 
+    def batch(self):
+        """Queues RPC calls and sends them as one JSON-RPC batch request
+        once the context exits. Each call returns an
+        :class:`~bit.network.services.RPCResult`, whose result can be read
+        after the batch was sent::
+
+            with node.batch() as batch:
+                count = batch.getblockcount()
+                tx = batch.getrawtransaction(txid, False)
+            count.result()
+
+        :rtype: :class:`~bit.network.services.RPCBatch`
+        """
+        return RPCBatch(self)
+
     def get_balance(self, address):
         getcontext().prec = len(str(BTC))
         b = Decimal(self.getreceivedbyaddress(address, 0))
@@ -38,6 +234,16 @@ class RPCHost:
     def get_balance_testnet(self, address):
         return self.get_balance(address)
 
+    def get_balances(self, addresses):
+        with self.batch() as batch:
+            received = {address: batch.getreceivedbyaddress(address, 0) for address in addresses}
+
+        getcontext().prec = len(str(BTC))
+        return {address: int(Decimal(result.result()) * BTC) for address, result in received.items()}
+
+    def get_balances_testnet(self, addresses):
+        return self.get_balances(addresses)
+
     def get_transactions(self, address):
         r = self.listreceivedbyaddress(0, True, True, address)
         if len(r) > 0:
@@ -53,6 +259,41 @@ class RPCHost:
     def get_transaction_by_id_testnet(self, txid):
         return self.get_transaction_by_id(txid)
 
+    def get_transactions_by_id(self, txids):
+        """Gets many raw transactions in batch requests.
+
+        :param txids: The ids of the transactions.
+        :type txids: ``iterable`` of ``str``
+        :returns: The raw transactions by their id, ``None`` for those the
+                  node does not know.
+        :rtype: ``dict``
+        """
+        with self.batch() as batch:
+            results = {txid: batch.getrawtransaction(txid, False) for txid in txids}
+
+        transactions = {}
+        for txid, result in results.items():
+            if result.error is not None and result.error.get("code") == self.TX_NOT_FOUND:
+                transactions[txid] = None
+            else:
+                transactions[txid] = result.result()
+        return transactions
+
+    def get_transactions_by_id_testnet(self, txids):
+        return self.get_transactions_by_id(txids)
+
+    def get_confirmation_time(self, txid):
+        with self.batch() as batch:
+            result = batch.getrawtransaction(txid, True)
+
+        if result.error is not None and result.error.get("code") == self.TX_NOT_FOUND:
+            return None
+        # Only confirmed transactions have the time of their block:
+        return result.result().get("blocktime")
+
+    def get_confirmation_time_testnet(self, txid):
+        return self.get_confirmation_time(txid)
+
     def get_unspent(self, address):
         r = self.listunspent(0, 9999999, [address])
         return [
@@ -69,6 +310,44 @@ class RPCHost:
     def get_unspent_testnet(self, address):
         return self.get_unspent(address)
 
+    def get_tip_height(self):
+        return self.getblockcount()
+
+    def get_tip_height_testnet(self):
+        return self.get_tip_height()
+
+    def get_unspents(self, addresses):
+        unspents = {address: [] for address in addresses}
+        canonical = {canonical_address(address): address for address in unspents}
+        unmatched = False
+
+        for tx in self.listunspent(0, 9999999, list(unspents)):
+            address = canonical.get(canonical_address(tx["address"]))
+            if address is None:
+                unmatched = True
+                continue
+            unspents[address].append(
+                Unspent(
+                    currency_to_satoshi(tx["amount"], "btc"),
+                    tx["confirmations"],
+                    tx["scriptPubKey"],
+                    tx["txid"],
+                    tx["vout"],
+                )
+            )
+
+        # Unspents of an address the node spells differently are looked up
+        # address by address:
+        if unmatched:
+            for address, address_unspents in unspents.items():
+                if not address_unspents:
+                    unspents[address] = self.get_unspent(address)
+
+        return unspents
+
+    def get_unspents_testnet(self, addresses):
+        return self.get_unspents(addresses)
+
     def broadcast_tx(self, tx_hex):
         try:
             _ = self.sendrawtransaction(tx_hex)
@@ -80,6 +359,10 @@ class RPCHost:
     def broadcast_tx_testnet(self, tx_hex):
         return self.broadcast_tx(tx_hex)
 
+    def get_fees(self):
+        estimates = get_node_fee_estimates(self)
+        return {tier: interpolate_fee(estimates, target) for tier, target in TIER_TARGETS.items()}
+
 
 class RPCMethod:
     def __init__(self, rpc_method, host):
@@ -104,6 +387,93 @@ class RPCMethod:
         return responseJSON["result"]
 
 
+class RPCResult:
+    """The result of a call queued in an :class:`~bit.network.services.RPCBatch`."""
+
+    __slots__ = ('_result', 'error', 'done')
+
+    def __init__(self):
+        self._result = None
+        # The error object of the node, if the call failed:
+        self.error = None
+        self.done = False
+
+    def result(self):
+        """Gets the result of the call.
+
+        :raises BitcoinNodeException: If the call failed.
+        :raises RuntimeError: If the batch was not sent yet.
+        """
+        if not self.done:
+            raise RuntimeError('The batch was not sent yet.')
+        if self.error is not None:
+            raise BitcoinNodeException("Error in RPC call: " + str(self.error))
+        return self._result
+
+
+class RPCBatch:
+    """Queues RPC calls to a node, see :meth:`~bit.network.services.RPCHost.batch`."""
+
+    def __init__(self, host):
+        self._host = host
+        self._calls = []
+
+    def __getattr__(self, rpc_method):
+        return RPCBatchMethod(rpc_method, self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def queue(self, rpc_method, args):
+        result = RPCResult()
+        self._calls.append(({"method": rpc_method, "params": list(args), "jsonrpc": "2.0"}, result))
+        return result
+
+    def send(self):
+        """Sends the queued calls, ``MAX_BATCH_SIZE`` per request."""
+        calls, self._calls = self._calls, []
+        size = self._host.MAX_BATCH_SIZE
+
+        for start in range(0, len(calls), size):
+            chunk = calls[start : start + size]
+            payload = json.dumps([dict(call, id=i) for i, (call, _) in enumerate(chunk)])
+            try:
+                response = self._host._session.post(self._host._url, headers=self._host._headers, data=payload)
+            except requests.exceptions.ConnectionError:
+                raise ConnectionError
+            if response.status_code not in (200, 500):
+                raise BitcoinNodeException(
+                    "RPC connection failure: " + str(response.status_code) + " " + response.reason
+                )
+            responseJSON = response.json()
+            # The node answers a malformed batch with a single error:
+            if not isinstance(responseJSON, list):
+                raise BitcoinNodeException("Error in RPC batch: " + str(responseJSON.get("error")))
+
+            # Responses may come in any order:
+            for reply in responseJSON:
+                i = reply.get("id")
+                if isinstance(i, int) and 0 <= i < len(chunk):
+                    result = chunk[i][1]
+                    result._result, result.error, result.done = reply.get("result"), reply.get("error"), True
+
+            if not all(result.done for _, result in chunk):
+                raise BitcoinNodeException("RPC batch response is missing results.")
+
+
+class RPCBatchMethod(RPCMethod):
+    def __getattr__(self, rpc_method):
+        new_method = '{}.{}'.format(self._rpc_method, rpc_method)
+        return RPCBatchMethod(new_method, self._host)
+
+    def __call__(self, *args):
+        return self._host.queue(self._rpc_method, args)
+
+
 class BlockchairAPI:
     MAIN_ENDPOINT = 'https://api.blockchair.com/bitcoin/'
     MAIN_ADDRESS_API = MAIN_ENDPOINT + 'dashboards/address/{}'
@@ -113,87 +483,86 @@ class BlockchairAPI:
     TEST_ADDRESS_API = TEST_ENDPOINT + 'dashboards/address/{}'
     TEST_TX_PUSH_API = TEST_ENDPOINT + 'push/transaction'
     TEST_TX_API = TEST_ENDPOINT + 'raw/transaction/{}'
+    MAIN_ADDRESSES_API = MAIN_ENDPOINT + 'dashboards/addresses/{}'
+    TEST_ADDRESSES_API = TEST_ENDPOINT + 'dashboards/addresses/{}'
+    MAIN_TX_DASHBOARD_API = MAIN_ENDPOINT + 'dashboards/transaction/{}'
+    TEST_TX_DASHBOARD_API = TEST_ENDPOINT + 'dashboards/transaction/{}'
     TX_PUSH_PARAM = 'data'
+    # Limits of the dashboard of many addresses:
+    MAX_ADDRESSES = 100
+    MAX_UNSPENTS = 10000
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['data'][address]['address']['balance']
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['data'][address]['address']['balance']
 
     @classmethod
-    def get_transactions(cls, address):
-        endpoint = cls.MAIN_ADDRESS_API
+    def _get_page(cls, endpoint, address, offset, limit):
+        payload = {'offset': str(offset), 'limit': str(limit)}
+        r = get_session().get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        if r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+        return r.json()['data'][address]
 
-        transactions = []
-        offset = 0
+    @classmethod
+    def _get_transactions(cls, endpoint, address):
         txs_per_page = 1000
-        payload = {'offset': str(offset), 'limit': str(txs_per_page)}
+        payload = {'offset': '0', 'limit': str(txs_per_page)}
 
-        r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return []
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
-        response = r.json()
-        response = response['data'][address]
+        response = r.json()['data'][address]
         total_txs = response['address']['transaction_count']
 
-        while total_txs > 0:
-            transactions.extend(tx for tx in response['transactions'])
+        # The first page tells the offsets of the others:
+        pages = fetch_pages(
+            lambda offset: cls._get_page(endpoint, address, offset, txs_per_page),
+            range(txs_per_page, total_txs, txs_per_page),
+        )
 
-            total_txs -= txs_per_page
-            offset += txs_per_page
-            payload['offset'] = str(offset)
-            r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-            if r.status_code != 200:  # pragma: no cover
-                raise ConnectionError
-            response = r.json()['data'][address]
+        transactions = list(response['transactions'])
+        for page in pages:
+            transactions.extend(page['transactions'])
 
         return transactions
 
     @classmethod
-    def get_transactions_testnet(cls, address):
-        endpoint = cls.TEST_ADDRESS_API
+    def get_transactions(cls, address):
+        return cls._get_transactions(cls.MAIN_ADDRESS_API, address)
 
-        transactions = []
-        offset = 0
-        txs_per_page = 1000
-        payload = {'offset': str(offset), 'limit': str(txs_per_page)}
+    @classmethod
+    def get_transactions_testnet(cls, address):
+        return cls._get_transactions(cls.TEST_ADDRESS_API, address)
 
-        r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+    @classmethod
+    def get_transaction_by_id(cls, txid):
+        r = get_session().get(cls.MAIN_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
-            return []
+            return None
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
-        response = r.json()
-        response = response['data'][address]
-        total_txs = response['address']['transaction_count']
-
-        while total_txs > 0:
-            transactions.extend(tx for tx in response['transactions'])
-
-            total_txs -= txs_per_page
-            offset += txs_per_page
-            payload['offset'] = str(offset)
-            r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-            if r.status_code != 200:  # pragma: no cover
-                raise ConnectionError
-            response = r.json()['data'][address]
 
-        return transactions
+        response = r.json()['data']
+        if not response:  # pragma: no cover
+            return None
+        return response[txid]['raw_transaction']
 
     @classmethod
-    def get_transaction_by_id(cls, txid):
-        r = requests.get(cls.MAIN_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
+    def get_transaction_by_id_testnet(cls, txid):
+        r = get_session().get(cls.TEST_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -205,8 +574,8 @@ class BlockchairAPI:
         return response[txid]['raw_transaction']
 
     @classmethod
-    def get_transaction_by_id_testnet(cls, txid):
-        r = requests.get(cls.TEST_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
+    def _get_confirmation_time(cls, url, txid):
+        r = get_session().get(url.format(txid), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -215,18 +584,27 @@ class BlockchairAPI:
         response = r.json()['data']
         if not response:  # pragma: no cover
             return None
-        return response[txid]['raw_transaction']
+        tx = response[txid]['transaction']
+        # Unconfirmed transactions have a block id of -1 and the time they
+        # were seen, confirmed ones the time of their block in UTC:
+        if tx['block_id'] < 0:
+            return None
+        return datetime.strptime(tx['time'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
 
     @classmethod
-    def get_unspent(cls, address):
-        endpoint = cls.MAIN_ADDRESS_API
+    def get_confirmation_time(cls, txid):
+        return cls._get_confirmation_time(cls.MAIN_TX_DASHBOARD_API, txid)
 
-        unspents = []
-        offset = 0
+    @classmethod
+    def get_confirmation_time_testnet(cls, txid):
+        return cls._get_confirmation_time(cls.TEST_TX_DASHBOARD_API, txid)
+
+    @classmethod
+    def _get_unspent(cls, endpoint, address):
         unspents_per_page = 1000
-        payload = {'offset': str(offset), 'limit': str(unspents_per_page)}
+        payload = {'offset': '0', 'limit': str(unspents_per_page)}
 
-        r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -238,81 +616,113 @@ class BlockchairAPI:
         script_pubkey = response['address']['script_hex']
         total_unspents = response['address']['unspent_output_count']
 
-        while total_unspents > 0:
-            unspents.extend(
-                Unspent(
-                    utxo['value'],
-                    block_height - utxo['block_id'] + 1 if utxo['block_id'] != -1 else 0,
-                    script_pubkey,
-                    utxo['transaction_hash'],
-                    utxo['index'],
-                )
-                for utxo in response['utxo']
-            )
+        pages = fetch_pages(
+            lambda offset: cls._get_page(endpoint, address, offset, unspents_per_page),
+            range(unspents_per_page, total_unspents, unspents_per_page),
+        )
 
-            total_unspents -= unspents_per_page
-            offset += unspents_per_page
-            payload['offset'] = str(offset)
-            r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-            if r.status_code != 200:  # pragma: no cover
-                raise ConnectionError
-            response = r.json()['data'][address]
+        return [
+            Unspent(
+                utxo['value'],
+                block_height - utxo['block_id'] + 1 if utxo['block_id'] != -1 else 0,
+                script_pubkey,
+                utxo['transaction_hash'],
+                utxo['index'],
+            )
+            for page in [response] + pages
+            for utxo in page['utxo']
+        ]
 
-        return unspents
+    @classmethod
+    def get_unspent(cls, address):
+        return cls._get_unspent(cls.MAIN_ADDRESS_API, address)
 
     @classmethod
     def get_unspent_testnet(cls, address):
-        endpoint = cls.TEST_ADDRESS_API
+        return cls._get_unspent(cls.TEST_ADDRESS_API, address)
 
-        unspents = []
-        offset = 0
-        unspents_per_page = 1000
-        payload = {'offset': str(offset), 'limit': unspents_per_page}
+    @classmethod
+    def _get_tip_height(cls, endpoint):
+        r = get_session().get(endpoint + 'stats', timeout=DEFAULT_TIMEOUT)
+        if r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+        return r.json()['data']['best_block_height']
 
-        r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-        if r.status_code == 404:  # pragma: no cover
-            return None
+    @classmethod
+    def get_tip_height(cls):
+        return cls._get_tip_height(cls.MAIN_ENDPOINT)
+
+    @classmethod
+    def get_tip_height_testnet(cls):
+        return cls._get_tip_height(cls.TEST_ENDPOINT)
+
+    @classmethod
+    def _get_addresses(cls, endpoint, addresses, utxo_limit):
+        # The limits apply to the transactions and unspents listed:
+        payload = {'limit': '0,{}'.format(utxo_limit)}
+        r = get_session().get(endpoint.format(','.join(addresses)), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
-        response = r.json()
+        return r.json()
+
+    @classmethod
+    def _get_balances(cls, endpoint, addresses):
+        response = cls._get_addresses(endpoint, addresses, 0)['data']['addresses']
+        matched = match_addresses(addresses, response)
+        return {address: response[matched[address]]['balance'] for address in addresses}
 
+    @classmethod
+    def _get_unspents(cls, endpoint, addresses):
+        response = cls._get_addresses(endpoint, addresses, cls.MAX_UNSPENTS)
         block_height = response['context']['state']
-        response = response['data'][address]
-        script_pubkey = response['address']['script_hex']
-        total_unspents = response['address']['unspent_output_count']
+        response = response['data']
 
-        while total_unspents > 0:
-            unspents.extend(
+        #! Unspents beyond the limit are left out.
+        if len(response['utxo']) >= cls.MAX_UNSPENTS:
+            raise ExcessiveAddress
+
+        unspents = {address: [] for address in addresses}
+        requested = {echoed: address for address, echoed in match_addresses(addresses, response['addresses']).items()}
+        for utxo in response['utxo']:
+            if utxo['address'] not in requested:
+                raise ConnectionError('The response has unspents of unknown address {}.'.format(utxo['address']))
+            unspents[requested[utxo['address']]].append(
                 Unspent(
                     utxo['value'],
                     block_height - utxo['block_id'] + 1 if utxo['block_id'] != -1 else 0,
-                    script_pubkey,
+                    response['addresses'][utxo['address']]['script_hex'],
                     utxo['transaction_hash'],
                     utxo['index'],
                 )
-                for utxo in response['utxo']
             )
+        return unspents
 
-            total_unspents -= unspents_per_page
-            offset += unspents_per_page
-            payload['offset'] = str(offset)
-            r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-            if r.status_code != 200:  # pragma: no cover
-                raise ConnectionError
-            response = r.json()['data'][address]
+    @classmethod
+    def get_balances(cls, addresses):
+        return cls._get_balances(cls.MAIN_ADDRESSES_API, addresses)
 
-        return unspents
+    @classmethod
+    def get_balances_testnet(cls, addresses):
+        return cls._get_balances(cls.TEST_ADDRESSES_API, addresses)
+
+    @classmethod
+    def get_unspents(cls, addresses):
+        return cls._get_unspents(cls.MAIN_ADDRESSES_API, addresses)
+
+    @classmethod
+    def get_unspents_testnet(cls, addresses):
+        return cls._get_unspents(cls.TEST_ADDRESSES_API, addresses)
 
     @classmethod
     def broadcast_tx(
         cls, tx_hex,
     ):  # pragma: no cover
-        r = requests.post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.TEST_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.TEST_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
@@ -327,11 +737,13 @@ class BlockstreamAPI:
     TEST_UNSPENT_API = TEST_ADDRESS_API + '/utxo'
     TEST_TX_PUSH_API = TEST_ENDPOINT + 'tx'
     TEST_TX_API = TEST_ENDPOINT + 'tx/{}/hex'
+    MAIN_TX_STATUS_API = MAIN_ENDPOINT + 'tx/{}/status'
+    TEST_TX_STATUS_API = TEST_ENDPOINT + 'tx/{}/status'
     TX_PUSH_PARAM = 'data'
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         response = r.json()
@@ -341,7 +753,7 @@ class BlockstreamAPI:
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_ADDRESS_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         response = r.json()
@@ -361,7 +773,7 @@ class BlockstreamAPI:
         transactions = []
 
         # Add mempool (unconfirmed) transactions
-        r = requests.get(mempool_endpoint.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(mempool_endpoint.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 400:  # pragma: no cover
             return []
         elif r.status_code != 200:  # pragma: no cover
@@ -374,7 +786,7 @@ class BlockstreamAPI:
         if len(unconfirmed) == 50:  # pragme: no cover
             raise ExcessiveAddress
 
-        r = requests.get(endpoint.format(address, ''), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address, ''), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 400:  # pragma: no cover
             return []
         elif r.status_code != 200:  # pragma: no cover
@@ -388,7 +800,7 @@ class BlockstreamAPI:
         while total_txs > 0:
             transactions.extend(tx['txid'] for tx in response)
 
-            response = requests.get(endpoint.format(address, transactions[-1]), timeout=DEFAULT_TIMEOUT).json()
+            response = get_session().get(endpoint.format(address, transactions[-1]), timeout=DEFAULT_TIMEOUT).json()
             total_txs = len(response)
 
         transactions.extend(unconfirmed)
@@ -401,7 +813,7 @@ class BlockstreamAPI:
 
         transactions = []
 
-        r = requests.get(endpoint.format(address, ''), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address, ''), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 400:  # pragma: no cover
             return []
         elif r.status_code != 200:  # pragma: no cover
@@ -415,14 +827,14 @@ class BlockstreamAPI:
         while total_txs > 0:
             transactions.extend(tx['txid'] for tx in response)
 
-            response = requests.get(endpoint.format(address, transactions[-1]), timeout=DEFAULT_TIMEOUT).json()
+            response = get_session().get(endpoint.format(address, transactions[-1]), timeout=DEFAULT_TIMEOUT).json()
             total_txs = len(response)
 
         return transactions
 
     @classmethod
     def get_transaction_by_id(cls, txid):
-        r = requests.get(cls.MAIN_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -431,7 +843,7 @@ class BlockstreamAPI:
 
     @classmethod
     def get_transaction_by_id_testnet(cls, txid):
-        r = requests.get(cls.TEST_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_TX_API.format(txid), timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -439,73 +851,91 @@ class BlockstreamAPI:
         return r.text
 
     @classmethod
-    def get_unspent(cls, address):
-        # Get current block height:
-        r_block = requests.get(cls.MAIN_ENDPOINT + 'blocks/tip/height', timeout=DEFAULT_TIMEOUT)
-        if r_block.status_code != 200:  # pragma: no cover
-            raise ConnectionError
-        block_height = int(r_block.text)
-
-        r = requests.get(cls.MAIN_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
-
-        #! BlockstreamAPI blocks addresses with "too many" UTXOs.
-        if r.status_code == 400 and r.text == "Too many history entries":
-            raise ExcessiveAddress
-        elif r.status_code != 200:  # pragma: no cover
+    def _get_confirmation_time(cls, url, txid):
+        r = get_session().get(url.format(txid), timeout=DEFAULT_TIMEOUT)
+        if r.status_code in (400, 404):  # pragma: no cover
+            return None
+        if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
+        status = r.json()
+        return status['block_time'] if status['confirmed'] else None
 
-        script_pubkey = bytes_to_hex(address_to_scriptpubkey(address))
+    @classmethod
+    def get_confirmation_time(cls, txid):
+        return cls._get_confirmation_time(cls.MAIN_TX_STATUS_API, txid)
 
-        return sorted(
-            [
-                Unspent(
-                    tx["value"],
-                    block_height - tx["status"]["block_height"] + 1 if tx["status"]["confirmed"] else 0,
-                    script_pubkey,
-                    tx["txid"],
-                    tx["vout"],
-                )
-                for tx in r.json()
-            ],
-            key=lambda u: u.confirmations,
-        )
+    @classmethod
+    def get_confirmation_time_testnet(cls, txid):
+        return cls._get_confirmation_time(cls.TEST_TX_STATUS_API, txid)
 
     @classmethod
-    def get_unspent_testnet(cls, address):
-        # Get current block height:
-        r_block = requests.get(cls.TEST_ENDPOINT + 'blocks/tip/height', timeout=DEFAULT_TIMEOUT)
-        if r_block.status_code != 200:  # pragma: no cover
+    def _get_tip_height(cls, endpoint):
+        r = get_session().get(endpoint + 'blocks/tip/height', timeout=DEFAULT_TIMEOUT)
+        if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
-        block_height = int(r_block.text)
+        return int(r.text)
 
-        r = requests.get(cls.TEST_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
+    @classmethod
+    def get_tip_height(cls):
+        return cls._get_tip_height(cls.MAIN_ENDPOINT)
 
-        if r.status_code == 400:  # pragma: no cover
-            return []
-        elif r.status_code != 200:  # pragma: no cover
-            raise ConnectionError
+    @classmethod
+    def get_tip_height_testnet(cls):
+        return cls._get_tip_height(cls.TEST_ENDPOINT)
 
+    @classmethod
+    def _to_unspents(cls, utxos, block_height, address, testnet):
+        block_height = raise_tip_height(
+            block_height, (tx["status"]["block_height"] for tx in utxos if tx["status"]["confirmed"]), testnet
+        )
         script_pubkey = bytes_to_hex(address_to_scriptpubkey(address))
 
         return [
             Unspent(
                 tx["value"],
-                block_height - tx["status"]["block_height"] + 1 if tx["status"]["confirmed"] else 0,
+                max(block_height - tx["status"]["block_height"] + 1, 1) if tx["status"]["confirmed"] else 0,
                 script_pubkey,
                 tx["txid"],
                 tx["vout"],
             )
-            for tx in r.json()
+            for tx in utxos
         ]
 
+    @classmethod
+    def get_unspent(cls, address):
+        block_height = get_tip_height_cached()
+
+        r = get_session().get(cls.MAIN_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
+
+        #! BlockstreamAPI blocks addresses with "too many" UTXOs.
+        if r.status_code == 400 and r.text == "Too many history entries":
+            raise ExcessiveAddress
+        elif r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+
+        return sorted(cls._to_unspents(r.json(), block_height, address, False), key=lambda u: u.confirmations)
+
+    @classmethod
+    def get_unspent_testnet(cls, address):
+        block_height = get_tip_height_cached(testnet=True)
+
+        r = get_session().get(cls.TEST_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
+
+        if r.status_code == 400:  # pragma: no cover
+            return []
+        elif r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+
+        return cls._to_unspents(r.json(), block_height, address, True)
+
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.TEST_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.TEST_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
@@ -520,21 +950,21 @@ class InsightAPI:  # pragma: no cover
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()
 
     @classmethod
     def get_transactions(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API + address, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_ADDRESS_API + address, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['transactions']
 
     @classmethod
     def get_transaction_by_id(cls, txid):
-        r = requests.get(cls.MAIN_TX_API + txid, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_TX_API + txid, timeout=DEFAULT_TIMEOUT)
         if r.status_code == 404:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -543,7 +973,7 @@ class InsightAPI:  # pragma: no cover
 
     @classmethod
     def get_unspent(cls, address):
-        r = requests.get(cls.MAIN_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_UNSPENT_API.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return [
@@ -559,7 +989,7 @@ class InsightAPI:  # pragma: no cover
 
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.MAIN_TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
@@ -588,7 +1018,7 @@ class BitcoreAPI(InsightAPI):
 
         unspents = []
 
-        r = requests.get(endpoint.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -605,7 +1035,7 @@ class BitcoreAPI(InsightAPI):
                 )
                 for tx in response
             )
-            response = requests.get(
+            response = get_session().get(
                 endpoint.format(address) + "&since={}".format(response[-1]['_id']), timeout=DEFAULT_TIMEOUT
             ).json()
 
@@ -613,13 +1043,13 @@ class BitcoreAPI(InsightAPI):
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['balance']
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_BALANCE_API.format(address), timeout=DEFAULT_TIMEOUT)
         r.raise_for_status()  # pragma: no cover
         return r.json()['balance']
 
@@ -629,7 +1059,7 @@ class BitcoreAPI(InsightAPI):
 
         unspents = []
 
-        r = requests.get(endpoint.format(address), timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint.format(address), timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -646,7 +1076,7 @@ class BitcoreAPI(InsightAPI):
                 )
                 for tx in response
             )
-            response = requests.get(
+            response = get_session().get(
                 endpoint.format(address) + "&since={}".format(response[-1]['_id']), timeout=DEFAULT_TIMEOUT
             ).json()
 
@@ -654,7 +1084,7 @@ class BitcoreAPI(InsightAPI):
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.post(
+        r = get_session().post(
             cls.TEST_TX_PUSH_API,
             json={cls.TX_PUSH_PARAM: tx_hex, 'network': 'testnet', 'coin': 'BCH'},
             timeout=DEFAULT_TIMEOUT,
@@ -665,46 +1095,43 @@ class BitcoreAPI(InsightAPI):
 class BlockchainAPI:
     ENDPOINT = 'https://blockchain.info/'
     ADDRESS_API = ENDPOINT + 'address/{}?format=json'
+    BALANCE_API = ENDPOINT + 'balance'
     UNSPENT_API = ENDPOINT + 'unspent'
     TX_PUSH_API = ENDPOINT + 'pushtx'
     TX_API = ENDPOINT + 'rawtx/'
     TX_PUSH_PARAM = 'tx'
+    # Addresses per request of the endpoints taking many:
+    MAX_ADDRESSES = 100
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.ADDRESS_API.format(address) + '&limit=0', timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.ADDRESS_API.format(address) + '&limit=0', timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['final_balance']
 
     @classmethod
-    def get_transactions(cls, address):
-        endpoint = cls.ADDRESS_API
+    def _get_page(cls, address, offset):
+        r = get_session().get(cls.ADDRESS_API.format(address), params={'offset': str(offset)}, timeout=DEFAULT_TIMEOUT)
+        if r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+        return r.json()
 
-        transactions = []
-        offset = 0
+    @classmethod
+    def get_transactions(cls, address):
         txs_per_page = 50
-        payload = {'offset': str(offset)}
 
-        r = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
-        if r.status_code != 200:  # pragma: no cover
-            raise ConnectionError
-        response = r.json()
+        response = cls._get_page(address, 0)
         total_txs = response['n_tx']
 
-        while total_txs > 0:
-            transactions.extend(tx['hash'] for tx in response['txs'])
+        # The first page tells the offsets of the others:
+        pages = fetch_pages(lambda offset: cls._get_page(address, offset), range(txs_per_page, total_txs, txs_per_page))
 
-            total_txs -= txs_per_page
-            offset += txs_per_page
-            payload['offset'] = str(offset)
-            response = requests.get(endpoint.format(address), params=payload, timeout=DEFAULT_TIMEOUT).json()
-
-        return transactions
+        return [tx['hash'] for page in [response] + pages for tx in page['txs']]
 
     @classmethod
     def get_transaction_by_id(cls, txid):
-        r = requests.get(cls.TX_API + txid + '?limit=0&format=hex', timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TX_API + txid + '?limit=0&format=hex', timeout=DEFAULT_TIMEOUT)
         if r.status_code == 500 and r.text == 'Transaction not found':  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -719,7 +1146,7 @@ class BlockchainAPI:
         utxos_per_page = 1000
         payload = {'active': address, 'offset': str(offset), 'limit': str(utxos_per_page)}
 
-        r = requests.get(endpoint, params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(endpoint, params=payload, timeout=DEFAULT_TIMEOUT)
 
         if r.status_code == 500:  # pragma: no cover
             return []
@@ -738,9 +1165,44 @@ class BlockchainAPI:
 
         return unspents[::-1]
 
+    @classmethod
+    def get_balances(cls, addresses):
+        r = get_session().get(cls.BALANCE_API, params={'active': '|'.join(addresses)}, timeout=DEFAULT_TIMEOUT)
+        if r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+        response = r.json()
+        matched = match_addresses(addresses, response)
+        return {address: response[matched[address]]['final_balance'] for address in addresses}
+
+    @classmethod
+    def get_unspents(cls, addresses):
+        payload = {'active': '|'.join(addresses), 'limit': '1000'}
+
+        r = get_session().get(cls.UNSPENT_API, params=payload, timeout=DEFAULT_TIMEOUT)
+
+        if r.status_code == 500:  # pragma: no cover
+            return {address: [] for address in addresses}
+        elif r.status_code != 200:  # pragma: no cover
+            raise ConnectionError
+
+        outputs = r.json()['unspent_outputs']
+
+        #! BlockchainAPI only supports up to 1000 UTXOs.
+        if len(outputs) == 1000:
+            raise ExcessiveAddress
+
+        # Unspents are told apart by their script:
+        scripts = {bytes_to_hex(address_to_scriptpubkey(address)): address for address in addresses}
+        unspents = {address: [] for address in addresses}
+        for tx in reversed(outputs):
+            unspents[scripts[tx['script']]].append(
+                Unspent(tx['value'], tx['confirmations'], tx['script'], tx['tx_hash_big_endian'], tx['tx_output_n'])
+            )
+        return unspents
+
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.TX_PUSH_API, data={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
@@ -759,14 +1221,14 @@ class SmartbitAPI:
 
     @classmethod
     def get_balance(cls, address):
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address), params={'limit': '1'}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_ADDRESS_API.format(address), params={'limit': '1'}, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['address']['total']['balance_int']
 
     @classmethod
     def get_balance_testnet(cls, address):
-        r = requests.get(cls.TEST_ADDRESS_API.format(address), params={'limit': '1'}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_ADDRESS_API.format(address), params={'limit': '1'}, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
         return r.json()['address']['total']['balance_int']
@@ -775,7 +1237,7 @@ class SmartbitAPI:
     def get_transactions(cls, address):
         txs_per_page = 1000
         payload = {'limit': str(txs_per_page)}
-        r = requests.get(cls.MAIN_ADDRESS_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_ADDRESS_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -789,7 +1251,7 @@ class SmartbitAPI:
             next_link = response['transaction_paging']['next_link']
 
         while next_link:
-            r = requests.get(next_link, timeout=DEFAULT_TIMEOUT)
+            r = get_session().get(next_link, timeout=DEFAULT_TIMEOUT)
             if r.status_code != 200:  # pragma: no cover
                 raise ConnectionError
             response = r.json()['address']
@@ -800,7 +1262,7 @@ class SmartbitAPI:
 
     @classmethod
     def get_transaction_by_id(cls, txid):
-        r = requests.get(cls.MAIN_TX_API.format(txid) + '?limit=1000', timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_TX_API.format(txid) + '?limit=1000', timeout=DEFAULT_TIMEOUT)
         if r.status_code == 400:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -811,7 +1273,7 @@ class SmartbitAPI:
     def get_transactions_testnet(cls, address):
         txs_per_page = 1000
         payload = {'limit': str(txs_per_page)}
-        r = requests.get(cls.TEST_ADDRESS_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_ADDRESS_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -825,7 +1287,7 @@ class SmartbitAPI:
             next_link = response['transaction_paging']['next_link']
 
         while next_link:
-            r = requests.get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
+            r = get_session().get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
             if r.status_code != 200:  # pragma: no cover
                 raise ConnectionError
             response = r.json()['address']
@@ -836,7 +1298,7 @@ class SmartbitAPI:
 
     @classmethod
     def get_transaction_by_id_testnet(cls, txid):
-        r = requests.get(cls.TEST_TX_API.format(txid) + '?limit=1000', timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_TX_API.format(txid) + '?limit=1000', timeout=DEFAULT_TIMEOUT)
         if r.status_code == 400:  # pragma: no cover
             return None
         if r.status_code != 200:  # pragma: no cover
@@ -847,7 +1309,7 @@ class SmartbitAPI:
     def get_unspent(cls, address):
         txs_per_page = 1000
         payload = {'limit': str(txs_per_page)}
-        r = requests.get(cls.MAIN_UNSPENT_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.MAIN_UNSPENT_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -870,7 +1332,7 @@ class SmartbitAPI:
             next_link = response['paging']['next_link']
 
         while next_link:
-            r = requests.get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
+            r = get_session().get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
             if r.status_code != 200:  # pragma: no cover
                 raise ConnectionError
             response = r.json()
@@ -892,7 +1354,7 @@ class SmartbitAPI:
     def get_unspent_testnet(cls, address):
         txs_per_page = 1000
         payload = {'limit': str(txs_per_page)}
-        r = requests.get(cls.TEST_UNSPENT_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
+        r = get_session().get(cls.TEST_UNSPENT_API.format(address), params=payload, timeout=DEFAULT_TIMEOUT)
         if r.status_code != 200:  # pragma: no cover
             raise ConnectionError
 
@@ -915,7 +1377,7 @@ class SmartbitAPI:
             next_link = response['paging']['next_link']
 
         while next_link:
-            r = requests.get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
+            r = get_session().get(next_link, params=payload, timeout=DEFAULT_TIMEOUT)
             if r.status_code != 200:  # pragma: no cover
                 raise ConnectionError
             response = r.json()
@@ -935,12 +1397,12 @@ class SmartbitAPI:
 
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.MAIN_TX_PUSH_API, json={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.MAIN_TX_PUSH_API, json={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
     @classmethod
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
-        r = requests.post(cls.TEST_TX_PUSH_API, json={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
+        r = get_session().post(cls.TEST_TX_PUSH_API, json={cls.TX_PUSH_PARAM: tx_hex}, timeout=DEFAULT_TIMEOUT)
         return True if r.status_code == 200 else False
 
 
@@ -953,6 +1415,13 @@ class NetworkAPI:
         ExcessiveAddress,
     )
 
+    # Errors counting against the health of an API service, unlike errors
+    # due to the address:
+    PROVIDER_ERRORS = tuple(error for error in IGNORED_ERRORS if error is not ExcessiveAddress)
+
+    # Orders the API services below by their health, see HealthTracker:
+    HEALTH = HealthTracker()
+
     GET_BALANCE_MAIN = [
         BlockchairAPI.get_balance,
         BlockstreamAPI.get_balance,
@@ -986,6 +1455,22 @@ class NetworkAPI:
         SmartbitAPI.broadcast_tx,  # Limit 5/minute
         BlockchainAPI.broadcast_tx,
     ]
+    GET_BALANCES_MAIN = [
+        BlockchairAPI.get_balances,  # Limit 100 addresses
+        BlockchainAPI.get_balances,  # Limit 100 addresses
+    ]
+    GET_TIP_HEIGHT_MAIN = [
+        BlockstreamAPI.get_tip_height,
+        BlockchairAPI.get_tip_height,
+    ]
+    GET_CONFIRMATION_TIME_MAIN = [
+        BlockstreamAPI.get_confirmation_time,
+        BlockchairAPI.get_confirmation_time,
+    ]
+    GET_UNSPENTS_MAIN = [
+        BlockchairAPI.get_unspents,  # Limit 100 addresses, 10000 unspents
+        BlockchainAPI.get_unspents,  # Limit 100 addresses, 1000 unspents
+    ]
 
     GET_BALANCE_TEST = [
         BlockchairAPI.get_balance_testnet,
@@ -1015,6 +1500,20 @@ class NetworkAPI:
         BitcoreAPI.broadcast_tx_testnet,
         SmartbitAPI.broadcast_tx_testnet,  # Limit 5/minute
     ]
+    GET_BALANCES_TEST = [
+        BlockchairAPI.get_balances_testnet,  # Limit 100 addresses
+    ]
+    GET_TIP_HEIGHT_TEST = [
+        BlockstreamAPI.get_tip_height_testnet,
+        BlockchairAPI.get_tip_height_testnet,
+    ]
+    GET_CONFIRMATION_TIME_TEST = [
+        BlockstreamAPI.get_confirmation_time_testnet,
+        BlockchairAPI.get_confirmation_time_testnet,
+    ]
+    GET_UNSPENTS_TEST = [
+        BlockchairAPI.get_unspents_testnet,  # Limit 100 addresses, 10000 unspents
+    ]
 
     @classmethod
     def connect_to_node(cls, user, password, host='localhost', port=8332, use_https=False, testnet=False, path=""):
@@ -1048,15 +1547,84 @@ class NetworkAPI:
             cls.GET_TRANSACTION_BY_ID_MAIN = [node.get_transaction_by_id]
             cls.GET_UNSPENT_MAIN = [node.get_unspent]
             cls.BROADCAST_TX_MAIN = [node.broadcast_tx]
+            cls.GET_BALANCES_MAIN = [node.get_balances]
+            cls.GET_UNSPENTS_MAIN = [node.get_unspents]
+            cls.GET_TIP_HEIGHT_MAIN = [node.get_tip_height]
+            cls.GET_CONFIRMATION_TIME_MAIN = [node.get_confirmation_time]
+            # The node is queried for fees besides the web APIs, replacing
+            # a previously connected node:
+            FeesAPI.GET_FEES = [node.get_fees] + [
+                api_call for api_call in FeesAPI.GET_FEES if not isinstance(getattr(api_call, '__self__', None), RPCHost)
+            ]
         else:
             cls.GET_BALANCE_TEST = [node.get_balance_testnet]
             cls.GET_TRANSACTIONS_TEST = [node.get_transactions_testnet]
             cls.GET_TRANSACTION_BY_ID_TEST = [node.get_transaction_by_id_testnet]
             cls.GET_UNSPENT_TEST = [node.get_unspent_testnet]
             cls.BROADCAST_TX_TEST = [node.broadcast_tx_testnet]
+            cls.GET_BALANCES_TEST = [node.get_balances_testnet]
+            cls.GET_UNSPENTS_TEST = [node.get_unspents_testnet]
+            cls.GET_TIP_HEIGHT_TEST = [node.get_tip_height_testnet]
+            cls.GET_CONFIRMATION_TIME_TEST = [node.get_confirmation_time_testnet]
 
         return node
 
+    @classmethod
+    def _call_in_turn(cls, api_calls, *args):
+        health = cls.HEALTH
+
+        for api_call in health.order(api_calls):
+            try:
+                return health.call(api_call, *args, errors=cls.PROVIDER_ERRORS)
+            except cls.IGNORED_ERRORS:
+                pass
+
+        raise ConnectionError('All APIs are unreachable.')
+
+    @classmethod
+    def _call(cls, api_calls, *args):
+        delay = HEDGE_DELAY
+        if delay is None or len(api_calls) < 2:
+            return cls._call_in_turn(api_calls, *args)
+
+        health = cls.HEALTH
+        executor = get_hedge_executor()
+        api_calls = iter(health.order(api_calls))
+        pending = set()
+        deadline = monotonic() + HEDGE_TIMEOUT
+
+        def ask_next():
+            api_call = next(api_calls, None)
+            if api_call is not None:
+                pending.add(executor.submit(health.call, api_call, *args, errors=cls.PROVIDER_ERRORS))
+
+        ask_next()
+        while pending:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                for slow in pending:
+                    slow.cancel()
+                break
+
+            done, _ = wait(pending, timeout=min(delay, remaining), return_when=FIRST_COMPLETED)
+            pending -= done
+
+            for future in done:
+                try:
+                    result = future.result()
+                except cls.IGNORED_ERRORS:
+                    continue
+                # Requests already sent run to completion unheeded:
+                for slow in pending:
+                    slow.cancel()
+                return result
+
+            # Either every service asked so far failed or none answered in
+            # time, so the next one is asked besides the slow ones:
+            ask_next()
+
+        raise ConnectionError('All APIs are unreachable.')
+
     @classmethod
     def get_balance(cls, address):
         """Gets the balance of an address in satoshi.
@@ -1066,14 +1634,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``int``
         """
-
-        for api_call in cls.GET_BALANCE_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._call(cls.GET_BALANCE_MAIN, address)
 
     @classmethod
     def get_balance_testnet(cls, address):
@@ -1084,14 +1645,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``int``
         """
-
-        for api_call in cls.GET_BALANCE_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._call(cls.GET_BALANCE_TEST, address)
 
     @classmethod
     def get_transactions(cls, address):
@@ -1102,14 +1656,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of ``str``
         """
-
-        for api_call in cls.GET_TRANSACTIONS_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._call(cls.GET_TRANSACTIONS_MAIN, address)
 
     @classmethod
     def get_transactions_testnet(cls, address):
@@ -1121,32 +1668,42 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of ``str``
         """
+        return cls._call(cls.GET_TRANSACTIONS_TEST, address)
 
-        for api_call in cls.GET_TRANSACTIONS_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
+    @classmethod
+    def _get_transaction_by_id(cls, api_calls, confirmation_calls, txid):
+        cache = TRANSACTION_CACHE
+        if cache is None:
+            return cls._call(api_calls, txid)
 
-        raise ConnectionError('All APIs are unreachable.')
+        tx_hex = cache.get(txid)
+        if tx_hex is None:
+            tx_hex = cls._call(api_calls, txid)
+            # Unconfirmed transactions may still be replaced or dropped:
+            if tx_hex is not None and cls._confirmed(confirmation_calls, txid):
+                cache.set(txid, tx_hex)
+
+        return tx_hex
+
+    @classmethod
+    def _confirmed(cls, confirmation_calls, txid):
+        try:
+            return cls._call(confirmation_calls, txid) is not None
+        except ConnectionError:
+            return False
 
     @classmethod
     def get_transaction_by_id(cls, txid):
-        """Gets a raw transaction hex by its transaction id (txid).
+        """Gets a raw transaction hex by its transaction id (txid). As
+        confirmed transactions never change, they are cached, see
+        :func:`~bit.network.services.set_transaction_cache`.
 
         :param txid: The id of the transaction
         :type txid: ``str``
         :raises ConnectionError: If all API services fail.
         :rtype: ``string``
         """
-
-        for api_call in cls.GET_TRANSACTION_BY_ID_MAIN:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._get_transaction_by_id(cls.GET_TRANSACTION_BY_ID_MAIN, cls.GET_CONFIRMATION_TIME_MAIN, txid)
 
     @classmethod
     def get_transaction_by_id_testnet(cls, txid):
@@ -1157,14 +1714,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``string``
         """
-
-        for api_call in cls.GET_TRANSACTION_BY_ID_TEST:
-            try:
-                return api_call(txid)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._get_transaction_by_id(cls.GET_TRANSACTION_BY_ID_TEST, cls.GET_CONFIRMATION_TIME_TEST, txid)
 
     @classmethod
     def get_unspent(cls, address):
@@ -1175,14 +1725,7 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
-
-        for api_call in cls.GET_UNSPENT_MAIN:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
-
-        raise ConnectionError('All APIs are unreachable.')
+        return cls._call(cls.GET_UNSPENT_MAIN, address)
 
     @classmethod
     def get_unspent_testnet(cls, address):
@@ -1194,14 +1737,132 @@ class NetworkAPI:
         :raises ConnectionError: If all API services fail.
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
+        return cls._call(cls.GET_UNSPENT_TEST, address)
 
-        for api_call in cls.GET_UNSPENT_TEST:
-            try:
-                return api_call(address)
-            except cls.IGNORED_ERRORS:
-                pass
+    @classmethod
+    def get_tip_height(cls):
+        """Gets the height of the chain tip. See
+        :func:`~bit.network.services.get_tip_height_cached` for a cached
+        height.
 
-        raise ConnectionError('All APIs are unreachable.')
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return cls._call(cls.GET_TIP_HEIGHT_MAIN)
+
+    @classmethod
+    def get_tip_height_testnet(cls):
+        """Gets the height of the chain tip of the test network.
+
+        :raises ConnectionError: If all API services fail.
+        :rtype: ``int``
+        """
+        return cls._call(cls.GET_TIP_HEIGHT_TEST)
+
+    @classmethod
+    def get_confirmation_time(cls, txid):
+        """Gets the UNIX time of the block that confirmed a transaction.
+
+        :param txid: The id of the transaction.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The time of the block, or ``None`` if the transaction is
+                  unconfirmed or unknown, e.g. because it was replaced.
+        :rtype: ``int``
+        """
+        return cls._call(cls.GET_CONFIRMATION_TIME_MAIN, txid)
+
+    @classmethod
+    def get_confirmation_time_testnet(cls, txid):
+        """Gets the UNIX time of the block that confirmed a transaction on the
+        test network.
+
+        :param txid: The id of the transaction.
+        :type txid: ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The time of the block, or ``None`` if the transaction is
+                  unconfirmed or unknown, e.g. because it was replaced.
+        :rtype: ``int``
+        """
+        return cls._call(cls.GET_CONFIRMATION_TIME_TEST, txid)
+
+    @classmethod
+    def _get_many(cls, api_calls, get_one, addresses):
+        addresses = list(dict.fromkeys(addresses))
+        results = {}
+
+        # Each API service gets the addresses the previous ones failed for,
+        # in chunks as large as it accepts:
+        for api_call in api_calls:
+            remaining = [address for address in addresses if address not in results]
+            if not remaining:
+                break
+            size = getattr(getattr(api_call, '__self__', None), 'MAX_ADDRESSES', len(remaining))
+            for i in range(0, len(remaining), size):
+                try:
+                    results.update(api_call(remaining[i : i + size]))
+                except cls.IGNORED_ERRORS:
+                    pass
+
+        # The rest are looked up one address at a time, concurrently:
+        remaining = [address for address in addresses if address not in results]
+        if remaining:
+            with ThreadPoolExecutor(min(len(remaining), MAX_CONCURRENT_LOOKUPS)) as executor:
+                results.update(zip(remaining, executor.map(get_one, remaining)))
+
+        return {address: results[address] for address in addresses}
+
+    @classmethod
+    def get_balances_many(cls, addresses):
+        """Gets the balances of many addresses in satoshi, with as few
+        requests as the API services allow.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The balance of each address.
+        :rtype: ``dict``
+        """
+        return cls._get_many(cls.GET_BALANCES_MAIN, cls.get_balance, addresses)
+
+    @classmethod
+    def get_balances_many_testnet(cls, addresses):
+        """Gets the balances of many addresses on the test network in
+        satoshi, with as few requests as the API services allow.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The balance of each address.
+        :rtype: ``dict``
+        """
+        return cls._get_many(cls.GET_BALANCES_TEST, cls.get_balance_testnet, addresses)
+
+    @classmethod
+    def get_unspents_many(cls, addresses):
+        """Gets all unspent transaction outputs belonging to many addresses,
+        with as few requests as the API services allow.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The unspents of each address.
+        :rtype: ``dict`` of ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return cls._get_many(cls.GET_UNSPENTS_MAIN, cls.get_unspent, addresses)
+
+    @classmethod
+    def get_unspents_many_testnet(cls, addresses):
+        """Gets all unspent transaction outputs belonging to many addresses
+        on the test network, with as few requests as the API services allow.
+
+        :param addresses: The addresses in question.
+        :type addresses: ``list`` of ``str``
+        :raises ConnectionError: If all API services fail.
+        :returns: The unspents of each address.
+        :rtype: ``dict`` of ``list`` of :class:`~bit.network.meta.Unspent`
+        """
+        return cls._get_many(cls.GET_UNSPENTS_TEST, cls.get_unspent_testnet, addresses)
 
     @classmethod
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
@@ -1213,9 +1874,9 @@ class NetworkAPI:
         """
         success = None
 
-        for api_call in cls.BROADCAST_TX_MAIN:
+        for api_call in cls.HEALTH.order(cls.BROADCAST_TX_MAIN):
             try:
-                success = api_call(tx_hex)
+                success = cls.HEALTH.call(api_call, tx_hex, errors=cls.PROVIDER_ERRORS)
                 if not success:
                     continue
                 return
@@ -1237,9 +1898,9 @@ class NetworkAPI:
         """
         success = None
 
-        for api_call in cls.BROADCAST_TX_TEST:
+        for api_call in cls.HEALTH.order(cls.BROADCAST_TX_TEST):
             try:
-                success = api_call(tx_hex)
+                success = cls.HEALTH.call(api_call, tx_hex, errors=cls.PROVIDER_ERRORS)
                 if not success:
                     continue
                 return
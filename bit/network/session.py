@@ -0,0 +1,114 @@
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from bit.network import ratelimit
+
+# Number of hosts whose connections are kept:
+POOL_CONNECTIONS = 16
+# Number of connections kept per host, which bounds concurrent requests to it:
+POOL_MAXSIZE = 10
+# Pool sizes of specific hosts, e.g. {'api.blockchair.com': 4}:
+HOST_POOL_SIZES = {}
+# Retries of failed connections, reads and overloaded responses of requests
+# that are safe to repeat, i.e. not of broadcasts:
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.1
+RETRY_STATUSES = (502, 503, 504)
+KEEP_ALIVE = True
+
+_session = None
+_lock = Lock()
+
+
+def set_session_options(
+    pool_connections=None, pool_maxsize=None, host_pool_sizes=None, max_retries=None, keep_alive=None
+):
+    """Configures the HTTP session shared by all API providers. Options that
+    are not given keep their current value.
+
+    :param pool_connections: The number of hosts whose connections are kept.
+    :type pool_connections: ``int``
+    :param pool_maxsize: The number of connections kept per host.
+    :type pool_maxsize: ``int``
+    :param host_pool_sizes: The number of connections kept for specific hosts.
+    :type host_pool_sizes: ``dict``
+    :param max_retries: The number of retries of failed requests.
+    :type max_retries: ``int``
+    :param keep_alive: Whether or not to reuse connections.
+    :type keep_alive: ``bool``
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, HOST_POOL_SIZES, MAX_RETRIES, KEEP_ALIVE, _session
+
+    with _lock:
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if host_pool_sizes is not None:
+            HOST_POOL_SIZES = dict(host_pool_sizes)
+        if max_retries is not None:
+            MAX_RETRIES = max_retries
+        if keep_alive is not None:
+            KEEP_ALIVE = keep_alive
+        # Requests in flight finish on the previous session:
+        _session = None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Sends requests within the rate limits of
+    :func:`~bit.network.ratelimit.set_rate_limits`, and backs off from hosts
+    answering 429 Too Many Requests as long as their Retry-After asks."""
+
+    def send(self, request, **kwargs):
+        limiter = ratelimit.get_rate_limiter()
+        limiter.acquire(request.url)
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 429:
+            retry_after = ratelimit.parse_retry_after(response.headers.get('Retry-After'))
+            limiter.retry_after(request.url, ratelimit.RATE_LIMITED_TIME if retry_after is None else retry_after)
+
+        return response
+
+
+def make_adapter(pool_maxsize):
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        # Hand the last response to the caller instead of raising:
+        raise_on_status=False,
+        # Rather than sleeping, RateLimitedAdapter skips rate limited hosts:
+        respect_retry_after_header=False,
+    )
+    return RateLimitedAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=retry)
+
+
+def get_session():
+    """Gets the HTTP session shared by all API providers, which keeps
+    connections alive and pools them per host. See
+    :func:`~bit.network.session.set_session_options`.
+
+    :rtype: ``requests.Session``
+    """
+    session = _session
+    if session is not None:
+        return session
+
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = make_adapter(POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            for host, pool_maxsize in HOST_POOL_SIZES.items():
+                adapter = make_adapter(pool_maxsize)
+                session.mount('https://{}/'.format(host), adapter)
+                session.mount('http://{}/'.format(host), adapter)
+            if not KEEP_ALIVE:
+                session.headers['Connection'] = 'close'
+            globals()['_session'] = session
+        return _session
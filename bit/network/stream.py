@@ -0,0 +1,162 @@
+import json
+import logging
+from threading import Event, Lock, Thread
+
+from bit.network.fees import (
+    DEFAULT_TIMEOUT,
+    FEE_TIERS,
+    get_fee_for_target_local_cached,
+    get_fee_local_cached,
+    get_fees_cached,
+    mempool_blocks_to_estimates,
+)
+from bit.network.services import set_tip_height
+
+URL = 'wss://mempool.space/api/v1/ws'
+
+# Seconds to wait before reconnecting, doubled after each failed attempt:
+RECONNECT_DELAY = 1
+MAX_RECONNECT_DELAY = 60
+
+# Seconds without a message after which the connection is considered dead.
+# mempool.space pushes statistics every few seconds:
+IDLE_TIMEOUT = 120
+
+
+class FeeSubscriber:
+    """Keeps the cached fees of :func:`~bit.network.get_fee_cached`,
+    :func:`~bit.network.get_fees_cached` and
+    :func:`~bit.network.get_fee_for_target` current from the websocket stream
+    of mempool.space, instead of polling its API once the cache expires.
+    New blocks update the height of the chain tip shared by API services,
+    see :func:`~bit.network.services.set_tip_height`.
+
+    The stream is read by a background thread which reconnects with an
+    exponential back-off whenever the connection fails. While it is down, the
+    cache is refreshed by polling as usual. Requires the ``stream`` extra:
+    ``pip install bit[stream]``.
+
+    :param url: The websocket URL of a mempool.space instance.
+    :type url: ``str``
+    :param timeout: The number of seconds to wait for connecting.
+    :type timeout: ``int``
+    :param idle_timeout: The number of seconds without a message after which
+                         the subscriber reconnects.
+    :type idle_timeout: ``int``
+    :param testnet: Whether the stream is of the test network, whose tip
+                    its blocks then update.
+    :type testnet: ``bool``
+    """
+
+    def __init__(self, url=URL, timeout=DEFAULT_TIMEOUT, idle_timeout=IDLE_TIMEOUT, testnet=False):
+        self.url = url
+        self.testnet = testnet
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        # Set while the stream is connected:
+        self.connected = Event()
+        # The number of messages applied to the cache:
+        self.updates = 0
+        self._stopped = Event()
+        self._lock = Lock()
+        self._thread = None
+        self._ws = None
+
+    def start(self):
+        """Starts reading the stream in a background thread.
+
+        :returns: The subscriber itself.
+        :rtype: :class:`~bit.network.stream.FeeSubscriber`
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = Thread(target=self.run, name='bit-fee-subscriber', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Closes the stream and waits for the background thread to exit.
+
+        :param timeout: The maximum number of seconds to wait.
+        :type timeout: ``int``
+        """
+        self._stopped.set()
+        with self._lock:
+            ws, thread = self._ws, self._thread
+        if ws is not None:
+            # Wakes up the thread waiting for a message:
+            ws.abort()
+        if thread is not None:
+            thread.join(timeout)
+
+    def run(self):
+        """Reads the stream until the subscriber is stopped, reconnecting
+        whenever the connection fails."""
+        delay = RECONNECT_DELAY
+
+        while not self._stopped.is_set():
+            updates = self.updates
+            try:
+                self.listen()
+            except Exception as e:
+                if not self._stopped.is_set():
+                    logging.warning('Fee stream failed: {!r}, reconnecting in {} seconds.'.format(e, delay))
+
+            # Back off only while no messages arrive:
+            delay = RECONNECT_DELAY if self.updates > updates else min(delay * 2, MAX_RECONNECT_DELAY)
+            self._stopped.wait(delay)
+
+    def listen(self):
+        """Connects to the stream and applies its messages until it closes."""
+        import websocket
+
+        ws = websocket.create_connection(self.url, timeout=self.timeout)
+        with self._lock:
+            self._ws = ws
+
+        try:
+            if self._stopped.is_set():
+                return
+
+            ws.settimeout(self.idle_timeout)
+            ws.send(json.dumps({'action': 'want', 'data': ['stats', 'mempool-blocks', 'blocks']}))
+            self.connected.set()
+
+            while not self._stopped.is_set():
+                message = ws.recv()
+                # An empty message means the server closed the connection:
+                if not message:
+                    break
+                self.handle(message)
+        finally:
+            self.connected.clear()
+            with self._lock:
+                self._ws = None
+            ws.close()
+
+    def handle(self, message):
+        """Applies a message of the stream to the fee and tip height caches.
+
+        :param message: The JSON message.
+        :type message: ``str``
+        """
+        data = json.loads(message)
+        if not isinstance(data, dict):
+            return
+
+        if 'fees' in data:
+            fees = {tier: data['fees'][tier] for tier in FEE_TIERS}
+            get_fee_local_cached.cache.set(fees)
+            self.updates += 1
+
+        if 'mempool-blocks' in data:
+            estimates = mempool_blocks_to_estimates(data['mempool-blocks'], get_fees_cached())
+            get_fee_for_target_local_cached.cache.set(estimates)
+            self.updates += 1
+
+        # The latest blocks are sent on connecting, then each new block:
+        blocks = data['blocks'] if 'blocks' in data else [data['block']] if 'block' in data else []
+        if blocks:
+            set_tip_height(max(block['height'] for block in blocks), self.testnet)
+            self.updates += 1
@@ -12,7 +12,6 @@ from bit.utils import (
     bytes_to_hex,
     chunk_data,
     hex_to_bytes,
-    int_to_unknown_bytes,
     int_to_varint,
     script_push,
     get_signatures_from_script,
@@ -47,6 +46,10 @@ from bit.constants import (
     OP_RETURN,
     OP_EQUAL,
     MESSAGE_LIMIT,
+    MAX_STANDARD_TX_WEIGHT,
+    MAX_BIP125_RBF_SEQUENCE,
+    MIN_RELAY_FEE,
+    INCREMENTAL_RELAY_FEE,
 )
 
 
@@ -184,9 +187,9 @@ def estimate_tx_fee(in_size, n_in, out_size, n_out, satoshis, segwit=False):
 
     estimated_size = math.ceil(
         in_size
-        + len(int_to_unknown_bytes(n_in, byteorder='little'))
+        + len(int_to_varint(n_in))
         + out_size
-        + len(int_to_unknown_bytes(n_out, byteorder='little'))
+        + len(int_to_varint(n_out))
         + 8
         # Accounting for magic header vBytes ('0001') 
         + (0.5 if segwit else 0)
@@ -199,6 +202,33 @@ def estimate_tx_fee(in_size, n_in, out_size, n_out, satoshis, segwit=False):
     return estimated_fee
 
 
+def estimate_tx_vsize(unspents, output_size):
+    """Estimates the virtual size of a transaction from its weight.
+
+    The virtual sizes of the inputs are given by the unspents, see
+    :func:`~bit.network.meta.estimate_input_vsize`. Transactions spending any
+    Segwit input additionally contain the marker and flag bytes and an empty
+    witness for each legacy input.
+
+    :param unspents: The UTXOs spent by the transaction.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param output_size: The sizes of the outputs, each including its amount
+                        and the length of its script.
+    :type output_size: ``list`` of ``int``
+    :rtype: ``int``
+    """
+    # Sizes of 0 stand for absent outputs, e.g. without a message:
+    n_out = sum(1 for size in output_size if size)
+
+    weight = 4 * (8 + len(int_to_varint(len(unspents))) + len(int_to_varint(n_out)) + sum(output_size))
+    weight += sum(4 * u.vsize for u in unspents)
+
+    if any(u.segwit for u in unspents):
+        weight += 2 + sum(1 for u in unspents if not u.segwit)
+
+    return math.ceil(weight / 4)
+
+
 def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, consolidate=False, unspents):
     '''
     Implementation of Branch-and-Bound coin selection defined in Erhart's
@@ -220,7 +250,8 @@ def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, co
     :type absolute_fee: ``bool``
     :param consolidate: Whether or not the Branch-and-Bound process for finding
                         a perfect match should be skipped and all unspents
-                        used directly.
+                        used directly. Otherwise unspents worth at most the
+                        fee for spending them are skipped.
     :type consolidate: ``bool``
     :param unspents: The UTXOs to use as inputs.
     :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
@@ -232,20 +263,26 @@ def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, co
     BNB_TRIES = 1000000
 
     # COST_OF_OVERHEAD excludes the return address of output_size (last element).
-    COST_OF_OVERHEAD = (8 + sum(output_size[:-1]) + 1) * fee
+    # It assumes less than 253 inputs and includes the Segwit marker and flag
+    # if any unspent uses Segwit. The 3 weight units round up the virtual size:
+    n_out = sum(1 for size in output_size if size)
+    overhead_weight = 4 * (8 + 1 + len(int_to_varint(n_out)) + sum(output_size[:-1]))
+    overhead_weight += 2 if any(u.segwit for u in unspents) else 0
+    COST_OF_OVERHEAD = (overhead_weight + 3) / 4 * fee
+
+    # The cost of a change output includes spending it later:
+    COST_OF_CHANGE = (output_size[-1] + sum(u.vsize for u in unspents) / max(len(unspents), 1)) * fee
 
     def branch_and_bound(d, selected_coins, effective_value, target, fee, sorted_unspents):  # pragma: no cover
 
-        nonlocal COST_OF_OVERHEAD, BNB_TRIES
+        nonlocal COST_OF_OVERHEAD, COST_OF_CHANGE, BNB_TRIES
         BNB_TRIES -= 1
-        COST_PER_INPUT = 148 * fee  # Just typical estimate values
-        COST_PER_OUTPUT = 34 * fee
 
         # The target we want to match includes cost of overhead for transaction
         target_to_match = target + COST_OF_OVERHEAD
         # Allowing to pay fee for a whole input and output is rationally
         # correct, but increases the fee-rate dramatically for only few inputs.
-        match_range = COST_PER_INPUT + COST_PER_OUTPUT
+        match_range = COST_OF_CHANGE
         # We could allow to spend up to X% more on the fees if we can find a
         # perfect match:
         # match_range += int(0.1 * fee * sum(u.vsize for u in selected_coins))
@@ -294,7 +331,19 @@ def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, co
 
                     return with_this
 
-    sorted_unspents = sorted(unspents, key=lambda u: u.amount, reverse=True)
+    if not consolidate and not absolute_fee:
+        # Unspents worth at most the fee for spending them only lower the
+        # effective value of a selection:
+        uneconomical = [u for u in unspents if u.effective_value(fee) <= 0]
+        if uneconomical:
+            logging.debug(
+                'Skipping {} uneconomical unspents worth {} satoshis at {} satoshis per byte'.format(
+                    len(uneconomical), sum(u.amount for u in uneconomical), fee
+                )
+            )
+            unspents = [u for u in unspents if u.effective_value(fee) > 0]
+
+    sorted_unspents = sorted(unspents, key=lambda u: u.effective_value(fee), reverse=True)
     selected_coins = []
 
     if not consolidate and not absolute_fee:
@@ -307,6 +356,7 @@ def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, co
     # Fallback: If no match, Single Random Draw with return address:
     if selected_coins == []:
         unspents = unspents.copy()
+        estimated_fee = 0
         # Since we have no information on the user's spending habit it is
         # best practice to randomly select UTXOs until we have enough.
         if not consolidate:
@@ -315,9 +365,7 @@ def select_coins(target, fee, output_size, min_change, *, absolute_fee=False, co
             shuffle(unspents)
         while unspents:
             selected_coins.append(unspents.pop(0))
-            estimated_fee = estimate_tx_fee(
-                sum(u.vsize for u in selected_coins), len(selected_coins), sum(output_size), len(output_size), fee, any(u.segwit for u in selected_coins)
-            )
+            estimated_fee = estimate_tx_vsize(selected_coins, output_size) * fee
             estimated_fee = fee if absolute_fee else estimated_fee
             remaining = sum(u.amount for u in selected_coins) - target - estimated_fee
             if remaining >= min_change and (not consolidate or len(unspents) == 0):
@@ -387,12 +435,18 @@ def sanitize_tx_data(
     min_change=0,
     version='main',
     message_is_hex=False,
-    replace_by_fee=False
+    replace_by_fee=False,
+    pool=None,
+    reserve=False,
 ):
     """
     sanitize_tx_data()
 
     fee is in satoshis per byte.
+
+    If a :class:`~bit.network.meta.UTXOPool` is given as ``pool``, unspents
+    reserved in it are skipped during coin selection and, with ``reserve``,
+    the selected unspents are reserved atomically with the selection.
     """
 
     outputs = outputs.copy()
@@ -424,15 +478,22 @@ def sanitize_tx_data(
     sum_outputs = sum(out[1] for out in outputs)
 
     # Use Branch-and-Bound for coin selection:
-    unspents[:], remaining = select_coins(
-        sum_outputs,
-        fee,
-        output_size,
-        min_change=min_change,
-        absolute_fee=absolute_fee,
-        consolidate=combine,
-        unspents=unspents,
-    )
+    def select(candidates):
+        return select_coins(
+            sum_outputs,
+            fee,
+            output_size,
+            min_change=min_change,
+            absolute_fee=absolute_fee,
+            consolidate=combine,
+            unspents=candidates,
+        )
+
+    if pool is None:
+        unspents[:], remaining = select(unspents)
+    else:
+        economical_fee = None if combine or absolute_fee else fee
+        unspents[:], remaining = pool.select(select, unspents, reserve=reserve, fee=economical_fee)
 
     if replace_by_fee:
         for unspent in unspents:
@@ -453,6 +514,396 @@ def sanitize_tx_data(
     return unspents, outputs
 
 
+def plan_batches(
+    outputs,
+    unspents,
+    fee,
+    leftover,
+    *,
+    min_change=0,
+    max_vsize=MAX_STANDARD_TX_WEIGHT // 4,
+    version='main',
+    replace_by_fee=False
+):
+    """Plans as few transactions as possible paying all ``outputs``.
+
+    Outputs are packed in order into a transaction as long as it stays below
+    ``max_vsize`` including the inputs needed to fund it, which are estimated
+    by spending the largest unspents first, and a single change output. The
+    inputs of each transaction are then chosen by
+    :func:`~bit.transaction.select_coins` among the unspents not spent by
+    previous transactions.
+
+    :param outputs: A sequence of outputs in the form
+                    ``(destination, amount, currency)``.
+    :type outputs: ``list`` of ``tuple``
+    :param unspents: The UTXOs available to all transactions.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param leftover: The destination receiving the change of each transaction.
+    :type leftover: ``str``
+    :param max_vsize: The maximum virtual size of each transaction. Defaults
+                      to the standardness limit of 100 kvB.
+    :type max_vsize: ``int``
+    :raises InsufficientFunds: If the unspents cannot fund all outputs.
+    :returns: A list of ``(unspents, outputs)`` tuples, each as returned by
+              :func:`~bit.transaction.sanitize_tx_data`.
+    :rtype: ``list`` of ``tuple``
+    """
+
+    outputs = [(dest, currency_to_satoshi_cached(amount, currency)) for dest, amount, currency in outputs]
+    output_sizes = [len(address_to_scriptpubkey(dest)) + 9 for dest, _ in outputs]
+    change_size = len(address_to_scriptpubkey(leftover)) + 9
+
+    remaining = sorted(unspents, key=lambda u: u.amount, reverse=True)
+
+    def fund(funding, amount, out_size, n_out):
+        # Extends the largest-first funding of a batch until it pays ``amount``
+        # and the fee, returning the funding and the estimated size, or no
+        # funding if the remaining unspents do not suffice. Outputs only add
+        # to the amount and size, so a batch grown by an output extends the
+        # funding of the batch instead of selecting from scratch. The funding
+        # is the number of unspents spent from ``remaining``, their amount and
+        # weight, the number of legacy inputs and whether any is Segwit:
+        n, selected, in_weight, n_legacy, segwit = funding
+        while True:
+            if n:
+                # Incrementally computes estimate_tx_vsize(remaining[:n], ...):
+                weight = 4 * (8 + len(int_to_varint(n)) + len(int_to_varint(n_out)) + out_size) + in_weight
+                vsize = math.ceil((weight + (2 + n_legacy if segwit else 0)) / 4)
+                if selected >= amount + vsize * fee + min_change:
+                    return (n, selected, in_weight, n_legacy, segwit), vsize
+                if vsize > max_vsize:
+                    break
+            if n == len(remaining):
+                break
+            unspent = remaining[n]
+            n += 1
+            selected += unspent.amount
+            in_weight += 4 * unspent.vsize
+            n_legacy += not unspent.segwit
+            segwit = segwit or unspent.segwit
+        return None, 0
+
+    def estimated_vsize(selected, tx_outputs):
+        return estimate_tx_vsize(selected, [len(address_to_scriptpubkey(dest)) + 9 for dest, _ in tx_outputs])
+
+    batches = []
+
+    def close(batch, funding):
+        nonlocal remaining
+
+        batch_outputs = [(outputs[i][0], outputs[i][1], 'satoshi') for i in batch]
+        selected, tx_outputs = sanitize_tx_data(
+            remaining.copy(),
+            batch_outputs,
+            fee,
+            leftover,
+            combine=False,
+            min_change=min_change,
+            version=version,
+            replace_by_fee=replace_by_fee,
+        )
+        # A random draw may spend more inputs than estimated, so fall back to
+        # the largest-first funding if the limit would be exceeded:
+        if estimated_vsize(selected, tx_outputs) > max_vsize:
+            selected, tx_outputs = sanitize_tx_data(
+                funding.copy(),
+                batch_outputs,
+                fee,
+                leftover,
+                combine=False,
+                min_change=min_change,
+                version=version,
+                replace_by_fee=replace_by_fee,
+            )
+        batches.append((selected, tx_outputs))
+
+        spent = {(u.txid, u.txindex) for u in selected}
+        remaining = [u for u in remaining if (u.txid, u.txindex) not in spent]
+
+    no_funding = (0, 0, 0, 0, False)
+    batch, funding, amount, out_size = [], no_funding, 0, change_size
+
+    for i in range(len(outputs)):
+        value, size = outputs[i][1], output_sizes[i]
+        extended, vsize = fund(funding, amount + value, out_size + size, len(batch) + 2)
+        if extended and vsize <= max_vsize:
+            batch.append(i)
+            funding, amount, out_size = extended, amount + value, out_size + size
+            continue
+
+        if batch:
+            close(batch, remaining[: funding[0]])
+            extended, vsize = fund(no_funding, value, change_size + size, 2)
+        if not extended or vsize > max_vsize:
+            raise InsufficientFunds(
+                'Balance {} cannot fund the output of {} satoshi to {} in a transaction below {} '
+                'vbytes.'.format(sum(u.amount for u in remaining), value, outputs[i][0], max_vsize)
+            )
+        batch, funding, amount, out_size = [i], extended, value, change_size + size
+
+    if batch:
+        close(batch, remaining[: funding[0]])
+
+    return batches
+
+
+def plan_consolidation(
+    unspents,
+    fee,
+    leftover,
+    *,
+    economical=False,
+    max_vsize=MAX_STANDARD_TX_WEIGHT // 4,
+    version='main',
+    replace_by_fee=False
+):
+    """Plans transactions spending ``unspents`` to the single output
+    ``leftover``, each staying below ``max_vsize``.
+
+    Unlike ``combine=True``, which spends all unspents in one transaction,
+    this splits large sets of unspents into several transactions that nodes
+    will relay. Unspents are assigned from the largest to the smallest amount,
+    and a final group of dust whose amount cannot pay its fee is left unspent.
+
+    :param unspents: The UTXOs to consolidate.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param leftover: The destination receiving the consolidated amount.
+    :type leftover: ``str``
+    :param economical: Whether or not to skip unspents whose amount does not
+                       exceed the fee for spending them.
+    :type economical: ``bool``
+    :param max_vsize: The maximum virtual size of each transaction. Defaults
+                      to the standardness limit of 100 kvB.
+    :type max_vsize: ``int``
+    :raises InsufficientFunds: If the first transaction cannot pay its fee.
+    :returns: A list of ``(unspents, outputs)`` tuples, each as returned by
+              :func:`~bit.transaction.sanitize_tx_data`.
+    :rtype: ``list`` of ``tuple``
+    """
+
+    if economical:
+        unspents = [u for u in unspents if u.effective_value(fee) > 0]
+
+    if not unspents:
+        raise ValueError('Transactions must have at least one unspent.')
+
+    out_size = len(address_to_scriptpubkey(leftover)) + 9
+
+    groups = [[]]
+    # The weight of the inputs, and of the empty witnesses of legacy inputs:
+    in_weight = 0
+    n_legacy = 0
+    segwit = False
+
+    for unspent in sorted(unspents, key=lambda u: u.amount, reverse=True):
+        group = groups[-1]
+        # Incrementally computes estimate_tx_vsize(group + [unspent], [out_size]):
+        weight = 4 * (8 + len(int_to_varint(len(group) + 1)) + 1 + out_size) + in_weight + 4 * unspent.vsize
+        if segwit or unspent.segwit:
+            weight += 2 + n_legacy + (not unspent.segwit)
+        if group and math.ceil(weight / 4) > max_vsize:
+            group = []
+            groups.append(group)
+            in_weight = 0
+            n_legacy = 0
+            segwit = False
+        group.append(unspent)
+        in_weight += 4 * unspent.vsize
+        n_legacy += not unspent.segwit
+        segwit = segwit or unspent.segwit
+
+    batches = []
+    for group in groups:
+        try:
+            batches.append(
+                sanitize_tx_data(
+                    group,
+                    [],
+                    fee,
+                    leftover,
+                    combine=True,
+                    version=version,
+                    replace_by_fee=replace_by_fee,
+                )
+            )
+        except InsufficientFunds:
+            # Sorted by amount, only the last groups can be left with dust
+            # that cannot pay for itself, which must not abort the others:
+            if not batches:
+                raise
+
+    return batches
+
+
+def _outpoint(txin):
+    return bytes_to_hex(txin.txid[::-1]), int.from_bytes(txin.txindex, byteorder='little')
+
+
+def _pop_spent(tx, unspents):
+    # Removes the unspents spent by the inputs of ``tx`` from the dictionary
+    # ``unspents`` keyed by outpoint and returns them in the order of inputs.
+    spent = []
+    for txin in tx.TxIn:
+        outpoint = _outpoint(txin)
+        if outpoint not in unspents:
+            raise ValueError(
+                'The unspent {}:{} spent by the transaction is unknown. Please provide all unspents '
+                'spent by the transaction.'.format(*outpoint)
+            )
+        spent.append(unspents.pop(outpoint))
+    return spent
+
+
+def _amount(txout):
+    return int.from_bytes(txout.amount, byteorder='little')
+
+
+def plan_fee_bump(tx, unspents, fee, leftover, *, min_change=0):
+    """Plans a replacement of a transaction opted in for replace-by-fee that
+    pays ``fee`` satoshi per byte, following the rules of BIP 125.
+
+    The replacement spends all inputs of ``tx`` and pays all of its outputs
+    except the change, which is the last output paying to ``leftover``. The
+    higher fee is taken from the change, and if it does not suffice,
+    confirmed unspents are added from the largest effective value on. As
+    required by BIP 125, the replacement pays at least the fee of ``tx`` plus
+    the incremental relay fee for its own size.
+
+    :param tx: The transaction to replace.
+    :type tx: :class:`~bit.transaction.TxObj` or ``str``
+    :param unspents: The UTXOs spent by ``tx`` and those that may be added.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param leftover: The destination of the change.
+    :type leftover: ``str``
+    :raises ValueError: If ``tx`` did not opt in for replace-by-fee or an
+                        unspent it spends is missing.
+    :raises InsufficientFunds: If the unspents cannot pay the higher fee.
+    :returns: The unspents and outputs of the replacement, to be signed by
+              :func:`~bit.transaction.create_new_transaction`.
+    :rtype: ``tuple``
+    """
+    if not isinstance(tx, TxObj):
+        tx = deserialize(tx)
+
+    if all(int.from_bytes(txin.sequence, byteorder='little') > MAX_BIP125_RBF_SEQUENCE for txin in tx.TxIn):
+        raise ValueError('The transaction did not opt in for replace-by-fee (BIP 125).')
+
+    unspents = {(u.txid, u.txindex): u for u in unspents}
+    inputs = _pop_spent(tx, unspents)
+    for unspent in inputs:
+        unspent.opt_in_for_RBF()
+
+    old_fee = sum(u.amount for u in inputs) - sum(map(_amount, tx.TxOut))
+
+    change_script = address_to_scriptpubkey(leftover)
+    change_index = next((i for i in reversed(range(len(tx.TxOut))) if tx.TxOut[i].script_pubkey == change_script), None)
+    payments = [txout for i, txout in enumerate(tx.TxOut) if i != change_index]
+    payment_size = [len(bytes(txout)) for txout in payments]
+    change_size = len(change_script) + 9
+    sum_payments = sum(map(_amount, payments))
+
+    # Unconfirmed inputs the original did not spend are not allowed:
+    candidates = sorted(
+        (u for u in unspents.values() if u.confirmations > 0 and u.effective_value(fee) > 0),
+        key=lambda u: u.effective_value(fee),
+        reverse=True,
+    )
+
+    def required_fee(selected, output_size):
+        vsize = estimate_tx_vsize(selected, output_size)
+        return max(vsize * fee, old_fee + vsize * INCREMENTAL_RELAY_FEE)
+
+    for i in range(len(candidates) + 1):
+        selected = inputs + candidates[:i]
+        available = sum(u.amount for u in selected) - sum_payments
+
+        remaining = available - required_fee(selected, payment_size + [change_size])
+        if remaining > 0 and remaining >= min_change:
+            change = TxOut(remaining.to_bytes(8, byteorder='little'), change_script)
+            outputs = payments.copy()
+            outputs.insert(len(outputs) if change_index is None else change_index, change)
+            return selected, outputs
+
+        if available >= required_fee(selected, payment_size):
+            return selected, payments
+
+    raise InsufficientFunds(
+        'Balance {} cannot pay the outputs of {} satoshi and the replacement fee.'.format(
+            sum(u.amount for u in inputs + candidates), sum_payments
+        )
+    )
+
+
+def plan_cpfp(tx, unspents, fee, leftover, *, min_change=0):
+    """Plans a child transaction spending the outputs of ``tx`` among the
+    ``unspents``, e.g. its change, so that both transactions together pay
+    ``fee`` satoshi per byte and miners confirm them as a package
+    (child-pays-for-parent).
+
+    If the outputs of ``tx`` cannot pay the fee, confirmed unspents are added
+    from the largest effective value on. The child pays everything that is
+    left to ``leftover``.
+
+    :param tx: The unconfirmed parent transaction.
+    :type tx: :class:`~bit.transaction.TxObj` or ``str``
+    :param unspents: The UTXOs spent by ``tx``, which determine its fee, the
+                     outputs of ``tx`` to spend, and UTXOs that may be added.
+    :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay for both transactions.
+    :type fee: ``int``
+    :param leftover: The destination of the output of the child.
+    :type leftover: ``str``
+    :raises ValueError: If no output of ``tx`` is among the unspents or an
+                        unspent it spends is missing.
+    :raises InsufficientFunds: If the unspents cannot pay the fee.
+    :returns: The unspents and outputs of the child transaction, to be signed
+              by :func:`~bit.transaction.create_new_transaction`.
+    :rtype: ``tuple``
+    """
+    if not isinstance(tx, TxObj):
+        tx = deserialize(tx)
+
+    txid = bytes_to_hex(double_sha256(tx.legacy_repr())[::-1])
+    parent_vsize = math.ceil((3 * len(tx.legacy_repr()) + len(bytes(tx))) / 4)
+
+    unspents = {(u.txid, u.txindex): u for u in unspents}
+    parent_fee = sum(u.amount for u in _pop_spent(tx, unspents)) - sum(map(_amount, tx.TxOut))
+
+    inputs = [unspents.pop(outpoint) for outpoint in list(unspents) if outpoint[0] == txid]
+    if not inputs:
+        raise ValueError('No output of the transaction is among the unspents.')
+
+    candidates = sorted(
+        (u for u in unspents.values() if u.confirmations > 0 and u.effective_value(fee) > 0),
+        key=lambda u: u.effective_value(fee),
+        reverse=True,
+    )
+    change_size = len(address_to_scriptpubkey(leftover)) + 9
+
+    for i in range(len(candidates) + 1):
+        selected = inputs + candidates[:i]
+        vsize = estimate_tx_vsize(selected, [change_size])
+        # The child must also pay the relay fee for its own size:
+        child_fee = max((parent_vsize + vsize) * fee - parent_fee, vsize * MIN_RELAY_FEE)
+
+        remaining = sum(u.amount for u in selected) - child_fee
+        if remaining > 0 and remaining >= min_change:
+            return selected, [(leftover, remaining)]
+
+    raise InsufficientFunds(
+        'Balance {} cannot pay the fee of {} satoshi per byte for the transaction and its child.'.format(
+            sum(u.amount for u in inputs + candidates), fee
+        )
+    )
+
+
 def address_to_scriptpubkey(address):
     # Raise ValueError if we cannot identify the address.
     get_version(address)
@@ -472,6 +923,11 @@ def construct_outputs(outputs):
     outputs_obj = []
 
     for data in outputs:
+        # Outputs of existing transactions are kept as they are:
+        if isinstance(data, TxOut):
+            outputs_obj.append(data)
+            continue
+
         dest, amount = data
 
         # P2PKH/P2SH/Bech32
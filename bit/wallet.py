@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from bit.crypto import ECPrivateKey, ripemd160_sha256, sha256
 from bit.curve import Point
@@ -13,18 +14,24 @@ from bit.format import (
     multisig_to_segwit_address,
 )
 from bit.network import NetworkAPI, get_fee_cached, satoshi_to_currency_cached
-from bit.network.meta import Unspent
+from bit.network.meta import Unspent, UTXOPool, estimate_input_vsize
+from bit.network.policy import record_transaction
 from bit.transaction import (
     calc_txid,
     create_new_transaction,
     sanitize_tx_data,
+    plan_batches,
+    plan_consolidation,
+    plan_fee_bump,
+    plan_cpfp,
     sign_tx,
     deserialize,
     address_to_scriptpubkey,
+    TxObj,
 )
 from bit.constants import OP_0, OP_PUSH_20, OP_PUSH_32
 
-from bit.utils import hex_to_bytes, bytes_to_hex, int_to_varint
+from bit.utils import hex_to_bytes, bytes_to_hex
 
 
 def wif_to_key(wif):
@@ -166,8 +173,19 @@ class PrivateKey(BaseKey):
 
         self.balance = 0
         self.unspents = []
+        self.pool = UTXOPool()
         self.transactions = []
 
+        # Change is added to the pool even if no unspent of its script was,
+        # leaving the addresses to be cached on first use:
+        address = public_key_to_address(self._public_key, version=self.version)
+        self.pool.watch(
+            bytes_to_hex(address_to_scriptpubkey(address)), 'p2pkh' if self.is_compressed() else 'p2pkh-uncompressed'
+        )
+        if self.is_compressed():
+            segwit_address = public_key_to_segwit_address(self._public_key, version=self.version)
+            self.pool.watch(bytes_to_hex(address_to_scriptpubkey(segwit_address)), 'np2wkh')
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -231,15 +249,18 @@ class PrivateKey(BaseKey):
 
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
-        self.unspents[:] = list(
+        unspents = list(
             map(
                 lambda u: u.set_type('p2pkh' if self.is_compressed() else 'p2pkh-uncompressed'),
                 NetworkAPI.get_unspent(self.address),
             )
         )
         if self.segwit_address:
-            self.unspents += list(map(lambda u: u.set_type('np2wkh'), NetworkAPI.get_unspent(self.segwit_address)))
-        self.balance = sum(unspent.amount for unspent in self.unspents)
+            unspents += list(map(lambda u: u.set_type('np2wkh'), NetworkAPI.get_unspent(self.segwit_address)))
+        with self.pool.lock:
+            self.unspents[:] = unspents
+            self.pool.refresh(unspents)
+            self.balance = sum(unspent.amount for unspent in unspents)
         return self.unspents
 
     def get_transactions(self):
@@ -263,6 +284,7 @@ class PrivateKey(BaseKey):
         unspents=None,
         message_is_hex=False,
         replace_by_fee=False,
+        reserve=False,
     ):  # pragma: no cover
         """Creates a signed P2PKH transaction.
 
@@ -291,15 +313,23 @@ class PrivateKey(BaseKey):
                         each message will be stored in chunks of 40 bytes.
         :type message: ``str``
         :param unspents: The UTXOs to use as the inputs. By default Bit will
-                         communicate with the blockchain itself.
+                         communicate with the blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
+        :param reserve: Whether to reserve the selected UTXOs in ``pool``, so
+                        that concurrent transactions do not spend them. The
+                        reservation expires after
+                        :attr:`~bit.network.meta.UTXOPool.reservation_time`
+                        seconds. UTXOs reserved by others are always skipped.
+        :type reserve: ``bool``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
         try:
-            unspents = unspents or self.get_unspents()
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
         except ConnectionError:
             raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
 
@@ -317,8 +347,196 @@ class PrivateKey(BaseKey):
             version=self.version,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            pool=self.pool,
+            reserve=reserve,
+        )
+
+        try:
+            return create_new_transaction(self, unspents, outputs)
+        except BaseException:
+            if reserve:
+                self.pool.release(unspents)
+            raise
+
+    def create_batched_transactions(
+        self, outputs, fee=None, leftover=None, unspents=None, replace_by_fee=False
+    ):  # pragma: no cover
+        """Creates as few signed P2PKH transactions as possible paying all
+        outputs, each staying below the standardness limit of 100 kvB. See
+        :func:`~bit.transaction.plan_batches`.
+
+        :param outputs: A sequence of outputs you wish to send in the form
+                        ``(destination, amount, currency)``.
+        :type outputs: ``list`` of ``tuple``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the change of each
+                         transaction. By default Bit will send any change to
+                         the same address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to use as the inputs. By default Bit will
+                         communicate with the blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_batches(
+            outputs,
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
+        )
+
+        return [create_new_transaction(self, unspents, outputs) for unspents, outputs in batches]
+
+    def create_consolidation_transactions(
+        self, fee=None, leftover=None, unspents=None, economical=False, replace_by_fee=False, max_workers=None
+    ):  # pragma: no cover
+        """Creates signed P2PKH transactions spending the unspents to a single
+        output, split so that each stays below the standardness limit of
+        100 kvB. The transactions are signed in parallel. See
+        :func:`~bit.transaction.plan_consolidation`.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         amounts. By default Bit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to consolidate. By default Bit will
+                         communicate with the blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param economical: Whether or not to skip unspents whose amount does
+                           not exceed the fee for spending them.
+        :type economical: ``bool``
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :param max_workers: The maximum number of threads signing transactions.
+        :type max_workers: ``int``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_consolidation(
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            economical=economical,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
         )
 
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda batch: create_new_transaction(self, *batch), batches))
+
+    def bump_fee(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction replacing a transaction that
+        opted in for replace-by-fee (BIP 125) with a higher fee. The fee is
+        taken from the change, adding unspents if needed. See
+        :func:`~bit.transaction.plan_fee_bump`.
+
+        Once you broadcast the replacement, apply it to ``pool`` with
+        :func:`~bit.network.meta.UTXOPool.replace_transaction`, as it
+        invalidates the change of ``tx``.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. By default Bit will use the UTXOs that ``pool``
+                         recorded when ``tx`` was sent and the unspents in
+                         ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The signed replacement as hex.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        spent = self.pool.spent_by(tx)
+        unspents = unspents or spent + [u for u in self.pool if not self.pool.is_reserved(u)]
+
+        # The change of the transaction went to the return address of its inputs
+        return_address = self.segwit_address if any([u.segwit for u in spent or unspents]) else self.address
+
+        unspents, outputs = plan_fee_bump(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
+        return create_new_transaction(self, unspents, outputs)
+
+    def create_cpfp_transaction(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction spending the outputs of an
+        unconfirmed transaction paying to this key, so that both transactions
+        together pay ``fee`` (child-pays-for-parent). See
+        :func:`~bit.transaction.plan_cpfp`.
+
+        :param tx: The unconfirmed parent transaction.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay for both
+                    transactions. By default Bit will poll
+                    `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination of the output of the child
+                         transaction. By default Bit will send it to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx``, its outputs to spend and
+                         UTXOs that may be added. By default Bit will use the
+                         UTXOs that ``pool`` recorded when ``tx`` was sent and
+                         the unspents in ``pool``, which include the outputs
+                         of ``tx`` paying to this key.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The signed child transaction as hex.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        unspents = unspents or self.pool.spent_by(tx) + [u for u in self.pool if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_cpfp(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
         return create_new_transaction(self, unspents, outputs)
 
     def send(
@@ -337,6 +555,10 @@ class PrivateKey(BaseKey):
         the blockchain. This accepts the same arguments as
         :func:`~bit.PrivateKey.create_transaction`.
 
+        The selected UTXOs are reserved in ``pool`` until the broadcast fails,
+        so concurrent calls from multiple threads sharing this key never spend
+        the same UTXOs. Use ``combine=False`` to let them succeed side by side.
+
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
                         be either an int, float, or string as long as it is
@@ -362,7 +584,9 @@ class PrivateKey(BaseKey):
                         each message will be stored in chunks of 40 bytes.
         :type message: ``str``
         :param unspents: The UTXOs to use as the inputs. By default Bit will
-                         communicate with the blockchain itself.
+                         communicate with the blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
@@ -380,10 +604,69 @@ class PrivateKey(BaseKey):
             unspents=unspents,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            reserve=True,
         )
+        tx = deserialize(tx_hex)
+
+        try:
+            NetworkAPI.broadcast_tx(tx_hex)
+        except BaseException:
+            # Make the reserved UTXOs available to other transactions again:
+            self.pool.cancel_transaction(tx)
+            raise
+
+        # Learn how fast transactions confirm, see bit.network.policy:
+        record_transaction(tx, unspents or self.pool)
+        # Keep the pool current so that the next transaction needs no refetch:
+        with self.pool.lock:
+            self.pool.apply_transaction(tx)
+            if self.pool.synced:
+                self.unspents[:] = self.pool
+                self.balance = self.pool.balance
+
+        return calc_txid(tx_hex)
+
+    def send_fee_bump(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction replacing ``tx`` with a higher
+        fee and attempts to broadcast it on the blockchain. This accepts the
+        same arguments as :func:`~bit.PrivateKey.bump_fee`.
+
+        Once broadcast, the replacement is applied to ``pool`` in place of
+        ``tx``, whose outputs it invalidates.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. By default Bit will use the UTXOs that ``pool``
+                         recorded when ``tx`` was sent and the unspents in
+                         ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The transaction ID of the replacement.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        tx_hex = self.bump_fee(tx, fee=fee, leftover=leftover, unspents=unspents)
+        replacement = deserialize(tx_hex)
 
         NetworkAPI.broadcast_tx(tx_hex)
 
+        record_transaction(replacement, unspents or self.pool.spent_by(tx) + list(self.pool), replaced=tx)
+        # The change of tx is gone, so later transactions must not chain off it:
+        with self.pool.lock:
+            self.pool.replace_transaction(tx, replacement)
+            if self.pool.synced:
+                self.unspents[:] = self.pool
+                self.balance = self.pool.balance
+
         return calc_txid(tx_hex)
 
     @classmethod
@@ -563,8 +846,19 @@ class PrivateKeyTestnet(BaseKey):
 
         self.balance = 0
         self.unspents = []
+        self.pool = UTXOPool()
         self.transactions = []
 
+        # Change is added to the pool even if no unspent of its script was,
+        # leaving the addresses to be cached on first use:
+        address = public_key_to_address(self._public_key, version=self.version)
+        self.pool.watch(
+            bytes_to_hex(address_to_scriptpubkey(address)), 'p2pkh' if self.is_compressed() else 'p2pkh-uncompressed'
+        )
+        if self.is_compressed():
+            segwit_address = public_key_to_segwit_address(self._public_key, version=self.version)
+            self.pool.watch(bytes_to_hex(address_to_scriptpubkey(segwit_address)), 'np2wkh')
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -628,17 +922,20 @@ class PrivateKeyTestnet(BaseKey):
 
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
-        self.unspents[:] = list(
+        unspents = list(
             map(
                 lambda u: u.set_type('p2pkh' if self.is_compressed() else 'p2pkh-uncompressed'),
                 NetworkAPI.get_unspent_testnet(self.address),
             )
         )
         if self.segwit_address:
-            self.unspents += list(
+            unspents += list(
                 map(lambda u: u.set_type('np2wkh'), NetworkAPI.get_unspent_testnet(self.segwit_address))
             )
-        self.balance = sum(unspent.amount for unspent in self.unspents)
+        with self.pool.lock:
+            self.unspents[:] = unspents
+            self.pool.refresh(unspents)
+            self.balance = sum(unspent.amount for unspent in unspents)
         return self.unspents
 
     def get_transactions(self):
@@ -662,6 +959,7 @@ class PrivateKeyTestnet(BaseKey):
         unspents=None,
         message_is_hex=False,
         replace_by_fee=False,
+        reserve=False,
     ):  # pragma: no cover
         """Creates a signed P2PKH transaction.
 
@@ -690,15 +988,23 @@ class PrivateKeyTestnet(BaseKey):
                         each message will be stored in chunks of 40 bytes.
         :type message: ``str``
         :param unspents: The UTXOs to use as the inputs. By default Bit will
-                         communicate with the testnet blockchain itself.
+                         communicate with the testnet blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
+        :param reserve: Whether to reserve the selected UTXOs in ``pool``, so
+                        that concurrent transactions do not spend them. The
+                        reservation expires after
+                        :attr:`~bit.network.meta.UTXOPool.reservation_time`
+                        seconds. UTXOs reserved by others are always skipped.
+        :type reserve: ``bool``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
         try:
-            unspents = unspents or self.get_unspents()
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
         except ConnectionError:
             raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
 
@@ -716,8 +1022,196 @@ class PrivateKeyTestnet(BaseKey):
             version=self.version,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            pool=self.pool,
+            reserve=reserve,
+        )
+
+        try:
+            return create_new_transaction(self, unspents, outputs)
+        except BaseException:
+            if reserve:
+                self.pool.release(unspents)
+            raise
+
+    def create_batched_transactions(
+        self, outputs, fee=None, leftover=None, unspents=None, replace_by_fee=False
+    ):  # pragma: no cover
+        """Creates as few signed P2PKH transactions as possible paying all
+        outputs, each staying below the standardness limit of 100 kvB. See
+        :func:`~bit.transaction.plan_batches`.
+
+        :param outputs: A sequence of outputs you wish to send in the form
+                        ``(destination, amount, currency)``.
+        :type outputs: ``list`` of ``tuple``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the change of each
+                         transaction. By default Bit will send any change to
+                         the same address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to use as the inputs. By default Bit will
+                         communicate with the testnet blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_batches(
+            outputs,
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
+        )
+
+        return [create_new_transaction(self, unspents, outputs) for unspents, outputs in batches]
+
+    def create_consolidation_transactions(
+        self, fee=None, leftover=None, unspents=None, economical=False, replace_by_fee=False, max_workers=None
+    ):  # pragma: no cover
+        """Creates signed P2PKH transactions spending the unspents to a single
+        output, split so that each stays below the standardness limit of
+        100 kvB. The transactions are signed in parallel. See
+        :func:`~bit.transaction.plan_consolidation`.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         amounts. By default Bit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to consolidate. By default Bit will
+                         communicate with the blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param economical: Whether or not to skip unspents whose amount does
+                           not exceed the fee for spending them.
+        :type economical: ``bool``
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :param max_workers: The maximum number of threads signing transactions.
+        :type max_workers: ``int``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or (list(self.pool) if self.pool.fresh else self.get_unspents())
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_consolidation(
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            economical=economical,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
         )
 
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda batch: create_new_transaction(self, *batch), batches))
+
+    def bump_fee(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction replacing a transaction that
+        opted in for replace-by-fee (BIP 125) with a higher fee. The fee is
+        taken from the change, adding unspents if needed. See
+        :func:`~bit.transaction.plan_fee_bump`.
+
+        Once you broadcast the replacement, apply it to ``pool`` with
+        :func:`~bit.network.meta.UTXOPool.replace_transaction`, as it
+        invalidates the change of ``tx``.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. By default Bit will use the UTXOs that ``pool``
+                         recorded when ``tx`` was sent and the unspents in
+                         ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The signed replacement as hex.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        spent = self.pool.spent_by(tx)
+        unspents = unspents or spent + [u for u in self.pool if not self.pool.is_reserved(u)]
+
+        # The change of the transaction went to the return address of its inputs
+        return_address = self.segwit_address if any([u.segwit for u in spent or unspents]) else self.address
+
+        unspents, outputs = plan_fee_bump(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
+        return create_new_transaction(self, unspents, outputs)
+
+    def create_cpfp_transaction(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction spending the outputs of an
+        unconfirmed transaction paying to this key, so that both transactions
+        together pay ``fee`` (child-pays-for-parent). See
+        :func:`~bit.transaction.plan_cpfp`.
+
+        :param tx: The unconfirmed parent transaction.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay for both
+                    transactions. By default Bit will poll
+                    `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination of the output of the child
+                         transaction. By default Bit will send it to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx``, its outputs to spend and
+                         UTXOs that may be added. By default Bit will use the
+                         UTXOs that ``pool`` recorded when ``tx`` was sent and
+                         the unspents in ``pool``, which include the outputs
+                         of ``tx`` paying to this key.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The signed child transaction as hex.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        unspents = unspents or self.pool.spent_by(tx) + [u for u in self.pool if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_cpfp(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
         return create_new_transaction(self, unspents, outputs)
 
     def send(
@@ -736,6 +1230,10 @@ class PrivateKeyTestnet(BaseKey):
         the testnet blockchain. This accepts the same arguments as
         :func:`~bit.PrivateKeyTestnet.create_transaction`.
 
+        The selected UTXOs are reserved in ``pool`` until the broadcast fails,
+        so concurrent calls from multiple threads sharing this key never spend
+        the same UTXOs. Use ``combine=False`` to let them succeed side by side.
+
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
                         be either an int, float, or string as long as it is
@@ -761,7 +1259,9 @@ class PrivateKeyTestnet(BaseKey):
                         each message will be stored in chunks of 40 bytes.
         :type message: ``str``
         :param unspents: The UTXOs to use as the inputs. By default Bit will
-                         communicate with the testnet blockchain itself.
+                         communicate with the testnet blockchain itself, or use the
+                         unspents in ``pool`` if they were fetched within
+                         :attr:`~bit.network.meta.UTXOPool.max_age` seconds.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
@@ -779,10 +1279,69 @@ class PrivateKeyTestnet(BaseKey):
             unspents=unspents,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            reserve=True,
         )
+        tx = deserialize(tx_hex)
+
+        try:
+            NetworkAPI.broadcast_tx_testnet(tx_hex)
+        except BaseException:
+            # Make the reserved UTXOs available to other transactions again:
+            self.pool.cancel_transaction(tx)
+            raise
+
+        # Learn how fast transactions confirm, see bit.network.policy:
+        record_transaction(tx, unspents or self.pool, testnet=True)
+        # Keep the pool current so that the next transaction needs no refetch:
+        with self.pool.lock:
+            self.pool.apply_transaction(tx)
+            if self.pool.synced:
+                self.unspents[:] = self.pool
+                self.balance = self.pool.balance
+
+        return calc_txid(tx_hex)
+
+    def send_fee_bump(self, tx, fee=None, leftover=None, unspents=None):  # pragma: no cover
+        """Creates a signed P2PKH transaction replacing ``tx`` with a higher
+        fee and attempts to broadcast it on the blockchain. This accepts the
+        same arguments as :func:`~bit.PrivateKeyTestnet.bump_fee`.
+
+        Once broadcast, the replacement is applied to ``pool`` in place of
+        ``tx``, whose outputs it invalidates.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. By default Bit will use the UTXOs that ``pool``
+                         recorded when ``tx`` was sent and the unspents in
+                         ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :returns: The transaction ID of the replacement.
+        :rtype: ``str``
+        """
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+        tx_hex = self.bump_fee(tx, fee=fee, leftover=leftover, unspents=unspents)
+        replacement = deserialize(tx_hex)
 
         NetworkAPI.broadcast_tx_testnet(tx_hex)
 
+        record_transaction(replacement, unspents or self.pool.spent_by(tx) + list(self.pool), testnet=True, replaced=tx)
+        # The change of tx is gone, so later transactions must not chain off it:
+        with self.pool.lock:
+            self.pool.replace_transaction(tx, replacement)
+            if self.pool.synced:
+                self.unspents[:] = self.pool
+                self.balance = self.pool.balance
+
         return calc_txid(tx_hex)
 
     @classmethod
@@ -989,8 +1548,25 @@ class MultiSig:
 
         self.balance = 0
         self.unspents = []
+        self.pool = UTXOPool()
         self.transactions = []
 
+        # Change is added to the pool even if no unspent of its script was,
+        # leaving the addresses to be cached on first use:
+        address = multisig_to_address(self.public_keys, self.m, version=self.version)
+        self.pool.watch(
+            bytes_to_hex(address_to_scriptpubkey(address)),
+            'p2sh',
+            estimate_input_vsize('p2sh', self.m, redeemscript_size=len(self.redeemscript)),
+        )
+        if self.is_compressed:
+            segwit_address = multisig_to_segwit_address(self.public_keys, self.m, version=self.version)
+            self.pool.watch(
+                bytes_to_hex(address_to_scriptpubkey(segwit_address)),
+                'np2wsh',
+                estimate_input_vsize('np2wsh', self.m, redeemscript_size=len(self.redeemscript)),
+            )
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -1062,19 +1638,18 @@ class MultiSig:
 
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
-        # P2SH size: OP_00 + m * <SIG> + <redeemScript>:
-        p2sh_size = 1 + self.m * 74 + len(int_to_varint(len(self.redeemscript))) + len(self.redeemscript)
-        # Adding outpoint size, scriptSig size and sequence size:
-        add_p2sh_vsize = 36 + len(int_to_varint(p2sh_size)) + p2sh_size + 4
-        # Converting to vSize for Segwit: outpoint size + scriptSig size + witness vSize:
-        add_np2wsh_vsize = 36 + 40 + (1 + p2sh_size) / 4
+        add_p2sh_vsize = estimate_input_vsize('p2sh', self.m, redeemscript_size=len(self.redeemscript))
+        add_np2wsh_vsize = estimate_input_vsize('np2wsh', self.m, redeemscript_size=len(self.redeemscript))
 
-        self.unspents[:] = list(map(lambda u: u.set_type('p2sh', add_p2sh_vsize), NetworkAPI.get_unspent(self.address)))
+        unspents = list(map(lambda u: u.set_type('p2sh', add_p2sh_vsize), NetworkAPI.get_unspent(self.address)))
         if self.segwit_address:
-            self.unspents += list(
+            unspents += list(
                 map(lambda u: u.set_type('np2wsh', add_np2wsh_vsize), NetworkAPI.get_unspent(self.segwit_address))
             )
-        self.balance = sum(unspent.amount for unspent in self.unspents)
+        with self.pool.lock:
+            self.unspents[:] = unspents
+            self.pool.refresh(unspents)
+            self.balance = sum(unspent.amount for unspent in unspents)
         return self.unspents
 
     def get_transactions(self):
@@ -1098,6 +1673,7 @@ class MultiSig:
         unspents=None,
         message_is_hex=False,
         replace_by_fee=False,
+        reserve=False,
     ):  # pragma: no cover
         """Creates a signed P2SH transaction.
 
@@ -1130,6 +1706,12 @@ class MultiSig:
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
+        :param reserve: Whether to reserve the selected UTXOs in ``pool``, so
+                        that concurrent transactions do not spend them. The
+                        reservation expires after
+                        :attr:`~bit.network.meta.UTXOPool.reservation_time`
+                        seconds. UTXOs reserved by others are always skipped.
+        :type reserve: ``bool``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
@@ -1152,8 +1734,188 @@ class MultiSig:
             version=self.version,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            pool=self.pool,
+            reserve=reserve,
+        )
+
+        try:
+            return create_new_transaction(self, unspents, outputs)
+        except BaseException:
+            if reserve:
+                self.pool.release(unspents)
+            raise
+
+    def create_batched_transactions(
+        self, outputs, fee=None, leftover=None, unspents=None, replace_by_fee=False
+    ):  # pragma: no cover
+        """Creates as few signed P2SH transactions as possible paying all
+        outputs, each staying below the standardness limit of 100 kvB. See
+        :func:`~bit.transaction.plan_batches`.
+
+        :param outputs: A sequence of outputs you wish to send in the form
+                        ``(destination, amount, currency)``.
+        :type outputs: ``list`` of ``tuple``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the change of each
+                         transaction. By default Bit will send any change to
+                         the same address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to use as the inputs. By default Bit will
+                         communicate with the blockchain itself.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or self.get_unspents()
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_batches(
+            outputs,
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
         )
 
+        return [create_new_transaction(self, unspents, outputs) for unspents, outputs in batches]
+
+    def create_consolidation_transactions(
+        self, fee=None, leftover=None, unspents=None, economical=False, replace_by_fee=False, max_workers=None
+    ):  # pragma: no cover
+        """Creates signed P2SH transactions spending the unspents to a single
+        output, split so that each stays below the standardness limit of
+        100 kvB. The transactions are signed in parallel. See
+        :func:`~bit.transaction.plan_consolidation`.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         amounts. By default Bit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to consolidate. By default Bit will
+                         communicate with the blockchain itself.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param economical: Whether or not to skip unspents whose amount does
+                           not exceed the fee for spending them.
+        :type economical: ``bool``
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :param max_workers: The maximum number of threads signing transactions.
+        :type max_workers: ``int``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or self.get_unspents()
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_consolidation(
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            economical=economical,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
+        )
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda batch: create_new_transaction(self, *batch), batches))
+
+    def bump_fee(self, tx, fee=None, leftover=None, unspents=None):
+        """Creates a signed P2SH transaction replacing a transaction that
+        opted in for replace-by-fee (BIP 125) with a higher fee. The fee is
+        taken from the change, adding unspents if needed. See
+        :func:`~bit.transaction.plan_fee_bump`.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. Required, as transactions of multisig keys
+                         are not recorded in ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :raises ValueError: If no unspents are given.
+        :returns: The signed replacement as hex.
+        :rtype: ``str``
+        """
+        if not unspents:
+            raise ValueError('The unspents spent by the transaction must be given.')
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+
+        # The change of the transaction went to the return address of its inputs
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_fee_bump(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
+        return create_new_transaction(self, unspents, outputs)
+
+    def create_cpfp_transaction(self, tx, fee=None, leftover=None, unspents=None):
+        """Creates a signed P2SH transaction spending the outputs of an
+        unconfirmed transaction paying to this key, so that both transactions
+        together pay ``fee`` (child-pays-for-parent). See
+        :func:`~bit.transaction.plan_cpfp`.
+
+        :param tx: The unconfirmed parent transaction.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay for both
+                    transactions. By default Bit will poll
+                    `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination of the output of the child
+                         transaction. By default Bit will send it to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx``, its outputs to spend and
+                         UTXOs that may be added. Required, as transactions
+                         of multisig keys are not recorded in ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :raises ValueError: If no unspents are given.
+        :returns: The signed child transaction as hex.
+        :rtype: ``str``
+        """
+        if not unspents:
+            raise ValueError('The unspents spent by the transaction must be given.')
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_cpfp(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
         return create_new_transaction(self, unspents, outputs)
 
     @classmethod
@@ -1312,8 +2074,25 @@ class MultiSigTestnet:
 
         self.balance = 0
         self.unspents = []
+        self.pool = UTXOPool()
         self.transactions = []
 
+        # Change is added to the pool even if no unspent of its script was,
+        # leaving the addresses to be cached on first use:
+        address = multisig_to_address(self.public_keys, self.m, version=self.version)
+        self.pool.watch(
+            bytes_to_hex(address_to_scriptpubkey(address)),
+            'p2sh',
+            estimate_input_vsize('p2sh', self.m, redeemscript_size=len(self.redeemscript)),
+        )
+        if self.is_compressed:
+            segwit_address = multisig_to_segwit_address(self.public_keys, self.m, version=self.version)
+            self.pool.watch(
+                bytes_to_hex(address_to_scriptpubkey(segwit_address)),
+                'np2wsh',
+                estimate_input_vsize('np2wsh', self.m, redeemscript_size=len(self.redeemscript)),
+            )
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -1385,24 +2164,23 @@ class MultiSigTestnet:
 
         :rtype: ``list`` of :class:`~bit.network.meta.Unspent`
         """
-        # P2SH size: OP_00 + m * <SIG> + <redeemScript>:
-        p2sh_size = 1 + self.m * 74 + len(int_to_varint(len(self.redeemscript))) + len(self.redeemscript)
-        # Adding outpoint size, scriptSig size and sequence size:
-        add_p2sh_vsize = 36 + len(int_to_varint(p2sh_size)) + p2sh_size + 4
-        # Converting to vSize for Segwit: outpoint size + scriptSig size + witness vSize
-        add_np2wsh_vsize = 36 + 40 + (1 + p2sh_size) / 4
+        add_p2sh_vsize = estimate_input_vsize('p2sh', self.m, redeemscript_size=len(self.redeemscript))
+        add_np2wsh_vsize = estimate_input_vsize('np2wsh', self.m, redeemscript_size=len(self.redeemscript))
 
-        self.unspents[:] = list(
+        unspents = list(
             map(lambda u: u.set_type('p2sh', add_p2sh_vsize), NetworkAPI.get_unspent_testnet(self.address))
         )
         if self.segwit_address:
-            self.unspents += list(
+            unspents += list(
                 map(
                     lambda u: u.set_type('np2wsh', add_np2wsh_vsize),
                     NetworkAPI.get_unspent_testnet(self.segwit_address),
                 )
             )
-        self.balance = sum(unspent.amount for unspent in self.unspents)
+        with self.pool.lock:
+            self.unspents[:] = unspents
+            self.pool.refresh(unspents)
+            self.balance = sum(unspent.amount for unspent in unspents)
         return self.unspents
 
     def get_transactions(self):
@@ -1426,6 +2204,7 @@ class MultiSigTestnet:
         unspents=None,
         message_is_hex=False,
         replace_by_fee=False,
+        reserve=False,
     ):  # pragma: no cover
         """Creates a signed P2SH transaction.
 
@@ -1458,6 +2237,12 @@ class MultiSigTestnet:
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
         :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
         :type replace_by_fee: ``bool``
+        :param reserve: Whether to reserve the selected UTXOs in ``pool``, so
+                        that concurrent transactions do not spend them. The
+                        reservation expires after
+                        :attr:`~bit.network.meta.UTXOPool.reservation_time`
+                        seconds. UTXOs reserved by others are always skipped.
+        :type reserve: ``bool``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
@@ -1480,8 +2265,188 @@ class MultiSigTestnet:
             version=self.version,
             message_is_hex=message_is_hex,
             replace_by_fee=replace_by_fee,
+            pool=self.pool,
+            reserve=reserve,
+        )
+
+        try:
+            return create_new_transaction(self, unspents, outputs)
+        except BaseException:
+            if reserve:
+                self.pool.release(unspents)
+            raise
+
+    def create_batched_transactions(
+        self, outputs, fee=None, leftover=None, unspents=None, replace_by_fee=False
+    ):  # pragma: no cover
+        """Creates as few signed P2SH transactions as possible paying all
+        outputs, each staying below the standardness limit of 100 kvB. See
+        :func:`~bit.transaction.plan_batches`.
+
+        :param outputs: A sequence of outputs you wish to send in the form
+                        ``(destination, amount, currency)``.
+        :type outputs: ``list`` of ``tuple``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the change of each
+                         transaction. By default Bit will send any change to
+                         the same address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to use as the inputs. By default Bit will
+                         communicate with the testnet blockchain itself.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or self.get_unspents()
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_batches(
+            outputs,
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
+        )
+
+        return [create_new_transaction(self, unspents, outputs) for unspents, outputs in batches]
+
+    def create_consolidation_transactions(
+        self, fee=None, leftover=None, unspents=None, economical=False, replace_by_fee=False, max_workers=None
+    ):  # pragma: no cover
+        """Creates signed P2SH transactions spending the unspents to a single
+        output, split so that each stays below the standardness limit of
+        100 kvB. The transactions are signed in parallel. See
+        :func:`~bit.transaction.plan_consolidation`.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         amounts. By default Bit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs to consolidate. By default Bit will
+                         communicate with the blockchain itself.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param economical: Whether or not to skip unspents whose amount does
+                           not exceed the fee for spending them.
+        :type economical: ``bool``
+        :param replace_by_fee: Whether to opt-in for replace-by-fee (BIP 125).
+        :type replace_by_fee: ``bool``
+        :param max_workers: The maximum number of threads signing transactions.
+        :type max_workers: ``int``
+        :returns: The signed transactions as hex.
+        :rtype: ``list`` of ``str``
+        """
+        try:
+            unspents = unspents or self.get_unspents()
+        except ConnectionError:
+            raise ConnectionError('All APIs are unreachable. Please provide the unspents to spend from directly.')
+
+        unspents = [u for u in unspents if not self.pool.is_reserved(u)]
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        batches = plan_consolidation(
+            unspents,
+            fee or get_fee_cached(),
+            leftover or return_address,
+            economical=economical,
+            version=self.version,
+            replace_by_fee=replace_by_fee,
         )
 
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda batch: create_new_transaction(self, *batch), batches))
+
+    def bump_fee(self, tx, fee=None, leftover=None, unspents=None):
+        """Creates a signed P2SH transaction replacing a transaction that
+        opted in for replace-by-fee (BIP 125) with a higher fee. The fee is
+        taken from the change, adding unspents if needed. See
+        :func:`~bit.transaction.plan_fee_bump`.
+
+        :param tx: The transaction to replace.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Bit will poll `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that received the change of ``tx``.
+                         By default Bit assumes the same address you sent
+                         from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx`` and those that may be
+                         added. Required, as transactions of multisig keys
+                         are not recorded in ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :raises ValueError: If no unspents are given.
+        :returns: The signed replacement as hex.
+        :rtype: ``str``
+        """
+        if not unspents:
+            raise ValueError('The unspents spent by the transaction must be given.')
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+
+        # The change of the transaction went to the return address of its inputs
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_fee_bump(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
+        return create_new_transaction(self, unspents, outputs)
+
+    def create_cpfp_transaction(self, tx, fee=None, leftover=None, unspents=None):
+        """Creates a signed P2SH transaction spending the outputs of an
+        unconfirmed transaction paying to this key, so that both transactions
+        together pay ``fee`` (child-pays-for-parent). See
+        :func:`~bit.transaction.plan_cpfp`.
+
+        :param tx: The unconfirmed parent transaction.
+        :type tx: :class:`~bit.transaction.TxObj` or ``str``
+        :param fee: The number of satoshi per byte to pay for both
+                    transactions. By default Bit will poll
+                    `<https://mempool.space/api/v1/fees/recommended>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon
+                    as possible.
+        :type fee: ``int``
+        :param leftover: The destination of the output of the child
+                         transaction. By default Bit will send it to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param unspents: The UTXOs spent by ``tx``, its outputs to spend and
+                         UTXOs that may be added. Required, as transactions
+                         of multisig keys are not recorded in ``pool``.
+        :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :raises ValueError: If no unspents are given.
+        :returns: The signed child transaction as hex.
+        :rtype: ``str``
+        """
+        if not unspents:
+            raise ValueError('The unspents spent by the transaction must be given.')
+        tx = tx if isinstance(tx, TxObj) else deserialize(tx)
+
+        # If at least one input is from segwit the return address is for segwit
+        return_address = self.segwit_address if any([u.segwit for u in unspents]) else self.address
+
+        unspents, outputs = plan_cpfp(tx, unspents, fee or get_fee_cached(), leftover or return_address)
+
         return create_new_transaction(self, unspents, outputs)
 
     @classmethod
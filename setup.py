@@ -43,8 +43,10 @@ setup(
 
     install_requires=('coincurve>=4.3.0', 'requests'),
     extras_require={
+        'async': ('aiohttp', ),
         'cli': ('appdirs', 'click', 'privy', 'tinydb'),
         'cache': ('lmdb', ),
+        'stream': ('websocket-client', ),
     },
     tests_require=['pytest', 'requests_mock'],
 
@@ -0,0 +1,391 @@
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from bit.network.aio import (
+    AsyncBitcoreAPI,
+    AsyncBlockchainAPI,
+    AsyncBlockchairAPI,
+    AsyncBlockstreamAPI,
+    AsyncNetworkAPI,
+    AsyncSmartbitAPI,
+)
+from bit.network.meta import Unspent
+from bit.network.services import TIP_HEIGHTS, set_tip_height
+
+ADDRESS = '1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2'
+SCRIPT = '76a91477bff20c60e522dfaa3350c39b030a5d004e839a88ac'
+TXIDS = ['{:064x}'.format(i) for i in range(2500)]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.server.requests.append(url.path)
+        route = self.server.routes.get(url.path)
+        status, body = route(parse_qs(url.query)) if callable(route) else route or (404, '')
+        body = body if isinstance(body, str) else json.dumps(body)
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.routes = routes
+        self.requests = []
+        self.url = 'http://127.0.0.1:{}/'.format(self.server_port)
+        Thread(target=self.serve_forever, daemon=True).start()
+
+
+def blockchair_page(query):
+    offset, limit = int(query.get('offset', ['0'])[0]), int(query.get('limit', ['1000'])[0])
+    return (
+        200,
+        {
+            'context': {'state': 700000},
+            'data': {
+                ADDRESS: {
+                    'address': {
+                        'balance': 5000,
+                        'script_hex': SCRIPT,
+                        'transaction_count': len(TXIDS),
+                        'unspent_output_count': len(TXIDS),
+                    },
+                    'transactions': TXIDS[offset : offset + limit],
+                    'utxo': [
+                        {'value': i, 'block_id': 699991, 'transaction_hash': txid, 'index': 0}
+                        for i, txid in enumerate(TXIDS[offset : offset + limit])
+                    ],
+                }
+            },
+        },
+    )
+
+
+def stand_in_providers(server):
+    class Blockchair(AsyncBlockchairAPI):
+        MAIN_ADDRESS_API = server.url + 'chair/address/{}'
+        MAIN_TX_API = server.url + 'chair/tx/{}'
+        MAIN_TX_PUSH_API = server.url + 'chair/push'
+
+    class Blockstream(AsyncBlockstreamAPI):
+        MAIN_ENDPOINT = server.url + 'stream/'
+        MAIN_ADDRESS_API = MAIN_ENDPOINT + 'address/{}'
+        MAIN_TX_API = MAIN_ENDPOINT + 'tx/{}/hex'
+        MAIN_TX_PUSH_API = MAIN_ENDPOINT + 'tx'
+
+    return Blockchair, Blockstream
+
+
+def more_stand_in_providers(server):
+    class Bitcore(AsyncBitcoreAPI):
+        MAIN_BALANCE_API = server.url + 'core/address/{}/balance'
+        MAIN_UNSPENT_API = server.url + 'core/address/{}/?unspent=true'
+
+    class Smartbit(AsyncSmartbitAPI):
+        MAIN_ADDRESS_API = server.url + 'smart/address/{}'
+        MAIN_UNSPENT_API = MAIN_ADDRESS_API + '/unspent'
+
+    class Blockchain(AsyncBlockchainAPI):
+        ADDRESS_API = server.url + 'info/address/{}?format=json'
+        UNSPENT_API = server.url + 'info/unspent'
+
+    return Bitcore, Smartbit, Blockchain
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncNetworkAPI:
+    def setup_method(self):
+        self.server = StandInServer({})
+        self.blockchair, self.blockstream = stand_in_providers(self.server)
+        for tip in TIP_HEIGHTS.values():
+            tip.value, tip.last_update = None, 0
+
+    def teardown_method(self):
+        self.server.shutdown()
+        for tip in TIP_HEIGHTS.values():
+            tip.value, tip.last_update = None, 0
+
+    def providers(self, name, *providers):
+        return mock.patch.object(AsyncNetworkAPI, name, [getattr(p, name.lower()[:-5]) for p in providers])
+
+    def test_requires_context(self):
+        with pytest.raises(RuntimeError):
+            run(AsyncNetworkAPI().get_balance(ADDRESS))
+
+    def test_get_balance_falls_back(self):
+        self.server.routes['/stream/address/{}'.format(ADDRESS)] = (
+            200,
+            {
+                'chain_stats': {'funded_txo_sum': 10000, 'spent_txo_sum': 4000},
+                'mempool_stats': {'funded_txo_sum': 500, 'spent_txo_sum': 0},
+            },
+        )
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_balance(ADDRESS)
+
+        with self.providers('GET_BALANCE_MAIN', self.blockchair, self.blockstream):
+            assert run(lookup()) == 6500
+
+        assert self.server.requests == ['/chair/address/{}'.format(ADDRESS), '/stream/address/{}'.format(ADDRESS)]
+
+    def test_all_unreachable(self):
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_balance(ADDRESS)
+
+        with self.providers('GET_BALANCE_MAIN', self.blockchair, self.blockstream):
+            with pytest.raises(ConnectionError):
+                run(lookup())
+
+    def test_concurrent_lookups(self):
+        self.server.routes['/chair/address/{}'.format(ADDRESS)] = blockchair_page
+
+        async def lookup():
+            async with AsyncNetworkAPI(connections=10) as api:
+                return await asyncio.gather(*(api.get_balance(ADDRESS) for _ in range(100)))
+
+        with self.providers('GET_BALANCE_MAIN', self.blockchair):
+            assert run(lookup()) == [5000] * 100
+
+    def test_get_transactions_pages(self):
+        self.server.routes['/chair/address/{}'.format(ADDRESS)] = blockchair_page
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_transactions(ADDRESS)
+
+        with self.providers('GET_TRANSACTIONS_MAIN', self.blockchair):
+            assert run(lookup()) == TXIDS
+
+        assert len(self.server.requests) == 3
+
+    def test_get_unspent_pages(self):
+        self.server.routes['/chair/address/{}'.format(ADDRESS)] = blockchair_page
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_unspent(ADDRESS)
+
+        with self.providers('GET_UNSPENT_MAIN', self.blockchair):
+            unspents = run(lookup())
+
+        assert unspents[1] == Unspent(1, 10, SCRIPT, TXIDS[1], 0)
+        assert [u.txid for u in unspents] == TXIDS
+
+    def test_blockstream_unspent(self):
+        self.server.routes['/stream/blocks/tip/height'] = (200, '700000')
+        self.server.routes['/stream/address/{}/utxo'.format(ADDRESS)] = (
+            200,
+            [
+                {'value': 1000, 'txid': TXIDS[0], 'vout': 1, 'status': {'confirmed': True, 'block_height': 699991}},
+                {'value': 2000, 'txid': TXIDS[1], 'vout': 0, 'status': {'confirmed': False}},
+            ],
+        )
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_unspent(ADDRESS)
+
+        with self.providers('GET_UNSPENT_MAIN', self.blockstream):
+            assert run(lookup()) == [Unspent(2000, 0, SCRIPT, TXIDS[1], 0), Unspent(1000, 10, SCRIPT, TXIDS[0], 1)]
+
+        # The tip height is cached and shared with the other providers:
+        assert TIP_HEIGHTS[False].value == 700000
+        set_tip_height(700001)
+        with self.providers('GET_UNSPENT_MAIN', self.blockstream):
+            assert run(lookup())[1].confirmations == 11
+        assert self.server.requests.count('/stream/blocks/tip/height') == 1
+
+    def test_blockstream_transactions(self):
+        chain = '/stream/address/{}/txs/chain/'.format(ADDRESS)
+        self.server.routes['/stream/address/{}/txs/mempool'.format(ADDRESS)] = (200, [{'txid': TXIDS[99]}])
+        self.server.routes[chain] = (200, [{'txid': txid} for txid in TXIDS[:25]])
+        self.server.routes[chain + TXIDS[24]] = (200, [{'txid': txid} for txid in TXIDS[25:30]])
+        self.server.routes[chain + TXIDS[29]] = (200, [])
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_transactions(ADDRESS)
+
+        with self.providers('GET_TRANSACTIONS_MAIN', self.blockstream):
+            assert run(lookup()) == TXIDS[:30] + [TXIDS[99]]
+
+    def test_get_transaction_by_id(self):
+        self.server.routes['/stream/tx/{}/hex'.format(TXIDS[0])] = (200, '0100')
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_transaction_by_id(TXIDS[0])
+
+        with self.providers('GET_TRANSACTION_BY_ID_MAIN', self.blockchair, self.blockstream):
+            # Blockchair answers 404, meaning the transaction is unknown:
+            assert run(lookup()) is None
+
+        with self.providers('GET_TRANSACTION_BY_ID_MAIN', self.blockstream):
+            assert run(lookup()) == '0100'
+
+    def test_broadcast_tx(self):
+        self.server.routes['/stream/tx'] = (200, TXIDS[0])
+
+        async def broadcast():
+            async with AsyncNetworkAPI() as api:
+                await api.broadcast_tx('0100')
+
+        with self.providers('BROADCAST_TX_MAIN', self.blockchair, self.blockstream):
+            run(broadcast())
+
+        assert self.server.requests == ['/chair/push', '/stream/tx']
+
+        with self.providers('BROADCAST_TX_MAIN', self.blockchair):
+            with pytest.raises(ConnectionError):
+                run(broadcast())
+
+
+class TestMoreProviders:
+    def setup_method(self):
+        self.server = StandInServer({})
+        self.bitcore, self.smartbit, self.blockchain = more_stand_in_providers(self.server)
+
+    def teardown_method(self):
+        self.server.shutdown()
+
+    def test_same_services_as_network_api(self):
+        from bit.network import NetworkAPI
+
+        for name in ('GET_BALANCE_MAIN', 'GET_UNSPENT_MAIN', 'BROADCAST_TX_MAIN', 'GET_UNSPENT_TEST'):
+            assert [c.__self__.__name__ for c in getattr(AsyncNetworkAPI, name)] == [
+                'Async' + c.__self__.__name__ for c in getattr(NetworkAPI, name)
+            ]
+
+    def test_bitcore(self):
+        def unspent(query):
+            since = query.get('since', [None])[0]
+            start = 0 if since is None else int(since) + 1
+            return 200, [
+                {
+                    '_id': str(i),
+                    'value': 1000,
+                    'confirmations': 3,
+                    'script': SCRIPT,
+                    'mintTxid': TXIDS[i],
+                    'mintIndex': 0,
+                }
+                for i in range(start, min(start + 2, 3))
+            ]
+
+        self.server.routes['/core/address/{}/balance'.format(ADDRESS)] = (200, {'balance': 3000})
+        self.server.routes['/core/address/{}/'.format(ADDRESS)] = unspent
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_balance(ADDRESS), await api.get_unspent(ADDRESS)
+
+        with mock.patch.object(AsyncNetworkAPI, 'GET_BALANCE_MAIN', [self.bitcore.get_balance]):
+            with mock.patch.object(AsyncNetworkAPI, 'GET_UNSPENT_MAIN', [self.bitcore.get_unspent]):
+                balance, unspents = run(lookup())
+
+        assert balance == 3000
+        assert [u.txid for u in unspents] == TXIDS[:3]
+
+    def test_smartbit(self):
+        def address(query):
+            if query.get('page') == ['2']:
+                return 200, {
+                    'address': {'transactions': [{'txid': TXIDS[1]}], 'transaction_paging': {'next_link': None}}
+                }
+            return (
+                200,
+                {
+                    'address': {
+                        'total': {'balance_int': 7000},
+                        'transactions': [{'txid': TXIDS[0]}],
+                        'transaction_paging': {'next_link': self.smartbit.MAIN_ADDRESS_API.format(ADDRESS) + '?page=2'},
+                    }
+                },
+            )
+
+        self.server.routes['/smart/address/{}'.format(ADDRESS)] = address
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return await api.get_balance(ADDRESS), await api.get_transactions(ADDRESS)
+
+        with mock.patch.object(AsyncNetworkAPI, 'GET_BALANCE_MAIN', [self.smartbit.get_balance]):
+            with mock.patch.object(AsyncNetworkAPI, 'GET_TRANSACTIONS_MAIN', [self.smartbit.get_transactions]):
+                assert run(lookup()) == (7000, TXIDS[:2])
+
+    def test_blockchain(self):
+        def address(query):
+            offset = int(query['offset'][0]) if 'offset' in query else 0
+            return 200, {
+                'final_balance': 9000,
+                'n_tx': 120,
+                'txs': [{'hash': t} for t in TXIDS[offset : min(offset + 50, 120)]],
+            }
+
+        self.server.routes['/info/address/{}'.format(ADDRESS)] = address
+        self.server.routes['/info/unspent'] = (
+            200,
+            {
+                'unspent_outputs': [
+                    {
+                        'value': 1,
+                        'confirmations': 1,
+                        'script': SCRIPT,
+                        'tx_hash_big_endian': TXIDS[0],
+                        'tx_output_n': 0,
+                    },
+                    {
+                        'value': 2,
+                        'confirmations': 2,
+                        'script': SCRIPT,
+                        'tx_hash_big_endian': TXIDS[1],
+                        'tx_output_n': 0,
+                    },
+                ]
+            },
+        )
+
+        async def lookup():
+            async with AsyncNetworkAPI() as api:
+                return (
+                    await api.get_balance(ADDRESS),
+                    await api.get_transactions(ADDRESS),
+                    await api.get_unspent(ADDRESS),
+                )
+
+        with mock.patch.object(AsyncNetworkAPI, 'GET_BALANCE_MAIN', [self.blockchain.get_balance]), mock.patch.object(
+            AsyncNetworkAPI, 'GET_TRANSACTIONS_MAIN', [self.blockchain.get_transactions]
+        ), mock.patch.object(AsyncNetworkAPI, 'GET_UNSPENT_MAIN', [self.blockchain.get_unspent]):
+            balance, transactions, unspents = run(lookup())
+
+        assert balance == 9000
+        assert transactions == TXIDS[:120]
+        assert [u.txid for u in unspents] == [TXIDS[1], TXIDS[0]]
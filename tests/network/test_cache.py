@@ -0,0 +1,279 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from time import sleep
+
+import pytest
+
+from bit.network.cache import (
+    CachedValue,
+    FileStore,
+    LMDBStore,
+    SQLiteStore,
+    TransactionCache,
+    calc_wtxid,
+    set_cache_store,
+)
+from bit.transaction import calc_txid
+from tests.test_transaction import FINAL_TX_1, FINAL_TX_SEGWIT
+
+TXID_1 = 'e6922a6e3f1ff422113f15543fbe1340a727441202f55519640a70ac4636c16f'
+
+
+class Fetch:
+    def __init__(self, values, delay=0):
+        self.values = list(values)
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        sleep(self.delay)
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+class TestCachedValue:
+    def test_get(self):
+        fetch = Fetch([1, 2])
+        cached = CachedValue(fetch)
+
+        assert cached.get(60) == 1
+        assert cached.get(60) == 1
+        assert fetch.calls == 1
+
+        assert cached.get(0) == 2
+        assert fetch.calls == 2
+
+    def test_keeps_value_on_error(self):
+        fetch = Fetch([ConnectionError(), 1, ConnectionError()])
+        cached = CachedValue(fetch, (ConnectionError,))
+
+        assert cached.get(0) is None
+        assert cached.get(0) == 1
+        assert cached.get(0) == 1
+        assert fetch.calls == 3
+
+    def test_no_retry_after_failure(self):
+        fetch = Fetch([ConnectionError(), 1])
+        cached = CachedValue(fetch, (ConnectionError,))
+
+        assert cached.get(60) is None
+        assert cached.get(60) is None
+        assert fetch.calls == 1
+
+        cached.last_failure -= 10
+        assert cached.get(60) == 1
+
+    def test_raises_other_errors(self):
+        cached = CachedValue(Fetch([ValueError()]), (ConnectionError,))
+
+        with pytest.raises(ValueError):
+            cached.get(60)
+        assert cached.refreshes == 1
+
+    def test_coalesced_refresh(self):
+        fetch = Fetch([1, 2], delay=0.2)
+        cached = CachedValue(fetch)
+        barrier = Barrier(8)
+
+        def get(_):
+            barrier.wait()
+            return cached.get(60)
+
+        with ThreadPoolExecutor(8) as executor:
+            assert list(executor.map(get, range(8))) == [1] * 8
+        assert fetch.calls == 1
+
+    def test_coalesced_refresh_failure(self):
+        fetch = Fetch([ConnectionError('unreachable')], delay=0.2)
+        cached = CachedValue(fetch)
+        barrier = Barrier(8)
+
+        def get(_):
+            barrier.wait()
+            try:
+                return cached.get(60)
+            except ConnectionError as e:
+                return str(e)
+
+        # Callers that waited on the failed refresh get its error, not None:
+        with ThreadPoolExecutor(8) as executor:
+            assert list(executor.map(get, range(8))) == ['unreachable'] * 8
+        assert fetch.calls == 1
+
+    def test_background_refresh(self):
+        fetch = Fetch([1, 2], delay=0.2)
+        cached = CachedValue(fetch)
+
+        # Without a value the first call blocks:
+        assert cached.get(10, background=True) == 1
+
+        # Not yet close to expiry:
+        assert cached.get(10, background=True) == 1
+        assert fetch.calls == 1
+
+        # Close to expiry the last value is served while refreshing:
+        cached.last_update -= 9
+        assert cached.get(10, background=True) == 1
+        assert cached.get(10, background=True) == 1
+        sleep(0.3)
+        assert cached.get(10, background=True) == 2
+        assert fetch.calls == 2
+
+    def test_background_refresh_failure(self):
+        fetch = Fetch([1, ConnectionError()])
+        cached = CachedValue(fetch, (ConnectionError,))
+
+        assert cached.get(10, background=True) == 1
+        cached.last_update -= 20
+        assert cached.get(10, background=True) == 1
+        sleep(0.1)
+
+        # Failed refreshes are not retried right away:
+        assert cached.get(10, background=True) == 1
+        sleep(0.1)
+        assert fetch.calls == 2
+
+
+class TestFileStore:
+    def test_get_and_set(self, tmp_path):
+        store = FileStore(str(tmp_path / 'cache'))
+        assert store.get('fees') is None
+
+        store.set('fees', {'fastestFee': 10}, 1000.5)
+        assert store.get('fees') == ({'fastestFee': 10}, 1000.5)
+        assert FileStore(str(tmp_path / 'cache')).get('fees') == ({'fastestFee': 10}, 1000.5)
+
+    def test_corrupt(self, tmp_path):
+        store = FileStore(str(tmp_path))
+        (tmp_path / 'fees.json').write_text('{"value": ')
+        assert store.get('fees') is None
+
+
+class TestLMDBStore:
+    def test_get_and_set(self, tmp_path):
+        pytest.importorskip('lmdb')
+
+        store = LMDBStore(str(tmp_path))
+        assert store.get('fees') is None
+
+        store.set('fees', {'fastestFee': 10}, 1000.5)
+        assert store.get('fees') == ({'fastestFee': 10}, 1000.5)
+
+
+class TestSQLiteStore:
+    def test_get_and_set(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / 'cache.db'))
+        assert store.get('fees') is None
+
+        store.set('fees', {'fastestFee': 10}, 1000.5)
+        store.set('fees', {'fastestFee': 20}, 1001.5)
+        assert store.get('fees') == ({'fastestFee': 20}, 1001.5)
+        assert SQLiteStore(str(tmp_path / 'cache.db')).get('fees') == ({'fastestFee': 20}, 1001.5)
+
+    def test_threads(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / 'cache.db'))
+
+        def set_and_get(i):
+            store.set(str(i), i, i)
+            return store.get(str(i))
+
+        with ThreadPoolExecutor(4) as executor:
+            assert list(executor.map(set_and_get, range(20))) == [(i, i) for i in range(20)]
+
+
+class TestTransactionCache:
+    def test_get_and_set(self):
+        cache = TransactionCache()
+        assert cache.get(TXID_1) is None
+
+        assert cache.set(TXID_1.upper(), FINAL_TX_1)
+        assert cache.get(TXID_1) == FINAL_TX_1
+
+    def test_rejects_mismatch(self):
+        cache = TransactionCache()
+
+        assert not cache.set(TXID_1, FINAL_TX_SEGWIT)
+        assert not cache.set(TXID_1, 'not a transaction')
+        # Trailing bytes are not part of the transaction id:
+        assert not cache.set(TXID_1, FINAL_TX_1 + '00')
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TransactionCache(size=1)
+        cache.transactions['a'] = 'tx a'
+        cache.remember('b', 'tx b')
+
+        assert cache.get('a') is None
+        assert cache.get('b') == 'tx b'
+
+        cache = TransactionCache(size=2)
+        cache.remember('a', 'tx a')
+        cache.remember('b', 'tx b')
+        cache.get('a')
+        cache.remember('c', 'tx c')
+        assert list(cache.transactions) == ['a', 'c']
+
+    def test_store(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / 'cache.db'))
+        TransactionCache(store=store).set(TXID_1, FINAL_TX_1)
+
+        # A new process finds the transaction in the store:
+        cache = TransactionCache(store=store)
+        assert cache.get(TXID_1) == FINAL_TX_1
+        assert len(cache) == 1
+
+    def test_store_verified(self, tmp_path):
+        store = FileStore(str(tmp_path))
+        store.set('tx-' + TXID_1, {'hex': FINAL_TX_SEGWIT, 'wtxid': calc_wtxid(FINAL_TX_SEGWIT)}, 0)
+
+        assert TransactionCache(store=store).get(TXID_1) is None
+
+    def test_store_verifies_witness(self, tmp_path):
+        store = FileStore(str(tmp_path))
+        txid = calc_txid(FINAL_TX_SEGWIT)
+        TransactionCache(store=store).set(txid, FINAL_TX_SEGWIT)
+        assert TransactionCache(store=store).get(txid) == FINAL_TX_SEGWIT
+
+        # Corrupting the last byte of the signature keeps the transaction id:
+        witness_end = FINAL_TX_SEGWIT.rindex('01', 0, -8)
+        corrupted = FINAL_TX_SEGWIT[:witness_end] + '02' + FINAL_TX_SEGWIT[witness_end + 2 :]
+        assert calc_txid(corrupted) == txid
+        store.set('tx-' + txid, {'hex': corrupted, 'wtxid': calc_wtxid(FINAL_TX_SEGWIT)}, 0)
+
+        assert TransactionCache(store=store).get(txid) is None
+
+
+class TestPersistentCachedValue:
+    def teardown_method(self):
+        set_cache_store(None)
+
+    def test_shared(self, tmp_path):
+        set_cache_store(FileStore(str(tmp_path)))
+
+        first = CachedValue(Fetch([1]), key='value')
+        assert first.get(60) == 1
+
+        # A new process finds the value in the store:
+        fetch = Fetch([2])
+        second = CachedValue(fetch, key='value')
+        assert second.get(60) == 1
+        assert fetch.calls == 0
+        assert second.last_update == first.last_update
+
+    def test_respects_cache_time(self, tmp_path):
+        store = FileStore(str(tmp_path))
+        store.set('value', 1, 0)
+        set_cache_store(store)
+
+        cached = CachedValue(Fetch([2]), key='value')
+        assert cached.get(60) == 2
+        assert store.get('value')[0] == 2
+
+    def test_without_key(self, tmp_path):
+        set_cache_store(FileStore(str(tmp_path)))
+
+        assert CachedValue(Fetch([1])).get(60) == 1
+        assert list(tmp_path.iterdir()) == []
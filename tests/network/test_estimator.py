@@ -0,0 +1,193 @@
+from unittest import mock
+
+import pytest
+import requests_mock
+
+from bit.network.estimator import FEE_BUCKETS, BlockFeeEstimator
+from bit.network.fees import get_fee_estimates, get_fees, set_fee_estimator
+
+
+def make_block(height, rates, weight=4000000, previous=None):
+    coinbase = {'txid': 'coinbase', 'vin': [{'coinbase': ''}], 'vout': [], 'vsize': 100}
+    txs = [{'fee': rate * 250 / 10 ** 8, 'vsize': 250, 'vin': [], 'vout': []} for rate in rates]
+    return {
+        'hash': 'hash{}'.format(height),
+        'height': height,
+        'previousblockhash': previous or 'hash{}'.format(height - 1),
+        'weight': weight,
+        'tx': [coinbase] + txs,
+    }
+
+
+class FakeNode:
+    def __init__(self, blocks):
+        self.blocks = {block['height']: block for block in blocks}
+
+    def getblockcount(self):
+        return max(self.blocks)
+
+    def getblockhash(self, height):
+        return self.blocks[height]['hash']
+
+    def getblock(self, block_hash, verbosity):
+        assert verbosity == 3
+        return next(block for block in self.blocks.values() if block['hash'] == block_hash)
+
+
+class TestBlockFeeEstimator:
+    def test_block_histogram(self):
+        histogram = BlockFeeEstimator.block_histogram(make_block(1, [1, 1, 10]))
+        assert histogram[0] == 500
+        assert sum(histogram) == 750
+
+    def test_block_histogram_prevouts(self):
+        block = make_block(1, [])
+        block['tx'].append(
+            {
+                'vin': [{'prevout': {'value': 0.0001}}, {'prevout': {'value': 0.0002}}],
+                'vout': [{'value': 0.00029}],
+                'vsize': 100,
+            }
+        )
+        histogram = BlockFeeEstimator.block_histogram(block)
+        # 1000 satoshi for 100 bytes:
+        bucket = next(i for i, vsize in enumerate(histogram) if vsize)
+        assert FEE_BUCKETS[bucket] <= 10 < FEE_BUCKETS[bucket + 1]
+        assert histogram[bucket] == 100
+
+    def test_no_blocks(self):
+        estimator = BlockFeeEstimator()
+        assert estimator.estimate(1) is None
+        with pytest.raises(ConnectionError):
+            estimator.get_fees()
+
+    def test_blocks_not_full(self):
+        estimator = BlockFeeEstimator()
+        estimator.add_blocks([make_block(i, [50] * 20, weight=1000000) for i in range(10)])
+        assert estimator.estimate(1) == 1
+
+    def test_estimates(self):
+        estimator = BlockFeeEstimator()
+        # Every third block only includes fee rates of 100 or more:
+        estimator.add_blocks([make_block(i, [100 if i % 3 == 0 else 20] * 20) for i in range(30)])
+
+        assert 100 <= estimator.estimate(1) <= 105
+        assert 20 <= estimator.estimate(3) <= 21
+        assert estimator.estimate(6) == estimator.estimate(3)
+        assert estimator.estimate(1000) == estimator.estimate(30)
+        assert len(estimator.histograms) == 30
+        assert sum(estimator.histograms[0]) == 30
+        assert sum(estimator.histograms[2]) == 28
+
+    def test_max_blocks(self):
+        estimator = BlockFeeEstimator(max_blocks=5)
+        estimator.add_blocks([make_block(i, [100] * 20) for i in range(10)])
+        estimator.add_blocks([make_block(i, [10] * 20) for i in range(10, 15)])
+
+        assert len(estimator.blocks) == 5
+        assert estimator.height == 14
+        # Estimates pay the upper bound of the bucket from 9.8 to 10.3:
+        assert estimator.estimate(1) == 11
+
+    def test_update_rpc(self):
+        node = FakeNode([make_block(i, [10] * 20) for i in range(200)])
+        estimator = BlockFeeEstimator(node, max_blocks=20)
+
+        estimator.update()
+        estimator.wait()
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(180, 200))
+
+        node.blocks[200] = make_block(200, [10] * 20)
+        estimator.update()
+        assert estimator.height == 200
+        assert len(estimator.blocks) == 20
+
+    def test_update_reorg(self):
+        node = FakeNode([make_block(i, [10] * 20) for i in range(20)])
+        estimator = BlockFeeEstimator(node, max_blocks=10)
+        estimator.update()
+
+        node.blocks[19] = dict(make_block(19, [30] * 20), hash='other19')
+        node.blocks[20] = make_block(20, [30] * 20, previous='other19')
+        estimator.update()
+        estimator.wait()
+
+        assert estimator.blocks[-2][0] == 'other19'
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(11, 21))
+
+    def test_update_seeds_recent_blocks(self):
+        node = FakeNode([make_block(i, [10] * 20) for i in range(200)])
+        node.getblock = mock.Mock(wraps=node.getblock)
+        estimator = BlockFeeEstimator(node, max_blocks=20, seed_blocks=4)
+
+        with mock.patch.object(estimator, '_start_backfill'):
+            estimator.update()
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(196, 200))
+        assert estimator.estimate(1) == 11
+
+        estimator.backfill()
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(180, 200))
+        assert sum(estimator.histograms[0]) == 20
+        assert node.getblock.call_count == 20
+
+    def test_update_after_gap(self):
+        node = FakeNode([make_block(i, [10] * 20) for i in range(20)])
+        estimator = BlockFeeEstimator(node, max_blocks=10)
+        estimator.update()
+        estimator.wait()
+
+        for i in range(20, 25):
+            node.blocks[i] = make_block(i, [10] * 20)
+        node.getblock = mock.Mock(wraps=node.getblock)
+        estimator.update()
+        estimator.wait()
+
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(15, 25))
+        assert node.getblock.call_count == 5
+
+        # Once all blocks left the window, the missing ones are filled in:
+        for i in range(25, 50):
+            node.blocks[i] = make_block(i, [10] * 20)
+        estimator.update()
+        estimator.wait()
+        assert [height for _, height, _, _ in estimator.blocks] == list(range(40, 50))
+
+    def test_incremental_histograms(self):
+        rates = [100, 20, 50, 20, 10, 70, 20, 100, 5, 30, 40, 20]
+        estimator = BlockFeeEstimator(max_blocks=5)
+        estimator.add_blocks([make_block(i, [rate] * 20) for i, rate in enumerate(rates)])
+
+        floors = [BlockFeeEstimator.block_floor(histogram, weight) for _, _, histogram, weight in estimator.blocks]
+        for delay, histogram in enumerate(estimator.histograms, 1):
+            windows = [min(floors[i : i + delay]) for i in range(len(floors) - delay + 1)]
+            assert {bucket: count for bucket, count in enumerate(histogram) if count} == {
+                bucket: windows.count(bucket) for bucket in windows
+            }
+        assert len(estimator.histograms) == 5
+
+    def test_update_rest(self):
+        estimator = BlockFeeEstimator('http://127.0.0.1:8332/', max_blocks=2)
+        with requests_mock.Mocker() as m:
+            m.get('http://127.0.0.1:8332/rest/chaininfo.json', json={'blocks': 5})
+            for height in (4, 5):
+                m.get(
+                    'http://127.0.0.1:8332/rest/blockhashbyheight/{}.json'.format(height),
+                    json={'blockhash': 'hash{}'.format(height)},
+                )
+                m.get('http://127.0.0.1:8332/rest/block/hash{}.json'.format(height), json=make_block(height, [10] * 20))
+            estimator.update()
+
+        assert estimator.height == 5
+        assert estimator.estimate(1) == 11
+
+
+def test_set_fee_estimator():
+    estimator = BlockFeeEstimator(FakeNode([make_block(i, [10] * 20) for i in range(10)]))
+    set_fee_estimator(estimator)
+    try:
+        with mock.patch('bit.network.fees.FeesAPI.get_fees') as mock_get_fees:
+            assert get_fees() == {'fastestFee': 11, 'halfHourFee': 11, 'hourFee': 11, 'economyFee': 11, 'minimumFee': 11}
+            assert get_fee_estimates()[6] == 11
+            assert not mock_get_fees.called
+    finally:
+        set_fee_estimator(None)
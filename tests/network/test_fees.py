@@ -1,7 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
 from time import sleep, time
+from unittest import mock
+
+import pytest
+import requests_mock
 
 import bit
-from bit.network.fees import get_fee, get_fee_cached, set_fee_cache_time
+from bit.exceptions import BitcoinNodeException
+from bit.network.fees import (
+    FEE_TIERS,
+    BlockstreamFees,
+    FeesAPI,
+    MempoolFees,
+    MEMPOOL_BLOCKS_URL,
+    URL,
+    get_fee,
+    get_fee_cached,
+    get_fee_estimates,
+    get_fee_for_target,
+    get_node_fee_estimates,
+    interpolate_fee,
+    get_fees,
+    get_fees_cached,
+    set_fee_background_refresh,
+    set_fee_cache_time,
+)
 
 
 def test_set_fee_cache_time():
@@ -15,10 +39,24 @@ def test_set_fee_cache_time():
     set_fee_cache_time(original)
 
 
+def test_set_fee_background_refresh():
+    set_fee_background_refresh(True)
+    assert bit.network.fees.BACKGROUND_REFRESH is True
+
+    set_fee_background_refresh(False)
+    assert bit.network.fees.BACKGROUND_REFRESH is False
+
+
 def test_get_fee():
     assert get_fee(fast=True) >= get_fee(fast=False)
 
 
+def test_get_fees():
+    fees = get_fees()
+    assert tuple(fees) == FEE_TIERS
+    assert fees['fastestFee'] >= fees['hourFee'] >= fees['minimumFee']
+
+
 class TestFeeCache:
     def test_fast(self):
         sleep(0.2)
@@ -69,3 +107,211 @@ class TestFeeCache:
         update_time = time() - start_time
 
         assert update_time > cached_time
+
+    def test_all_tiers(self):
+        fees = {tier: 50 - i for i, tier in enumerate(FEE_TIERS)}
+        original = bit.network.fees.DEFAULT_CACHE_TIME
+
+        with mock.patch('bit.network.fees.get_fees', return_value=fees) as get_fees_mock:
+            set_fee_cache_time(0)
+            get_fee_cached(fast=True)
+            set_fee_cache_time(600)
+
+            assert get_fees_cached() == fees
+            assert get_fee_cached(fast=True) == 50
+            assert get_fee_cached(fast=False) == 48
+            assert get_fees_mock.call_count == 1
+
+        set_fee_cache_time(original)
+
+    def test_coalesced_refresh(self):
+        fees = {tier: 10 for tier in FEE_TIERS}
+        barrier = Barrier(8)
+
+        def slow_get_fees():
+            sleep(0.2)
+            return fees
+
+        def get_fee_after_barrier(_):
+            barrier.wait()
+            return get_fee_cached()
+
+        original = bit.network.fees.DEFAULT_CACHE_TIME
+
+        with mock.patch('bit.network.fees.get_fees', side_effect=slow_get_fees) as get_fees_mock:
+            set_fee_cache_time(0)
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(get_fee_after_barrier, range(8)))
+
+        set_fee_cache_time(original)
+
+        assert results == [10] * 8
+        assert get_fees_mock.call_count == 1
+
+
+class MockNode:
+    def __init__(self, feerates):
+        self.feerates = feerates
+        self.calls = 0
+
+    def estimatesmartfee(self, blocks):
+        self.calls += 1
+        if blocks in self.feerates:
+            return {'feerate': self.feerates[blocks], 'blocks': blocks}
+        return {'errors': ['Insufficient data or no feerate found'], 'blocks': blocks}
+
+
+RECOMMENDED_FEES = {'fastestFee': 30, 'halfHourFee': 25, 'hourFee': 20, 'economyFee': 8, 'minimumFee': 2}
+MEMPOOL_BLOCKS = [{'medianFee': 31.5}, {'medianFee': 22.1}]
+
+
+class TestFeeForTarget:
+    def setup_method(self):
+        self.original = bit.network.fees.DEFAULT_CACHE_TIME
+
+    def teardown_method(self):
+        set_fee_cache_time(self.original)
+
+    def test_interpolate_fee(self):
+        estimates = {1: 50, 2: 40, 3: 45, 6: 20, 144: 5}
+        assert interpolate_fee(estimates, 1) == 50
+        assert interpolate_fee(estimates, 3) == 40
+        assert interpolate_fee(estimates, 4) == 34
+        assert interpolate_fee(estimates, 144) == 5
+        assert interpolate_fee(estimates, 1000) == 5
+
+    def test_get_fee_estimates(self):
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=RECOMMENDED_FEES)
+            m.get(BlockstreamFees.MAIN_API, status_code=503)
+            m.get(MEMPOOL_BLOCKS_URL, json=MEMPOOL_BLOCKS)
+            set_fee_cache_time(0)
+
+            assert get_fee_estimates() == {1: 32, 2: 23, 3: 25, 6: 20, 144: 8, 1008: 2}
+
+    def test_get_node_fee_estimates(self):
+        node = MockNode({2: 0.00021, 6: 0.0001234})
+        assert get_node_fee_estimates(node) == {2: 21, 6: 13}
+
+        with pytest.raises(BitcoinNodeException):
+            get_node_fee_estimates(MockNode({}))
+
+    def test_get_fee_for_target(self):
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=RECOMMENDED_FEES)
+            m.get(BlockstreamFees.MAIN_API, status_code=503)
+            m.get(MEMPOOL_BLOCKS_URL, json=MEMPOOL_BLOCKS)
+            set_fee_cache_time(0)
+            get_fee_for_target(1)
+            set_fee_cache_time(600)
+
+            assert get_fee_for_target(1) == 32
+            assert get_fee_for_target(2) == 23
+            assert get_fee_for_target(4) == 22
+            assert get_fee_for_target(75) == 14
+            assert get_fee_for_target(5000) == 2
+            assert m.call_count == 3
+
+            with pytest.raises(ValueError):
+                get_fee_for_target(0)
+
+    def test_get_fee_for_target_node(self):
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=RECOMMENDED_FEES)
+            m.get(BlockstreamFees.MAIN_API, status_code=503)
+            m.get(MEMPOOL_BLOCKS_URL, json=MEMPOOL_BLOCKS)
+            node = MockNode({1: 0.0004, 6: 0.0001})
+
+            assert get_fee_for_target(1, node) == 40
+            assert get_fee_for_target(6, node) == 10
+            assert node.calls == len(bit.network.fees.NODE_TARGETS)
+
+    def test_get_fee_for_target_node_failure(self):
+        with requests_mock.Mocker() as m:
+            m.get(URL, json=RECOMMENDED_FEES)
+            m.get(BlockstreamFees.MAIN_API, status_code=503)
+            m.get(MEMPOOL_BLOCKS_URL, json=MEMPOOL_BLOCKS)
+            set_fee_cache_time(0)
+
+            assert get_fee_for_target(1, MockNode({})) == 32
+
+
+class TestFeesAPI:
+    def setup_method(self):
+        self.get_fees = FeesAPI.GET_FEES
+
+    def teardown_method(self):
+        FeesAPI.GET_FEES = self.get_fees
+
+    def test_mempool(self):
+        with requests_mock.Mocker() as m:
+            m.get(MempoolFees.MAIN_API, json=dict(RECOMMENDED_FEES, extra=1))
+            assert MempoolFees.get_fees() == RECOMMENDED_FEES
+
+    def test_blockstream(self):
+        estimates = {'1': 30.2, '2': 27.0, '3': 25.1, '6': 20.0, '144': 7.5, '504': 3.0, '1008': 1.2}
+        with requests_mock.Mocker() as m:
+            m.get(BlockstreamFees.MAIN_API, json=estimates)
+            assert BlockstreamFees.get_fees() == {
+                'fastestFee': 31,
+                'halfHourFee': 26,
+                'hourFee': 20,
+                'economyFee': 8,
+                'minimumFee': 2,
+            }
+
+    def test_priority_without_quorum(self):
+        def fails():
+            raise ConnectionError
+
+        FeesAPI.GET_FEES = [fails, lambda: {tier: 2 for tier in FEE_TIERS}, fails]
+        assert FeesAPI.get_fees() == {tier: 2 for tier in FEE_TIERS}
+
+        # A majority of the providers must answer by default:
+        FeesAPI.GET_FEES = [fails, lambda: {tier: 2 for tier in FEE_TIERS}, lambda: {tier: 1 for tier in FEE_TIERS}]
+        assert FeesAPI.get_fees() == {tier: 2 for tier in FEE_TIERS}
+        FeesAPI.QUORUM = 3
+        try:
+            assert FeesAPI.get_fees() == {tier: 2 for tier in FEE_TIERS}
+        finally:
+            FeesAPI.QUORUM = None
+
+    def test_median(self):
+        FeesAPI.GET_FEES = [lambda fee=fee: {tier: fee for tier in FEE_TIERS} for fee in (50, 10, 20, 30)]
+        assert FeesAPI.get_fees() == {tier: 30 for tier in FEE_TIERS}
+
+    def test_median_of_default_providers(self):
+        estimates = {'1': 40, '2': 40, '3': 40, '6': 30, '144': 20, '504': 10, '1008': 2}
+        with requests_mock.Mocker() as m:
+            m.get(MempoolFees.MAIN_API, json=RECOMMENDED_FEES)
+            m.get(BlockstreamFees.MAIN_API, json=estimates)
+
+            fees = FeesAPI.get_fees()
+
+        # Both default providers answered, so the higher fee of each tier is used:
+        blockstream = {'fastestFee': 40, 'halfHourFee': 40, 'hourFee': 30, 'economyFee': 20, 'minimumFee': 2}
+        assert fees == {tier: max(RECOMMENDED_FEES[tier], blockstream[tier]) for tier in FEE_TIERS}
+        assert fees != RECOMMENDED_FEES
+
+    def test_timeout(self):
+        def slow():
+            sleep(1)
+            return {tier: 100 for tier in FEE_TIERS}
+
+        original = bit.network.fees.DEFAULT_TIMEOUT
+        bit.network.fees.DEFAULT_TIMEOUT = 0.2
+        FeesAPI.GET_FEES = [slow, lambda: {tier: 5 for tier in FEE_TIERS}]
+
+        start_time = time()
+        assert FeesAPI.get_fees() == {tier: 5 for tier in FEE_TIERS}
+        assert time() - start_time < 0.9
+
+        bit.network.fees.DEFAULT_TIMEOUT = original
+
+    def test_all_fail(self):
+        def fails():
+            raise ConnectionError
+
+        FeesAPI.GET_FEES = [fails, fails]
+        with pytest.raises(ConnectionError):
+            FeesAPI.get_fees()
@@ -0,0 +1,150 @@
+import pytest
+
+from bit.network.health import FAILURE_COST, MIN_CALLS, HealthTracker
+from bit.network.services import NetworkAPI
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Provider:
+    def __init__(self, latency=0, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    def get_balance(self, address):
+        self.calls += 1
+        clock.now += self.latency
+        if self.fail:
+            raise ConnectionError
+        return self.latency
+
+
+clock = Clock()
+
+
+class TestHealthTracker:
+    def setup_method(self):
+        clock.now = 0
+        self.health = HealthTracker(open_time=30, clock=clock)
+
+    def test_provider_shared_by_methods(self):
+        provider = Provider()
+        assert self.health.health(provider.get_balance) is self.health.health(provider.get_balance)
+        assert self.health.provider(provider.get_balance) is provider
+
+    def test_ewma(self):
+        provider = Provider()
+        self.health.record(provider.get_balance, True, 1)
+        self.health.record(provider.get_balance, False, 10)
+        self.health.record(provider.get_balance, True, 2)
+
+        health = self.health.health(provider.get_balance)
+        assert health.success == pytest.approx(0.84)
+        assert health.latency == pytest.approx(1.2)
+        assert health.score == pytest.approx(1.2 + 0.16 * FAILURE_COST)
+
+    def test_order_by_health(self):
+        slow, fast, failing, new = Provider(latency=2), Provider(latency=0.5), Provider(fail=True), Provider()
+        self.health.record(slow.get_balance, True, 2)
+        self.health.record(fast.get_balance, True, 0.5)
+        self.health.record(failing.get_balance, True, 0.1)
+        self.health.record(failing.get_balance, False, 0.1)
+
+        api_calls = [slow.get_balance, failing.get_balance, fast.get_balance, new.get_balance]
+        assert self.health.order(api_calls) == [new.get_balance, fast.get_balance, slow.get_balance, failing.get_balance]
+
+    def test_circuit_breaker(self):
+        down, up = Provider(fail=True), Provider()
+        api_calls = [down.get_balance, up.get_balance]
+
+        for _ in range(MIN_CALLS - 1):
+            self.health.record(down.get_balance, False, 1)
+        assert down.get_balance in self.health.order(api_calls)
+
+        self.health.record(down.get_balance, False, 1)
+        assert self.health.order(api_calls) == [up.get_balance]
+
+        # A single probe once the circuit was open long enough:
+        clock.now += 30
+        assert self.health.order(api_calls) == [down.get_balance, up.get_balance]
+        assert self.health.order(api_calls) == [up.get_balance]
+
+        # The probe failed, so the circuit stays open:
+        with pytest.raises(ConnectionError):
+            self.health.call(down.get_balance, 'address')
+        clock.now += 29
+        assert self.health.order(api_calls) == [up.get_balance]
+
+        # The next probe succeeds and closes the circuit:
+        clock.now += 1
+        assert self.health.order(api_calls)[0] == down.get_balance
+        down.fail = False
+        self.health.call(down.get_balance, 'address')
+        assert down.get_balance in self.health.order(api_calls)
+        assert self.health.health(down.get_balance).success == 1
+
+    def test_all_open(self):
+        down = Provider(fail=True)
+        for _ in range(MIN_CALLS):
+            self.health.record(down.get_balance, False, 1)
+
+        assert self.health.order([down.get_balance]) == [down.get_balance]
+
+    def test_call_ignores_other_errors(self):
+        def api_call(address):
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            self.health.call(api_call, 'address')
+        assert self.health.health(api_call).calls == 0
+
+
+class TestNetworkAPIHealth:
+    def setup_method(self):
+        clock.now = 0
+
+    def test_moves_failing_provider_last(self):
+        down, up = Provider(latency=1, fail=True), Provider(latency=1.5)
+
+        class n(NetworkAPI):
+            HEALTH = HealthTracker(clock=clock)
+            GET_BALANCE_MAIN = [down.get_balance, up.get_balance]
+
+        for _ in range(3):
+            assert n.get_balance('address') == 1.5
+
+        assert down.calls == 1
+        assert up.calls == 3
+
+    def test_skips_open_circuit(self):
+        down, up = Provider(fail=True), Provider(latency=2)
+
+        class n(NetworkAPI):
+            HEALTH = HealthTracker(clock=clock)
+            GET_BALANCE_MAIN = [down.get_balance, up.get_balance]
+
+        for _ in range(MIN_CALLS):
+            n.HEALTH.record(down.get_balance, False, 1)
+        clock.now += 10
+
+        assert n.get_balance('address') == 2
+        assert down.calls == 0
+
+    def test_prefers_faster_provider(self):
+        slow, fast = Provider(latency=3), Provider(latency=1)
+
+        class n(NetworkAPI):
+            HEALTH = HealthTracker(clock=clock)
+            GET_BALANCE_MAIN = [slow.get_balance, fast.get_balance]
+
+        n.HEALTH.record(slow.get_balance, True, 3)
+        n.HEALTH.record(fast.get_balance, True, 1)
+        assert n.get_balance('address') == 1
+        assert slow.calls == 0
@@ -1,4 +1,11 @@
-from bit.network.meta import Unspent
+from time import sleep
+
+from bit.network.meta import Unspent, UTXOPool, estimate_input_vsize
+from bit.transaction import TxIn, TxObj, TxOut
+from bit.utils import hex_to_bytes
+
+SCRIPT = '76a914990ef60d63b5b5964a1c2282061af45123e93fcb88ac'
+TXID = 'f09c22717770fcd7e477953c3ca7ecb9bd44ec4d5392f24fdd247dbb8db2d388'
 
 
 class TestUnspent:
@@ -43,7 +50,7 @@ class TestUnspent:
 
         unspent.set_type('p2sh')
         assert unspent.segwit is False
-        assert unspent.vsize == 298
+        assert unspent.vsize == 297
 
         unspent.set_type('np2wkh')
         assert unspent.segwit is True
@@ -51,7 +58,7 @@ class TestUnspent:
 
         unspent.set_type('np2wsh')
         assert unspent.segwit is True
-        assert unspent.vsize == 140
+        assert unspent.vsize == 139.5
 
         unspent.set_type('p2wkh')
         assert unspent.segwit is True
@@ -59,4 +66,212 @@ class TestUnspent:
 
         unspent.set_type('p2wsh')
         assert unspent.segwit is True
-        assert unspent.vsize == 105
+        assert unspent.vsize == 104.5
+
+    def test_effective_value(self):
+        unspent = Unspent(10000, 7, 'script', 'txid', 0, 'np2wkh')
+        assert unspent.effective_value(0) == 10000
+        assert unspent.effective_value(10) == 10000 - 910
+        assert unspent.effective_value(200) < 0
+
+
+class TestEstimateInputVsize:
+    def test_single_sig(self):
+        assert estimate_input_vsize('p2pkh') == 148
+        assert estimate_input_vsize('p2pkh-uncompressed') == 180
+        assert estimate_input_vsize('np2wkh') == 91
+        assert estimate_input_vsize('p2wkh') == 68
+
+    def test_multisig(self):
+        assert estimate_input_vsize('p2sh', 2, 3) == 297
+        assert estimate_input_vsize('np2wsh', 2, 3) == 139.5
+        assert estimate_input_vsize('p2wsh', 2, 3) == 104.5
+        assert estimate_input_vsize('p2sh', 1, 1) < estimate_input_vsize('p2sh', 3, 5)
+
+    def test_redeemscript_size(self):
+        assert estimate_input_vsize('p2sh', 2, 3, redeemscript_size=105) == 297
+        assert estimate_input_vsize('p2sh', 2, 3, redeemscript_size=106) == 298
+
+    def test_unknown(self):
+        assert estimate_input_vsize('unknown') is None
+
+
+class TestUTXOPool:
+    def test_init(self):
+        pool = UTXOPool()
+        assert len(pool) == 0
+        assert pool.synced is False
+
+        pool = UTXOPool([Unspent(10000, 7, 'script', 'txid', 0)])
+        assert len(pool) == 1
+        assert pool.synced is True
+
+    def test_fresh(self):
+        pool = UTXOPool(max_age=60)
+        assert not pool.fresh
+
+        pool.refresh([])
+        assert pool.fresh
+
+        pool.last_refresh -= 60
+        assert pool.synced
+        assert not pool.fresh
+
+    def test_sorted_by_amount(self):
+        unspents = [Unspent(amount, 1, 'script', 'txid', i) for i, amount in enumerate((300, 100, 500, 200))]
+        pool = UTXOPool(unspents)
+        assert [u.amount for u in pool] == [500, 300, 200, 100]
+        assert pool.balance == 1100
+
+    def test_add_and_discard(self):
+        pool = UTXOPool([Unspent(300, 1, 'script', 'txid', 0)])
+        pool.add(Unspent(100, 1, 'script', 'txid', 1))
+        assert Unspent(100, 1, 'script', 'txid', 1) in pool
+
+        # Adding the same outpoint replaces the unspent:
+        pool.add(Unspent(400, 1, 'script', 'txid', 1))
+        assert [u.amount for u in pool] == [400, 300]
+
+        assert pool.discard('txid', 1).amount == 400
+        assert pool.discard('txid', 1) is None
+        assert [u.amount for u in pool] == [300]
+
+    def test_apply_transaction(self):
+        spent = Unspent(100000, 1, SCRIPT, TXID, 0, 'p2pkh')
+        pool = UTXOPool([spent, Unspent(5000, 1, SCRIPT, TXID, 1, 'p2pkh')])
+
+        tx = TxObj(
+            b'\x01\x00\x00\x00',
+            [TxIn(b'', hex_to_bytes(TXID)[::-1], b'\x00\x00\x00\x00')],
+            [
+                TxOut((60000).to_bytes(8, byteorder='little'), b'\x00\x14' + b'\x01' * 20),
+                TxOut((30000).to_bytes(8, byteorder='little'), hex_to_bytes(SCRIPT)),
+            ],
+            b'\x00\x00\x00\x00',
+        )
+        added = pool.apply_transaction(tx)
+
+        assert spent not in pool
+        assert len(added) == 1
+        assert added[0].amount == 30000
+        assert added[0].confirmations == 0
+        assert added[0].txindex == 1
+        assert added[0].type == 'p2pkh'
+        assert [u.amount for u in pool] == [30000, 5000]
+        assert pool.spent_by(tx) == [spent]
+
+    def test_apply_transaction_watched_script(self):
+        pool = UTXOPool([Unspent(100000, 1, 'a914' + '02' * 20 + '87', TXID, 0, 'np2wkh')])
+        pool.watch(SCRIPT, 'p2pkh')
+
+        tx = TxObj(
+            b'\x01\x00\x00\x00',
+            [TxIn(b'', hex_to_bytes(TXID)[::-1], b'\x00\x00\x00\x00')],
+            [TxOut((90000).to_bytes(8, byteorder='little'), hex_to_bytes(SCRIPT))],
+            b'\x00\x00\x00\x00',
+        )
+        (change,) = pool.apply_transaction(tx)
+
+        assert change.type == 'p2pkh'
+        assert change.vsize == Unspent(0, 0, SCRIPT, TXID, 0, 'p2pkh').vsize
+        assert list(pool) == [change]
+
+    def test_replace_transaction(self):
+        spent = Unspent(100000, 1, SCRIPT, TXID, 0, 'p2pkh')
+        pool = UTXOPool([spent])
+
+        def make_tx(change):
+            return TxObj(
+                b'\x01\x00\x00\x00',
+                [TxIn(b'', hex_to_bytes(TXID)[::-1], b'\x00\x00\x00\x00', sequence=b'\xfd\xff\xff\xff')],
+                [
+                    TxOut((60000).to_bytes(8, byteorder='little'), b'\x00\x14' + b'\x01' * 20),
+                    TxOut(change.to_bytes(8, byteorder='little'), hex_to_bytes(SCRIPT)),
+                ],
+                b'\x00\x00\x00\x00',
+            )
+
+        tx, replacement = make_tx(30000), make_tx(25000)
+        (change,) = pool.apply_transaction(tx)
+        added = pool.replace_transaction(tx, replacement)
+
+        assert change not in pool
+        assert [u.amount for u in pool] == [25000]
+        assert added == list(pool)
+        assert added[0].txid != change.txid
+        assert pool.spent_by(replacement) == [spent]
+
+    def test_apply_transaction_not_synced(self):
+        pool = UTXOPool()
+        tx = TxObj(b'\x01\x00\x00\x00', [], [], b'\x00\x00\x00\x00')
+        assert pool.apply_transaction(tx) == []
+
+    def test_reserve_and_release(self):
+        unspent = Unspent(300, 1, 'script', 'txid', 0)
+        pool = UTXOPool([unspent])
+        assert not pool.is_reserved(unspent)
+
+        pool.reserve([unspent])
+        assert pool.is_reserved(unspent)
+
+        pool.release([unspent])
+        assert not pool.is_reserved(unspent)
+
+    def test_reservation_expires(self):
+        unspent = Unspent(300, 1, 'script', 'txid', 0)
+        pool = UTXOPool([unspent])
+
+        pool.reserve([unspent], ttl=0.05)
+        sleep(0.1)
+        assert not pool.is_reserved(unspent)
+
+    def test_select_skips_reserved(self):
+        unspents = [Unspent(amount, 1, 'script', 'txid', i) for i, amount in enumerate((300, 100, 500))]
+        pool = UTXOPool(unspents)
+
+        first, = pool.select(lambda candidates: (candidates[:1],), list(pool), reserve=True)
+        second, = pool.select(lambda candidates: (candidates[:1],), list(pool), reserve=True)
+        third, = pool.select(lambda candidates: (candidates,), list(pool))
+
+        assert [u.amount for u in first] == [500]
+        assert [u.amount for u in second] == [300]
+        assert [u.amount for u in third] == [100]
+        assert not pool.is_reserved(third[0])
+
+    def test_cancel_transaction(self):
+        unspent = Unspent(100000, 1, SCRIPT, TXID, 0, 'p2pkh')
+        pool = UTXOPool([unspent])
+        pool.reserve([unspent])
+
+        tx = TxObj(
+            b'\x01\x00\x00\x00',
+            [TxIn(b'', hex_to_bytes(TXID)[::-1], b'\x00\x00\x00\x00')],
+            [],
+            b'\x00\x00\x00\x00',
+        )
+        pool.cancel_transaction(tx)
+        assert not pool.is_reserved(unspent)
+
+    def test_economical_and_uneconomical(self):
+        unspents = [
+            Unspent(2000, 1, 'script', 'txid', 0, 'p2pkh'),
+            Unspent(1900, 1, 'script', 'txid', 1, 'np2wkh'),
+            Unspent(1000, 1, 'script', 'txid', 2, 'p2pkh'),
+        ]
+        pool = UTXOPool(unspents)
+
+        # Effective values at 10 satoshi per byte: 520, 990 and -480
+        assert [u.txindex for u in pool.economical(10)] == [1, 0]
+        assert [u.txindex for u in pool.uneconomical(10)] == [2]
+        assert [u.txindex for u in pool.economical(1)] == [0, 1, 2]
+
+        pool.discard('txid', 1)
+        assert [u.txindex for u in pool.economical(10)] == [0]
+
+    def test_select_with_fee(self):
+        unspents = [Unspent(amount, 1, 'script', 'txid', i) for i, amount in enumerate((3000, 1000, 5000))]
+        pool = UTXOPool(unspents)
+        pool.reserve(unspents[2:])
+
+        candidates, = pool.select(lambda candidates: (candidates,), list(pool), fee=10)
+        assert [u.amount for u in candidates] == [3000]
@@ -0,0 +1,174 @@
+import math
+from threading import Event
+from unittest import mock
+
+import bit
+from bit.network.meta import Unspent
+from bit.network.policy import MAX_RATIO, MIN_SAMPLES, FeePolicy, record_transaction, set_fee_policy
+from bit.transaction import TxIn, TxObj, TxOut
+
+
+def train(policy, samples):
+    # Each sample is a fee rate relative to a market fee of 100 and the
+    # seconds it took to confirm:
+    for i, (ratio, delay) in enumerate(samples):
+        txid = 'tx{}'.format(i)
+        policy.record_broadcast(txid, 100 * ratio, 200, market_fee=100, broadcast_time=0)
+        policy.record_confirmation(txid, confirmation_time=delay)
+
+
+class TestFeePolicy:
+    def test_record(self):
+        policy = FeePolicy()
+        policy.record_broadcast('txid', 20, 141, market_fee=40, broadcast_time=1000)
+        assert 'txid' in policy.pending
+
+        assert policy.record_confirmation('txid', confirmation_time=1600)
+        assert not policy.record_confirmation('txid')
+        assert policy.records[0] == (20, 141, 40, 600)
+
+    def test_window(self):
+        policy = FeePolicy(window=5)
+        train(policy, [(1, 600)] * 10)
+        assert len(policy.records) == 5
+
+    def test_discard(self):
+        policy = FeePolicy()
+        policy.record_broadcast('txid', 20, 141, market_fee=40)
+        policy.discard('txid')
+        policy.discard('txid')
+        assert not policy.pending
+
+    def test_update(self):
+        policy = FeePolicy()
+        policy.record_broadcast('a', 20, 141, market_fee=40, broadcast_time=1000)
+        policy.record_broadcast('b', 20, 141, market_fee=40, broadcast_time=1000)
+
+        block_times = {'a': 1600, 'b': None}
+        with mock.patch(
+            'bit.network.services.NetworkAPI.get_confirmation_time', side_effect=block_times.get
+        ) as get_confirmation_time:
+            policy.update()
+
+        assert get_confirmation_time.call_count == 2
+        assert policy.records[0].delay == 600
+        assert list(policy.pending) == ['b']
+
+    def test_update_testnet(self):
+        policy = FeePolicy(testnet=True)
+        policy.record_broadcast('a', 20, 141, market_fee=40, broadcast_time=1000)
+
+        with mock.patch('bit.network.services.NetworkAPI.get_confirmation_time_testnet', return_value=1600):
+            policy.update()
+
+        assert policy.records[0].delay == 600
+
+    def test_recommend_updates_in_background(self):
+        policy = FeePolicy()
+        policy.record_broadcast('a', 20, 141, market_fee=40)
+        looking_up = Event()
+
+        def get_confirmation_time(txid):
+            looking_up.wait(1)
+            raise ConnectionError
+
+        with mock.patch(
+            'bit.network.services.NetworkAPI.get_confirmation_time', side_effect=get_confirmation_time
+        ) as get_confirmation_time:
+            # The lookup does not block the recommendation:
+            assert policy.recommend(600, market_fee=100) == 100
+            assert policy.recommend(600, market_fee=100) == 100
+            looking_up.set()
+            policy.wait()
+
+        assert get_confirmation_time.call_count == 1
+
+    def test_market_fee_without_model(self):
+        policy = FeePolicy()
+        train(policy, [(0.5, 600)] * (MIN_SAMPLES - 1))
+        assert policy.model() is None
+        assert policy.recommend(600, market_fee=100) == 100
+
+    def test_no_model_if_paying_more_is_not_faster(self):
+        policy = FeePolicy()
+        train(policy, [(0.5, 600), (1, 6000)] * MIN_SAMPLES)
+        assert policy.model() is None
+
+    def test_recommend(self):
+        policy = FeePolicy(success=0.9)
+        # The delay halves whenever the fee rate doubles:
+        train(policy, [(ratio, 3600 / ratio) for ratio in (0.25, 0.5, 1, 2)] * 5)
+
+        intercept, slope, margin = policy.model()
+        assert math.isclose(slope, -1)
+        assert math.isclose(intercept, math.log(3600))
+
+        assert policy.recommend(3600, market_fee=100) == 100
+        assert policy.recommend(7200, market_fee=100) == 50
+        assert policy.recommend(60, market_fee=100) == 100 * MAX_RATIO
+
+    def test_recommend_covers_spread(self):
+        policy = FeePolicy(success=0.9)
+        train(policy, [(0.5, 1200), (0.5, 2400), (1, 600), (1, 1200)] * 5)
+
+        # Half of the transactions paying half the market fee took 2400 seconds:
+        assert policy.recommend(2400, market_fee=100) == 50
+        assert policy.recommend(1200, market_fee=100) == 100
+
+
+def test_record_transaction():
+    tx = TxObj(
+        b'\x01\x00\x00\x00',
+        [TxIn(b'', b'\x00' * 32, b'\x00\x00\x00\x00')],
+        [TxOut((9000).to_bytes(8, byteorder='little'), b'\x00' * 22)],
+        b'\x00\x00\x00\x00',
+    )
+    unspents = [Unspent(10000, 1, 'script', '00' * 32, 0)]
+
+    record_transaction(tx, unspents)
+
+    policy = FeePolicy()
+    bit.set_fee_policy(policy)
+    try:
+        with mock.patch('bit.network.policy.get_fee_cached', return_value=20):
+            record_transaction(tx, [])
+            assert not policy.pending
+
+            # Other unspents are ignored:
+            record_transaction(tx, [Unspent(500, 1, 'script', '11' * 32, 0)] + unspents)
+
+            # Transactions on the other network are not recorded:
+            record_transaction(tx, unspents, testnet=True)
+            assert len(policy.pending) == 1
+    finally:
+        set_fee_policy(None)
+
+    ((fee_rate, vsize, market_fee, _),) = policy.pending.values()
+    assert vsize == 82
+    assert fee_rate == 1000 / 82
+    assert market_fee == 20
+
+
+def test_record_replacement():
+    def transaction(amount):
+        return TxObj(
+            b'\x01\x00\x00\x00',
+            [TxIn(b'', b'\x00' * 32, b'\x00\x00\x00\x00')],
+            [TxOut(amount.to_bytes(8, byteorder='little'), b'\x00' * 22)],
+            b'\x00\x00\x00\x00',
+        )
+
+    tx, replacement = transaction(9000), transaction(8000)
+    unspents = [Unspent(10000, 1, 'script', '00' * 32, 0)]
+
+    policy = FeePolicy()
+    bit.set_fee_policy(policy)
+    try:
+        with mock.patch('bit.network.policy.get_fee_cached', return_value=20):
+            record_transaction(tx, unspents)
+            record_transaction(replacement, unspents, replaced=tx)
+    finally:
+        set_fee_policy(None)
+
+    ((fee_rate, *_),) = policy.pending.values()
+    assert fee_rate == 2000 / 82
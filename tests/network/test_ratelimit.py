@@ -0,0 +1,105 @@
+from email.utils import formatdate
+
+import pytest
+
+from bit.network import ratelimit
+from bit.network.ratelimit import RateLimiter, RateLimitError, get_rate_budget, parse_retry_after, set_rate_limits
+
+PUSH_URL = 'https://api.smartbit.com.au/v1/blockchain/pushtx'
+ADDRESS_URL = 'https://api.smartbit.com.au/v1/blockchain/address/1L2JsXHPMYuAa9ugvHGLwkdstCPUDemNCf'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    def setup_method(self):
+        self.clock = Clock()
+
+    def limiter(self, limits, max_delay=1):
+        return RateLimiter(limits, max_delay, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_burst_then_skip(self):
+        limiter = self.limiter({'api.smartbit.com.au/v1/blockchain/pushtx': (5, 60)})
+
+        for _ in range(5):
+            limiter.acquire(PUSH_URL)
+        assert self.clock.sleeps == []
+        assert limiter.remaining(PUSH_URL) == 0
+
+        with pytest.raises(RateLimitError) as excinfo:
+            limiter.acquire(PUSH_URL)
+        assert excinfo.value.key == 'api.smartbit.com.au/v1/blockchain/pushtx'
+        assert excinfo.value.retry_after == pytest.approx(12)
+
+        # Other endpoints of the host are not limited:
+        limiter.acquire(ADDRESS_URL)
+        assert limiter.remaining(ADDRESS_URL) is None
+
+        self.clock.now += 12
+        assert limiter.remaining(PUSH_URL) == 1
+        limiter.acquire(PUSH_URL)
+
+    def test_delays_within_max_delay(self):
+        limiter = self.limiter({'api.blockchair.com': (2, 1)})
+
+        for _ in range(4):
+            limiter.acquire('https://api.blockchair.com/bitcoin/stats')
+        assert self.clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+    def test_takes_every_matching_limit(self):
+        limiter = self.limiter({'api.smartbit.com.au': (10, 1), 'api.smartbit.com.au/v1/blockchain/pushtx': (5, 60)})
+
+        limiter.acquire(PUSH_URL)
+        assert limiter.remaining(PUSH_URL) == 4
+        assert limiter.remaining(ADDRESS_URL) == 9
+        # A host has the budget of the limits within it:
+        assert limiter.remaining('api.smartbit.com.au') == 4
+
+    def test_retry_after(self):
+        limiter = self.limiter({})
+
+        limiter.retry_after(ADDRESS_URL, 0.5)
+        assert limiter.remaining('api.smartbit.com.au') == 0
+        limiter.acquire(PUSH_URL)
+        assert self.clock.sleeps == [0.5]
+
+        limiter.retry_after(ADDRESS_URL, 30)
+        with pytest.raises(RateLimitError):
+            limiter.acquire(PUSH_URL)
+        limiter.acquire('https://blockstream.info/api/blocks/tip/height')
+
+        self.clock.now += 30
+        limiter.acquire(PUSH_URL)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120
+    assert parse_retry_after('-1') == 0
+    assert parse_retry_after(formatdate(1000, usegmt=True), now=970) == 30
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_set_rate_limits():
+    original = ratelimit.RATE_LIMITS, ratelimit.MAX_RATE_DELAY
+    set_rate_limits({'api.blockchair.com': (30, 60)}, max_delay=5)
+
+    limiter = ratelimit.get_rate_limiter()
+    assert limiter is ratelimit.get_rate_limiter()
+    assert limiter.max_delay == 5
+    assert get_rate_budget('api.blockchair.com') == 30
+    assert get_rate_budget(PUSH_URL) is None
+
+    set_rate_limits(*original)
+    assert ratelimit.get_rate_limiter() is not limiter
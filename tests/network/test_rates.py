@@ -10,6 +10,7 @@ from bit.network.rates import (
     satoshi_to_currency,
     satoshi_to_currency_cached,
     satoshi_to_satoshi,
+    set_rate_background_refresh,
     set_rate_cache_time,
     ubtc_to_satoshi,
 )
@@ -27,6 +28,14 @@ def test_set_rate_cache_time():
     set_rate_cache_time(original)
 
 
+def test_set_rate_background_refresh():
+    set_rate_background_refresh(True)
+    assert bit.network.rates.BACKGROUND_REFRESH is True
+
+    set_rate_background_refresh(False)
+    assert bit.network.rates.BACKGROUND_REFRESH is False
+
+
 def test_satoshi_to_satoshi():
     s = satoshi_to_satoshi()
     assert isinstance(s, int)
@@ -0,0 +1,168 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+import requests_mock
+
+from bit.network import ratelimit, session
+from bit.network.ratelimit import RateLimitError, set_rate_limits
+from bit.network.services import BitcoreAPI
+from bit.network.session import get_session, set_session_options
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.client_address)
+        status = server.statuses.pop(0) if server.statuses else 200
+        self.send_response(status)
+        if status == 429 and server.retry_after is not None:
+            self.send_header('Retry-After', server.retry_after)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, statuses=(), retry_after=None):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.requests = []
+        self.url = 'http://127.0.0.1:{}/'.format(self.server_port)
+        Thread(target=self.serve_forever, daemon=True).start()
+
+
+class TestSession:
+    def setup_method(self):
+        self.options = (
+            session.POOL_CONNECTIONS,
+            session.POOL_MAXSIZE,
+            session.HOST_POOL_SIZES,
+            session.MAX_RETRIES,
+            session.KEEP_ALIVE,
+        )
+        session.RETRY_BACKOFF, self.backoff = 0, session.RETRY_BACKOFF
+
+    def teardown_method(self):
+        set_session_options(*self.options)
+        session.RETRY_BACKOFF = self.backoff
+
+    def test_shared(self):
+        assert get_session() is get_session()
+
+    def test_set_session_options_rebuilds(self):
+        previous = get_session()
+        set_session_options(pool_maxsize=3, host_pool_sizes={'api.blockchair.com': 2}, max_retries=1)
+        current = get_session()
+
+        assert current is not previous
+        adapter = current.get_adapter('https://blockstream.info/api/')
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 1
+        assert current.get_adapter('https://api.blockchair.com/bitcoin/')._pool_maxsize == 2
+
+    def test_keep_alive(self):
+        server = StandInServer()
+        for _ in range(3):
+            assert get_session().get(server.url, timeout=5).text == 'ok'
+        server.shutdown()
+
+        assert len(set(server.requests)) == 1
+
+    def test_no_keep_alive(self):
+        set_session_options(keep_alive=False)
+        server = StandInServer()
+        for _ in range(3):
+            get_session().get(server.url, timeout=5)
+        server.shutdown()
+
+        assert len(set(server.requests)) == 3
+
+    def test_retries_get(self):
+        set_session_options(max_retries=2)
+        server = StandInServer([503, 502])
+        r = get_session().get(server.url, timeout=5)
+        server.shutdown()
+
+        assert r.status_code == 200
+        assert len(server.requests) == 3
+
+    def test_returns_last_response(self):
+        set_session_options(max_retries=1)
+        server = StandInServer([503, 503])
+        r = get_session().get(server.url, timeout=5)
+        server.shutdown()
+
+        assert r.status_code == 503
+        assert len(server.requests) == 2
+
+    def test_never_retries_post(self):
+        set_session_options(max_retries=2)
+        server = StandInServer([503])
+        r = get_session().post(server.url, data='00', timeout=5)
+        server.shutdown()
+
+        assert r.status_code == 503
+        assert len(server.requests) == 1
+
+    def test_services_use_session(self):
+        adapter = requests_mock.Adapter()
+        adapter.register_uri('GET', BitcoreAPI.MAIN_BALANCE_API.format('address'), json={'balance': 10})
+        get_session().mount('https://api.bitcore.io/', adapter)
+
+        assert BitcoreAPI.get_balance('address') == 10
+        assert adapter.call_count == 1
+
+
+class TestRateLimits:
+    def setup_method(self):
+        self.limits = ratelimit.RATE_LIMITS, ratelimit.MAX_RATE_DELAY
+
+    def teardown_method(self):
+        set_rate_limits(*self.limits)
+
+    def test_skips_over_limit(self):
+        server = StandInServer()
+        host = server.url.split('//')[1]
+        set_rate_limits({host: (2, 60)}, max_delay=0.5)
+
+        for _ in range(2):
+            get_session().get(server.url, timeout=5)
+        with pytest.raises(RateLimitError):
+            get_session().get(server.url, timeout=5)
+        server.shutdown()
+
+        assert len(server.requests) == 2
+        assert ratelimit.get_rate_budget(server.url) == 0
+
+    def test_honors_retry_after(self):
+        set_rate_limits({}, max_delay=0.5)
+        server = StandInServer([429], retry_after='60')
+
+        assert get_session().get(server.url, timeout=5).status_code == 429
+        with pytest.raises(RateLimitError) as excinfo:
+            get_session().get(server.url, timeout=5)
+        server.shutdown()
+
+        assert 59 < excinfo.value.retry_after <= 60
+        assert len(server.requests) == 1
+
+    def test_waits_for_short_retry_after(self):
+        set_rate_limits({}, max_delay=0.5)
+        server = StandInServer([429], retry_after='0.1')
+
+        get_session().get(server.url, timeout=5)
+        assert get_session().get(server.url, timeout=5).status_code == 200
+        server.shutdown()
+
+        assert len(server.requests) == 2
@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import json
+import socket
+from threading import Thread
+from time import sleep, time
+from unittest import mock
+
+import pytest
+
+from bit.network.fees import get_fee_for_target, get_fees_cached, set_fee_cache_time
+from bit.network.services import TIP_HEIGHTS, get_tip_height_cached
+from bit.network.stream import FeeSubscriber
+
+pytest.importorskip('websocket')
+
+FEES = {'fastestFee': 41, 'halfHourFee': 31, 'hourFee': 21, 'economyFee': 11, 'minimumFee': 2}
+MEMPOOL_BLOCKS = [{'medianFee': 40.2}, {'medianFee': 30.5}, {'medianFee': 25}]
+
+
+class WebsocketStandIn:
+    """A local websocket server that sends each client connecting the next
+    list of messages and then closes the connection."""
+
+    GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+    def __init__(self, connections):
+        self.connections = connections
+        self.received = []
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.url = 'ws://127.0.0.1:{}/api/v1/ws'.format(self.server.getsockname()[1])
+        self.thread = Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        for messages in self.connections:
+            conn, _ = self.server.accept()
+            with conn:
+                request = b''
+                while b'\r\n\r\n' not in request:
+                    request += conn.recv(1024)
+                key = next(
+                    line.split(b':', 1)[1].strip()
+                    for line in request.split(b'\r\n')
+                    if line.lower().startswith(b'sec-websocket-key')
+                )
+                accept = base64.b64encode(hashlib.sha1(key + self.GUID.encode()).digest())
+                conn.sendall(
+                    b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                    b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+                )
+                self.received.append(json.loads(self.read_frame(conn)))
+
+                for message in messages:
+                    payload = json.dumps(message).encode()
+                    if len(payload) < 126:
+                        conn.sendall(b'\x81' + bytes([len(payload)]) + payload)
+                    else:
+                        conn.sendall(b'\x81\x7e' + len(payload).to_bytes(2, 'big') + payload)
+                conn.sendall(b'\x88\x00')
+        self.server.close()
+
+    @staticmethod
+    def read_frame(conn):
+        header = conn.recv(2)
+        length = header[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(conn.recv(2), 'big')
+        mask = conn.recv(4)
+        payload = b''
+        while len(payload) < length:
+            payload += conn.recv(length - len(payload))
+        return bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+def wait_for(condition, timeout=5):
+    start = time()
+    while not condition():
+        if time() - start > timeout:
+            return False
+        sleep(0.01)
+    return True
+
+
+class TestFeeSubscriber:
+    def setup_method(self):
+        set_fee_cache_time(600)
+
+    def test_handle_fees(self):
+        subscriber = FeeSubscriber()
+        subscriber.handle(json.dumps({'fees': FEES, 'mempoolInfo': {}}))
+
+        assert subscriber.updates == 1
+        assert get_fees_cached() == FEES
+
+    def test_handle_mempool_blocks(self):
+        subscriber = FeeSubscriber()
+        subscriber.handle(json.dumps({'fees': FEES}))
+        subscriber.handle(json.dumps({'mempool-blocks': MEMPOOL_BLOCKS}))
+
+        assert get_fee_for_target(1) == 41
+        assert get_fee_for_target(2) == 31
+        assert get_fee_for_target(6) == 21
+
+    def test_handle_blocks(self):
+        subscriber = FeeSubscriber()
+        subscriber.handle(json.dumps({'blocks': [{'height': 700001}, {'height': 700002}]}))
+        assert get_tip_height_cached() == 700002
+
+        subscriber.handle(json.dumps({'block': {'height': 700003}}))
+        assert get_tip_height_cached() == 700003
+        assert subscriber.updates == 2
+
+        testnet_subscriber = FeeSubscriber(testnet=True)
+        testnet_subscriber.handle(json.dumps({'block': {'height': 2000000}}))
+        assert TIP_HEIGHTS[True].value == 2000000
+        assert get_tip_height_cached() == 700003
+
+    def test_handle_ignores_other_messages(self):
+        subscriber = FeeSubscriber()
+        subscriber.handle(json.dumps({'conversions': {'USD': 60000}}))
+        subscriber.handle(json.dumps([]))
+
+        assert subscriber.updates == 0
+
+    @mock.patch('bit.network.stream.RECONNECT_DELAY', 0.01)
+    def test_stream_reconnects(self):
+        fees = dict(FEES, fastestFee=55)
+        stand_in = WebsocketStandIn([[{'fees': FEES}], [{'fees': fees, 'mempool-blocks': MEMPOOL_BLOCKS}]])
+
+        subscriber = FeeSubscriber(stand_in.url).start()
+        try:
+            assert wait_for(lambda: subscriber.updates >= 3)
+        finally:
+            subscriber.stop(timeout=5)
+
+        assert stand_in.received == [{'action': 'want', 'data': ['stats', 'mempool-blocks', 'blocks']}] * 2
+        assert get_fees_cached() == fees
+        assert get_fee_for_target(1) == 41
+        assert not subscriber.connected.is_set()
+
+    def test_stop(self):
+        stand_in = WebsocketStandIn([[]])
+
+        subscriber = FeeSubscriber(stand_in.url).start()
+        assert wait_for(lambda: stand_in.received)
+        subscriber.stop(timeout=5)
+
+        assert not subscriber._thread.is_alive()
@@ -13,8 +13,13 @@ from bit.transaction import (
     construct_outputs,
     deserialize,
     estimate_tx_fee,
+    estimate_tx_vsize,
     sanitize_tx_data,
     select_coins,
+    plan_batches,
+    plan_consolidation,
+    plan_fee_bump,
+    plan_cpfp,
     address_to_scriptpubkey,
     calculate_preimages,
     sign_tx,
@@ -974,6 +979,42 @@ class TestEstimateTxFee:
     def test_none(self):
         assert estimate_tx_fee(740, 5, 170, 5, 0) == 0
 
+    def test_varint(self):
+        assert estimate_tx_fee(148 * 300, 300, 34, 1, 1) == 148 * 300 + 3 + 34 + 1 + 8
+
+
+class TestEstimateTxVsize:
+    def test_legacy(self):
+        unspents = [Unspent(10000, 1, 'script', 'txid', 0, 'p2pkh')]
+        assert estimate_tx_vsize(unspents, [34, 34]) == 148 + 2 * 34 + 10
+
+    def test_segwit(self):
+        unspents = [Unspent(10000, 1, 'script', 'txid', 0, 'p2wkh')]
+        # 68 vbytes per input already include the segwit marker and flag:
+        assert estimate_tx_vsize(unspents, [31]) == 68 + 31 + 10 + 1
+
+    def test_mixed_witness_of_legacy_inputs(self):
+        unspents = [
+            Unspent(10000, 1, 'script', 'txid', 0, 'p2pkh'),
+            Unspent(10000, 1, 'script', 'txid', 1, 'np2wkh'),
+        ]
+        # Legacy inputs of segwit transactions have empty witnesses:
+        assert estimate_tx_vsize(unspents, [32]) == 282
+
+    def test_matches_signed_transaction(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST_1)
+        scriptcode = address_to_scriptpubkey(private_key.segwit_address).hex()
+        unspents = [Unspent(100000, 1, scriptcode, '{:064x}'.format(i), 0, 'np2wkh') for i in range(3)]
+        unspents.append(Unspent(100000, 1, address_to_scriptpubkey(private_key.address).hex(), '0' * 64, 1, 'p2pkh'))
+        outputs = [(private_key.address, 1000), (private_key.segwit_address, 2000)]
+
+        tx = deserialize(create_new_transaction(private_key, unspents, outputs))
+        weight = 3 * len(tx.legacy_repr()) + len(bytes(tx))
+        output_size = [len(address_to_scriptpubkey(address)) + 9 for address, _ in outputs]
+
+        # Signatures are 72 bytes with probability 1/2 and at most 1 byte smaller:
+        assert 0 <= estimate_tx_vsize(unspents, output_size) - (weight + 3) // 4 <= len(unspents)
+
 
 class TestSelectCoins:
     def test_perfect_match(self):
@@ -998,6 +1039,228 @@ class TestSelectCoins:
         assert all([u in UNSPENTS_SEGWIT for u in unspents])
         assert remaining == 50000000
 
+    def test_skips_uneconomical(self):
+        unspents = [
+            Unspent(1000, 1, 'script', 'txid', 0, 'p2pkh'),
+            Unspent(100000, 1, 'script', 'txid', 1, 'p2pkh'),
+        ]
+        selected, _ = select_coins(50000, 10, [34, 34], 0, unspents=unspents)
+        assert selected == unspents[1:]
+
+        with pytest.raises(InsufficientFunds):
+            select_coins(100000, 10, [34, 34], 0, unspents=unspents)
+
+        selected, _ = select_coins(50000, 10, [34, 34], 0, consolidate=True, unspents=unspents)
+        assert selected == unspents
+
+
+class TestPlanBatches:
+    UNSPENTS = [
+        Unspent(100000 + 1000 * i, 1, '76a914990ef60d63b5b5964a1c2282061af45123e93fcb88ac', '{:064x}'.format(i), 0)
+        for i in range(50)
+    ]
+
+    def test_single_batch(self):
+        outputs = [(RETURN_ADDRESS, 10000, 'satoshi')] * 10
+        batches = plan_batches(outputs, self.UNSPENTS, 1, BITCOIN_ADDRESS_TEST, version='test')
+        assert len(batches) == 1
+        assert len([out for out in batches[0][1] if out[0] == RETURN_ADDRESS]) == 10
+
+    def test_respects_max_vsize(self):
+        outputs = [(RETURN_ADDRESS, 150000, 'satoshi')] * 20
+        batches = plan_batches(outputs, self.UNSPENTS, 2, BITCOIN_ADDRESS_TEST, max_vsize=1000, version='test')
+
+        assert len(batches) > 1
+        paid = [out for _, tx_outputs in batches for out in tx_outputs if out[0] == RETURN_ADDRESS]
+        assert len(paid) == 20 and all(amount == 150000 for _, amount in paid)
+
+        spent = [(u.txid, u.txindex) for unspents, _ in batches for u in unspents]
+        assert len(spent) == len(set(spent))
+
+        for unspents, tx_outputs in batches:
+            vsize = estimate_tx_fee(sum(u.vsize for u in unspents), len(unspents), 34 * len(tx_outputs), len(tx_outputs), 1)
+            assert vsize <= 1000
+            fee = sum(u.amount for u in unspents) - sum(amount for _, amount in tx_outputs)
+            assert fee >= 2 * vsize
+
+    def test_insufficient_funds(self):
+        outputs = [(RETURN_ADDRESS, 1000000, 'satoshi')] * 10
+        with pytest.raises(InsufficientFunds):
+            plan_batches(outputs, self.UNSPENTS, 1, RETURN_ADDRESS, version='test')
+
+    def test_output_too_large_for_max_vsize(self):
+        with pytest.raises(InsufficientFunds):
+            plan_batches([(RETURN_ADDRESS, 1000000, 'satoshi')], self.UNSPENTS, 1, RETURN_ADDRESS, max_vsize=500, version='test')
+
+
+class TestPlanConsolidation:
+    UNSPENTS = [
+        Unspent(1000 * i, 1, '76a914990ef60d63b5b5964a1c2282061af45123e93fcb88ac', '{:064x}'.format(i), 0)
+        for i in range(1, 31)
+    ]
+
+    def test_single_transaction(self):
+        batches = plan_consolidation(self.UNSPENTS, 1, RETURN_ADDRESS, version='test')
+        assert len(batches) == 1
+        assert len(batches[0][0]) == 30
+        assert len(batches[0][1]) == 1
+
+    def test_respects_max_vsize(self):
+        batches = plan_consolidation(self.UNSPENTS, 1, RETURN_ADDRESS, max_vsize=1000, version='test')
+
+        assert len(batches) == 5
+        spent = [(u.txid, u.txindex) for unspents, _ in batches for u in unspents]
+        assert sorted(spent) == sorted((u.txid, u.txindex) for u in self.UNSPENTS)
+
+        for unspents, outputs in batches:
+            vsize = estimate_tx_fee(sum(u.vsize for u in unspents), len(unspents), 34, 1, 1)
+            assert vsize <= 1000
+            assert outputs == [(RETURN_ADDRESS, sum(u.amount for u in unspents) - vsize)]
+
+    def test_economical(self):
+        batches = plan_consolidation(self.UNSPENTS, 20, RETURN_ADDRESS, economical=True, version='test')
+        assert all(u.amount > u.vsize * 20 for u in batches[0][0])
+        assert len(batches[0][0]) == 28
+
+    def test_skips_final_dust_group(self):
+        dust = [
+            Unspent(100, 1, '76a914990ef60d63b5b5964a1c2282061af45123e93fcb88ac', '{:064x}'.format(i), 0)
+            for i in range(100, 110)
+        ]
+        batches = plan_consolidation(self.UNSPENTS + dust, 5, RETURN_ADDRESS, max_vsize=1500, version='test')
+
+        spent = [u for unspents, _ in batches for u in unspents]
+        assert all(u.amount > 100 for u in spent)
+        assert all(outputs[0][1] > 0 for _, outputs in batches)
+
+    def test_no_economical_unspents(self):
+        with pytest.raises(ValueError):
+            plan_consolidation(self.UNSPENTS, 1000, RETURN_ADDRESS, economical=True, version='test')
+
+
+class RBFTestCase:
+    PRIVATE_KEY = PrivateKeyTestnet(WALLET_FORMAT_TEST_1)
+
+    def make_tx(self, unspents, outputs, replace_by_fee=True):
+        if replace_by_fee:
+            for unspent in unspents:
+                unspent.opt_in_for_RBF()
+        return deserialize(create_new_transaction(self.PRIVATE_KEY, unspents, outputs))
+
+    def unspent(self, amount, i, confirmations=1):
+        script = address_to_scriptpubkey(self.PRIVATE_KEY.address).hex()
+        return Unspent(amount, confirmations, script, '{:064x}'.format(i), 0, 'p2pkh')
+
+
+class TestPlanFeeBump(RBFTestCase):
+
+    def test_shrinks_change(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 49774)])
+
+        unspents, outputs = plan_fee_bump(tx, [spent], 5, RETURN_ADDRESS)
+
+        assert unspents == [spent]
+        assert outputs[0] == tx.TxOut[0]
+        assert int.from_bytes(outputs[1].amount, byteorder='little') == 100000 - 50000 - 226 * 5
+        assert outputs[1].script_pubkey == address_to_scriptpubkey(RETURN_ADDRESS)
+
+    def test_pays_incremental_relay_fee(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 49774)])
+
+        # The original paid 1 satoshi per byte, a replacement at the same rate
+        # must still pay for its own size on top:
+        _, outputs = plan_fee_bump(tx, [spent], 1, RETURN_ADDRESS)
+        assert int.from_bytes(outputs[1].amount, byteorder='little') == 49774 - 226
+
+    def test_adds_confirmed_inputs(self):
+        spent = self.unspent(60000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 9774)])
+        unconfirmed = self.unspent(90000, 2, confirmations=0)
+        confirmed = self.unspent(80000, 3)
+
+        unspents, outputs = plan_fee_bump(tx, [spent, unconfirmed, confirmed], 100, RETURN_ADDRESS)
+
+        assert unspents == [spent, confirmed]
+        assert len(outputs) == 2
+        change = int.from_bytes(outputs[1].amount, byteorder='little')
+        assert change == 60000 + 80000 - 50000 - estimate_tx_vsize(unspents, [34, 34]) * 100
+
+    def test_drops_change(self):
+        spent = self.unspent(60000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 9774)])
+
+        unspents, outputs = plan_fee_bump(tx, [spent], 50, RETURN_ADDRESS)
+
+        assert unspents == [spent]
+        assert outputs == [tx.TxOut[0]]
+
+    def test_not_replaceable(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000)], replace_by_fee=False)
+
+        with pytest.raises(ValueError):
+            plan_fee_bump(tx, [spent], 5, RETURN_ADDRESS)
+
+    def test_unknown_input(self):
+        tx = self.make_tx([self.unspent(100000, 1)], [(BITCOIN_ADDRESS_TEST, 50000)])
+
+        with pytest.raises(ValueError):
+            plan_fee_bump(tx, [self.unspent(100000, 2)], 5, RETURN_ADDRESS)
+
+    def test_insufficient_funds(self):
+        spent = self.unspent(60000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 9774)])
+
+        with pytest.raises(InsufficientFunds):
+            plan_fee_bump(tx, [spent], 100, RETURN_ADDRESS)
+
+    def test_signed_replacement(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 49774)])
+
+        unspents, outputs = plan_fee_bump(tx, [spent], 5, RETURN_ADDRESS)
+        replacement = deserialize(create_new_transaction(self.PRIVATE_KEY, unspents, outputs))
+
+        assert replacement.TxIn[0].txid == tx.TxIn[0].txid
+        assert replacement.TxIn[0].sequence == tx.TxIn[0].sequence
+        assert replacement.TxOut[0] == tx.TxOut[0]
+
+
+class TestPlanCpfp(RBFTestCase):
+    def test_spends_change(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 49774)])
+        txid = calc_txid(tx.to_hex())
+        change = Unspent(49774, 0, tx.TxOut[1].script_pubkey.hex(), txid, 1, 'p2pkh')
+
+        unspents, outputs = plan_cpfp(tx, [spent, change, self.unspent(80000, 2)], 10, RETURN_ADDRESS)
+
+        assert unspents == [change]
+        # The parent of 225 bytes paid 226 satoshi, the child of 192 bytes
+        # pays the rest for both at 10 satoshi per byte:
+        assert outputs == [(RETURN_ADDRESS, 49774 - ((225 + 192) * 10 - 226))]
+
+    def test_adds_confirmed_inputs(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 98000), (RETURN_ADDRESS, 1774)])
+        txid = calc_txid(tx.to_hex())
+        change = Unspent(1774, 0, tx.TxOut[1].script_pubkey.hex(), txid, 1, 'p2pkh')
+        confirmed = self.unspent(80000, 2)
+
+        unspents, outputs = plan_cpfp(tx, [spent, change, confirmed], 10, RETURN_ADDRESS)
+
+        assert unspents == [change, confirmed]
+        assert len(outputs) == 1
+
+    def test_no_output_to_spend(self):
+        spent = self.unspent(100000, 1)
+        tx = self.make_tx([spent], [(BITCOIN_ADDRESS_TEST, 50000), (RETURN_ADDRESS, 49774)])
+
+        with pytest.raises(ValueError):
+            plan_cpfp(tx, [spent, self.unspent(80000, 2)], 10, RETURN_ADDRESS)
+
 
 class TestConstructOutputBlock:
     def test_no_message(self):
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -12,6 +13,7 @@ from bit.format import verify_sig
 from bit.network import NetworkAPI
 from bit.network.meta import Unspent
 from bit.wallet import BaseKey, Key, PrivateKey, PrivateKeyTestnet, MultiSig, MultiSigTestnet, wif_to_key
+from bit.transaction import address_to_scriptpubkey, calc_txid, deserialize
 from bit.utils import bytes_to_hex
 from .samples import (
     BITCOIN_ADDRESS,
@@ -287,6 +289,173 @@ class TestPrivateKey:
         transactions = private_key.get_transactions()
         assert transactions == private_key.transactions
 
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_send_updates_pool(self, mock_broadcast_tx):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+        private_key.pool.refresh([unspent])
+
+        txid = private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False)
+
+        assert mock_broadcast_tx.called
+        assert unspent not in private_key.pool
+        change = list(private_key.pool)
+        assert len(change) == 1
+        assert change[0].txid == txid
+        assert change[0].confirmations == 0
+        assert change[0].amount < unspent.amount - 1000
+
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_send_adds_change_to_new_script(self, mock_broadcast_tx):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        script = bytes_to_hex(address_to_scriptpubkey(private_key.segwit_address))
+        unspent = Unspent(100000, 1, script, UNSPENTS[1].txid, 0, 'np2wkh')
+        private_key.pool.refresh([unspent])
+
+        txid = private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, leftover=private_key.address)
+
+        (change,) = private_key.pool
+        assert change.txid == txid
+        assert change.type == 'p2pkh'
+        assert private_key.unspents == [change]
+        assert private_key.balance == change.amount
+
+    def test_stale_pool_is_refetched(self):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent, received = Unspent.from_dict(UNSPENTS[1].to_dict()), Unspent.from_dict(UNSPENTS[1].to_dict())
+        received.txindex = 1
+        private_key.pool.refresh([unspent])
+
+        with mock.patch.object(PrivateKey, 'get_unspents', return_value=[received]) as get_unspents:
+            private_key.create_transaction([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False)
+            assert not get_unspents.called
+
+            private_key.pool.last_refresh -= private_key.pool.max_age
+            tx = deserialize(
+                private_key.create_transaction([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False)
+            )
+
+        assert get_unspents.called
+        assert int.from_bytes(tx.TxIn[0].txindex, byteorder='little') == 1
+
+    def test_concurrent_transactions_use_distinct_unspents(self):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspents = []
+        for i in range(8):
+            unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+            unspent.txindex = i
+            unspents.append(unspent)
+        private_key.pool.refresh(unspents)
+
+        def create_transaction(_):
+            return private_key.create_transaction(
+                [(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False, reserve=True
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            txs = list(executor.map(create_transaction, range(8)))
+
+        spent = [(i.txid, i.txindex) for tx in map(deserialize, txs) for i in tx.TxIn]
+        assert len(spent) == len(set(spent)) == 8
+
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_send_failure_releases_unspents(self, mock_broadcast_tx):
+        mock_broadcast_tx.side_effect = ConnectionError
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+        private_key.pool.refresh([unspent])
+
+        with pytest.raises(ConnectionError):
+            private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1)
+
+        assert unspent in private_key.pool
+        assert not private_key.pool.is_reserved(unspent)
+
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_any_send_failure_releases_unspents(self, mock_broadcast_tx):
+        mock_broadcast_tx.side_effect = KeyboardInterrupt
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+        private_key.pool.refresh([unspent])
+
+        with pytest.raises(KeyboardInterrupt):
+            private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1)
+        assert not private_key.pool.is_reserved(unspent)
+
+        with mock.patch('bit.wallet.create_new_transaction', side_effect=ValueError):
+            with pytest.raises(ValueError):
+                private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1)
+        assert not private_key.pool.is_reserved(unspent)
+
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_bump_fee_and_cpfp(self, mock_broadcast_tx):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+        private_key.pool.refresh([unspent])
+
+        tx_hex = private_key.create_transaction(
+            [(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False, replace_by_fee=True, reserve=True
+        )
+        private_key.pool.apply_transaction(deserialize(tx_hex))
+
+        replacement = deserialize(private_key.bump_fee(tx_hex, fee=10))
+        tx = deserialize(tx_hex)
+        assert replacement.TxIn[0].txid == tx.TxIn[0].txid
+        assert replacement.TxOut[0] == tx.TxOut[0]
+        assert int.from_bytes(replacement.TxOut[1].amount, 'little') < int.from_bytes(tx.TxOut[1].amount, 'little')
+
+        child = deserialize(private_key.create_cpfp_transaction(tx_hex, fee=10))
+        assert bytes_to_hex(child.TxIn[0].txid[::-1]) == calc_txid(tx_hex)
+        assert len(child.TxOut) == 1
+
+    @mock.patch('bit.network.NetworkAPI.broadcast_tx')
+    def test_send_fee_bump_updates_pool(self, mock_broadcast_tx):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+        private_key.pool.refresh([unspent])
+
+        txid = private_key.send([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, combine=False, replace_by_fee=True)
+        tx_hex = mock_broadcast_tx.call_args[0][0]
+        (change,) = private_key.pool
+
+        replacement_txid = private_key.send_fee_bump(tx_hex, fee=10)
+
+        assert mock_broadcast_tx.call_count == 2
+        assert change not in private_key.pool
+        (new_change,) = private_key.pool
+        assert new_change.txid == replacement_txid != txid
+        assert new_change.amount < change.amount
+
+    def test_create_batched_transactions(self):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspents = []
+        for i in range(4):
+            unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+            unspent.txindex = i
+            unspents.append(unspent)
+        private_key.pool.refresh(unspents)
+
+        txs = private_key.create_batched_transactions([(BITCOIN_ADDRESS, 1000, 'satoshi')] * 5, fee=1)
+
+        assert len(txs) == 1
+        tx = deserialize(txs[0])
+        assert len(tx.TxOut) == 6
+
+    def test_create_consolidation_transactions(self):
+        private_key = PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN)
+        unspents = []
+        for i in range(30):
+            unspent = Unspent.from_dict(UNSPENTS[1].to_dict())
+            unspent.txindex = i
+            unspents.append(unspent)
+
+        txs = private_key.create_consolidation_transactions(fee=1, unspents=unspents, max_workers=4)
+
+        assert len(txs) == 1
+        tx = deserialize(txs[0])
+        assert len(tx.TxIn) == 30
+        assert len(tx.TxOut) == 1
+
     def test_from_hex(self):
         key = PrivateKey.from_hex(PRIVATE_KEY_HEX)
         assert isinstance(key, PrivateKey)
@@ -578,6 +747,46 @@ class TestMultiSig:
         assert repr(multisig) == '<MultiSig: {}>'.format(BITCOIN_ADDRESS_P2SH_MULTISIG)
 
 
+    def test_create_transaction_fetches_unspents(self):
+        key1 = PrivateKey()
+        key2 = PrivateKey()
+        multisig = MultiSig(key1, [key1.public_key, key2.public_key], 2)
+        # Transactions of multisig keys are not applied to the pool, so it
+        # is never used to select unspents:
+        multisig.pool.refresh([Unspent(100000, 1, '00', UNSPENTS[1].txid, 0)])
+
+        with mock.patch.object(MultiSig, 'get_unspents', side_effect=ConnectionError):
+            with pytest.raises(ConnectionError):
+                multisig.create_transaction([(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1)
+
+    def test_bump_fee_and_cpfp(self):
+        key1 = PrivateKey()
+        key2 = PrivateKey()
+        multisig = MultiSig(key1, [key1.public_key, key2.public_key], 1)
+        script = bytes_to_hex(address_to_scriptpubkey(multisig.address))
+        unspent = Unspent(100000, 1, script, UNSPENTS[1].txid, 0).set_type('p2sh')
+
+        tx_hex = multisig.create_transaction(
+            [(BITCOIN_ADDRESS, 1000, 'satoshi')], fee=1, unspents=[unspent], replace_by_fee=True
+        )
+        tx = deserialize(tx_hex)
+
+        # Transactions of multisig keys are not recorded in the pool:
+        with pytest.raises(ValueError):
+            multisig.bump_fee(tx_hex, fee=10)
+        with pytest.raises(ValueError):
+            multisig.create_cpfp_transaction(tx_hex, fee=10)
+
+        replacement = deserialize(multisig.bump_fee(tx_hex, fee=10, unspents=[unspent]))
+        assert replacement.TxIn[0].txid == tx.TxIn[0].txid
+        assert int.from_bytes(replacement.TxOut[1].amount, 'little') < int.from_bytes(tx.TxOut[1].amount, 'little')
+
+        change = Unspent(int.from_bytes(tx.TxOut[1].amount, 'little'), 0, script, calc_txid(tx_hex), 1).set_type('p2sh')
+        child = deserialize(multisig.create_cpfp_transaction(tx_hex, fee=10, unspents=[unspent, change]))
+        assert bytes_to_hex(child.TxIn[0].txid[::-1]) == calc_txid(tx_hex)
+        assert len(child.TxOut) == 1
+
+
 class TestMultiSigTestnet:
     def test_init_default(self):
         key1 = PrivateKeyTestnet()
@@ -705,3 +914,14 @@ class TestMultiSigTestnet:
         key2 = PrivateKeyTestnet(WALLET_FORMAT_TEST_2)
         multisig = MultiSigTestnet(key1, [key1.public_key, key2.public_key], 2)
         assert repr(multisig) == '<MultiSigTestnet: {}>'.format(BITCOIN_ADDRESS_TEST_P2SH_MULTISIG)
+
+    def test_bump_fee_requires_unspents(self):
+        key1 = PrivateKeyTestnet()
+        key2 = PrivateKeyTestnet()
+        multisig = MultiSigTestnet(key1, [key1.public_key, key2.public_key], 1)
+
+        with pytest.raises(ValueError):
+            multisig.bump_fee('00', fee=10)
+        with pytest.raises(ValueError):
+            multisig.create_cpfp_transaction('00', fee=10)
+